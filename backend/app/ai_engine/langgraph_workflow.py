@@ -1,6 +1,8 @@
 #E:\HOPEAI\PJT\genai_translation\backend\app\ai_engine\langgraph_workflow.py
 from typing import TypedDict, Dict, Any, Optional
 from langgraph.graph import StateGraph, END
+from app.utils.metrics import trace_request
+from app.db.records import record_context
 
 # we reuse your existing handlers & logic
 from app.services.file_handlers import (
@@ -115,7 +117,19 @@ def run_langgraph_workflow(request: Dict[str, Any]) -> Dict[str, Any]:
     """
     Public function your router calls.
     Returns EXACT output from handle_text/audio/document/video.
+    With request["timings"] = True a per-stage `timings` block is added.
+    request["content_hash"] (optional) is stored with the record.
     """
-    final_state = workflow_app.invoke({"request": request})
-    return final_state.get("result", {})
+    with trace_request(request.get("kind", "text"), request.get("target_lang", "en")) as trace, \
+            record_context(request):
+        final_state = workflow_app.invoke({"request": request})
+        result = final_state.get("result", {})
+
+    if request.get("timings") and isinstance(result, dict):
+        result["timings"] = {
+            "stages": trace["timings"],
+            "total_ms": trace["total_ms"],
+            "lang_pair": f"{trace['source_lang'] or 'unknown'}->{trace['target_lang']}",
+        }
+    return result
 
@@ -3,8 +3,16 @@ import os
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 DB_NAME = os.getenv("DB_NAME", "translation_db")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))    # per process (one cached client)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()                   # `app.*` loggers (llm_route, sweeper, ...)
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "20"))
+HISTORY_MAX_PAGE_SIZE = int(os.getenv("HISTORY_MAX_PAGE_SIZE", "100"))
+RECORD_BLOBS_ENABLED = os.getenv("RECORD_BLOBS_ENABLED", "1") == "1"  # large record text → db.blobs
+RECORD_BLOB_MIN_CHARS = int(os.getenv("RECORD_BLOB_MIN_CHARS", "1024"))  # shorter strings stay inline
+RECORD_BLOB_CODEC = os.getenv("RECORD_BLOB_CODEC", "zstd")            # "zstd" (needs zstandard) | "zlib"
 
 # File size limits (WhatsApp-like 16 MB)
 MAX_UPLOAD_MB = 16
@@ -14,4 +22,134 @@ DOC_EXTS = ['.pdf', '.docx', '.txt']
 ALLOWED_EXTS = AUDIO_EXTS + VIDEO_EXTS + DOC_EXTS
 
 # Enable or disable Demucs voice enhancement
-USE_DEMUCS = False  #True   # set True to enable, False to disable
\ No newline at end of file
+USE_DEMUCS = False  #True   # set True to enable, False to disable
+DEMUCS_MODEL = os.getenv("DEMUCS_MODEL", "htdemucs")
+DEMUCS_WORKERS = int(os.getenv("DEMUCS_WORKERS", "2"))          # 0 = model in the API process
+DEMUCS_THREADS = int(os.getenv("DEMUCS_THREADS", "2"))          # torch threads per worker
+DEMUCS_SEGMENT_S = float(os.getenv("DEMUCS_SEGMENT_S", "30"))   # per-worker window
+DEMUCS_OVERLAP_S = float(os.getenv("DEMUCS_OVERLAP_S", "2"))    # cross-faded overlap between windows
+DEMUCS_SKIP_SNR_DB = float(os.getenv("DEMUCS_SKIP_SNR_DB", "25"))  # cleaner recordings skip separation
+
+# In-process media decoding (PCM handed to enhancement / STT)
+MEDIA_SAMPLE_RATE = int(os.getenv("MEDIA_SAMPLE_RATE", "16000"))          # Whisper's native rate
+
+# Voice activity detection (energy-based) before speech-to-text
+VAD_ENABLED = os.getenv("VAD_ENABLED", "1") == "1"
+VAD_FRAME_MS = int(os.getenv("VAD_FRAME_MS", "30"))
+VAD_THRESHOLD_DB = float(os.getenv("VAD_THRESHOLD_DB", "12"))       # above the recording's noise floor
+VAD_ABS_FLOOR_DB = float(os.getenv("VAD_ABS_FLOOR_DB", "-55"))      # dBFS; quieter is never speech
+VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "250"))
+VAD_MIN_SILENCE_MS = int(os.getenv("VAD_MIN_SILENCE_MS", "600"))    # shorter pauses are kept
+VAD_PAD_MS = int(os.getenv("VAD_PAD_MS", "150"))
+VAD_GAP_MS = int(os.getenv("VAD_GAP_MS", "300"))                    # silence left between kept regions
+
+# Speech-to-text upload encoding
+STT_UPLOAD_CODEC = os.getenv("STT_UPLOAD_CODEC", "opus")                # opus | mp3 | wav (no transcode)
+STT_UPLOAD_BITRATE_K = int(os.getenv("STT_UPLOAD_BITRATE_K", "24"))     # speech bitrate for normal lengths
+STT_UPLOAD_MIN_BITRATE_K = int(os.getenv("STT_UPLOAD_MIN_BITRATE_K", "8"))
+STT_UPLOAD_MAX_MB = float(os.getenv("STT_UPLOAD_MAX_MB", "24"))         # API hard cap is 25 MB
+STT_TRIM_THRESHOLD_DB = float(os.getenv("STT_TRIM_THRESHOLD_DB", "-40"))  # edge silence, relative to loudest frame
+STT_TRIM_PAD_MS = int(os.getenv("STT_TRIM_PAD_MS", "200"))
+STT_UPLINK_MBPS = float(os.getenv("STT_UPLINK_MBPS", "10"))             # for the upload-time-saved estimate
+
+# PaddleOCR engine pool
+OCR_PRELOAD_LANGS = [l for l in os.getenv("OCR_PRELOAD_LANGS", "en,ta,devanagari").split(",") if l]
+OCR_ENGINES_PER_LANG = int(os.getenv("OCR_ENGINES_PER_LANG", "1"))   # per worker process
+OCR_CPU_THREADS = int(os.getenv("OCR_CPU_THREADS", "4"))
+OCR_ENABLE_MKLDNN = os.getenv("OCR_ENABLE_MKLDNN", "1") == "1"
+
+# PDF text layer: PyMuPDF by default, pdfplumber only for layout-preserving extraction
+PDF_LAYOUT_MODE = os.getenv("PDF_LAYOUT_MODE", "0") == "1"
+PDF_OCR_MIN_PAGE_CHARS = int(os.getenv("PDF_OCR_MIN_PAGE_CHARS", "50"))  # sparser pages are treated as scans
+PDF_OCR_DPI = int(os.getenv("PDF_OCR_DPI", "72"))                      # render resolution for tesseract + OSD
+PDF_OSD_MIN_CONF = float(os.getenv("PDF_OSD_MIN_CONF", "1.0"))          # below → OCR with all packs
+
+# Large documents: bounded streaming pipeline (page/paragraph units)
+DOC_STREAM_MIN_PAGES = int(os.getenv("DOC_STREAM_MIN_PAGES", "20"))          # PDFs above → streamed
+DOC_STREAM_MIN_BYTES = int(os.getenv("DOC_STREAM_MIN_BYTES", "1000000"))     # txt/docx above → streamed
+DOC_UNIT_CHARS = int(os.getenv("DOC_UNIT_CHARS", "2000"))                    # max unit size (chars)
+DOC_STREAM_WORKERS = int(os.getenv("DOC_STREAM_WORKERS", "4"))
+DOC_MAX_INFLIGHT = int(os.getenv("DOC_MAX_INFLIGHT", "8"))                   # units in memory at once
+DOC_DB_BATCH = int(os.getenv("DOC_DB_BATCH", "50"))                          # unit records per insert_many
+DOC_SUMMARY_CHUNK_CHARS = int(os.getenv("DOC_SUMMARY_CHUNK_CHARS", "12000"))
+DOC_SUMMARY_FANIN = int(os.getenv("DOC_SUMMARY_FANIN", "8"))                 # partial summaries before collapsing
+
+# Revisions: content-defined units, translations reused across re-uploads
+DOC_REUSE_ENABLED = os.getenv("DOC_REUSE_ENABLED", "1") == "1"
+DOC_CDC_MIN_CHARS = int(os.getenv("DOC_CDC_MIN_CHARS", "400"))               # no unit boundary before this
+DOC_CDC_AVG_CHARS = int(os.getenv("DOC_CDC_AVG_CHARS", "1000"))              # target piece size inside long paragraphs
+DOC_REVISION_MIN_OVERLAP = float(os.getenv("DOC_REVISION_MIN_OVERLAP", "0.5"))  # shared units to count as a revision
+
+# Translation memory (segment level, rapidfuzz scores 0-100)
+TM_ENABLED = os.getenv("TM_ENABLED", "1") == "1"
+TM_HINT_SCORE = float(os.getenv("TM_HINT_SCORE", "75"))          # ≥ → few-shot example for the LLM
+TM_MIN_CHARS = int(os.getenv("TM_MIN_CHARS", "12"))              # shorter segments are not looked up/stored
+TM_MAX_SEGMENTS = int(os.getenv("TM_MAX_SEGMENTS", "20"))        # longer texts are translated whole
+TM_MAX_ENTRIES = int(os.getenv("TM_MAX_ENTRIES", "200000"))      # per user and language, newest first
+TM_MAX_USERS = int(os.getenv("TM_MAX_USERS", "256"))             # (user, language) indexes kept in memory
+TM_CANDIDATES = int(os.getenv("TM_CANDIDATES", "20"))            # trigram candidates scored per lookup
+TM_MAX_POSTING = int(os.getenv("TM_MAX_POSTING", "5000"))        # trigrams in more entries are skipped
+
+# Translation prompt: only rules triggered by the input (0 → every rule of the language)
+PROMPT_RULES_FILTER = os.getenv("PROMPT_RULES_FILTER", "1") == "1"
+
+# Model tiering for translate / summarize (see services/model_router.py)
+ROUTER_ENABLED = os.getenv("ROUTER_ENABLED", "1") == "1"
+ROUTER_FAST_MODEL = os.getenv("ROUTER_FAST_MODEL", LLM_MODEL)
+ROUTER_HARD_MODEL = os.getenv("ROUTER_HARD_MODEL", LLM_MODEL)
+ROUTER_TRIVIAL_WORDS = int(os.getenv("ROUTER_TRIVIAL_WORDS", "6"))           # ≤ → minimal prompt
+ROUTER_HARD_WORDS = int(os.getenv("ROUTER_HARD_WORDS", "250"))               # ≥ → full prompt, hard model
+ROUTER_HARD_DOMAIN_HITS = int(os.getenv("ROUTER_HARD_DOMAIN_HITS", "2"))     # legal/medical/financial terms
+ROUTER_SUMMARY_MIN_WORDS = int(os.getenv("ROUTER_SUMMARY_MIN_WORDS", "60"))  # shorter texts are their own summary
+ROUTER_CACHE_SIZE = int(os.getenv("ROUTER_CACHE_SIZE", "2048"))              # exact-input outputs kept in memory
+
+# Hedged LLM calls (duplicate a call still running after the rolling p95)
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "0") == "1"
+LLM_HEDGE_WINDOW = int(os.getenv("LLM_HEDGE_WINDOW", "200"))              # recent calls for p95 + hedge budget
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))     # no hedging before this many calls
+LLM_HEDGE_MIN_DELAY_MS = float(os.getenv("LLM_HEDGE_MIN_DELAY_MS", "250"))  # never hedge earlier than this
+LLM_HEDGE_MAX_RATE = float(os.getenv("LLM_HEDGE_MAX_RATE", "0.05"))       # max share of hedged calls in the window
+
+# Image pre-processing before OCR
+OCR_PREPROCESS = os.getenv("OCR_PREPROCESS", "1") == "1"
+OCR_TARGET_TEXT_PX = int(os.getenv("OCR_TARGET_TEXT_PX", "40"))     # glyph height after downsampling
+OCR_MAX_SIDE = int(os.getenv("OCR_MAX_SIDE", "2400"))               # long side cap before analysis
+OCR_MAX_DESKEW_DEG = float(os.getenv("OCR_MAX_DESKEW_DEG", "10"))
+OCR_MIN_GLYPHS = int(os.getenv("OCR_MIN_GLYPHS", "8"))              # fewer → leave the image as is
+
+# Sentence-chunked TTS
+TTS_MAX_WORKERS = int(os.getenv("TTS_MAX_WORKERS", "4"))   # concurrent chunk syntheses
+TTS_CHUNK_CHARS = int(os.getenv("TTS_CHUNK_CHARS", "400"))  # longer sentences are split
+TTS_CHUNK_DIR = "tts_chunks"                                # artifact namespace of the per-sentence cache
+
+# TTS engine chain (priority order) and per-engine timeouts in seconds
+def _parse_map(raw: str) -> dict:
+    """ "a=1,b=2" -> {"a": "1", "b": "2"} """
+    out = {}
+    for item in (raw or "").split(","):
+        if "=" in item:
+            k, v = item.split("=", 1)
+            out[k.strip()] = v.strip()
+    return out
+
+TTS_ENGINE_CHAIN = [e.strip() for e in os.getenv("TTS_ENGINE_CHAIN", "gtts,espeak").split(",") if e.strip()]
+TTS_ENGINE_TIMEOUTS = {k: float(v) for k, v in _parse_map(os.getenv("TTS_ENGINE_TIMEOUTS", "gtts=20,espeak=10,piper=15")).items()}
+PIPER_VOICES = _parse_map(os.getenv("PIPER_VOICES", ""))   # "en=/models/en.onnx,hi=/models/hi.onnx"
+
+# Artifact store (result JSON, TTS audio, caches)
+ARTIFACT_BACKEND = os.getenv("ARTIFACT_BACKEND", "local")          # "local" | "s3" (needs boto3)
+ARTIFACT_ROOT = os.getenv("ARTIFACT_ROOT", "app/static")            # local backend root, served at /static
+ARTIFACT_NAMESPACES = ["json", "audio", TTS_CHUNK_DIR]              # swept namespaces ("graph" is never evicted)
+ARTIFACT_MAX_MB = int(os.getenv("ARTIFACT_MAX_MB", "5120"))
+ARTIFACT_MAX_AGE_DAYS = float(os.getenv("ARTIFACT_MAX_AGE_DAYS", "30"))
+ARTIFACT_SWEEP_INTERVAL_S = float(os.getenv("ARTIFACT_SWEEP_INTERVAL_S", "3600"))  # 0 disables the sweeper
+S3_BUCKET = os.getenv("S3_BUCKET", "")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL", "")                  # e.g. http://minio:9000
+S3_PREFIX = os.getenv("S3_PREFIX", "artifacts")
+S3_PUBLIC_BASE_URL = os.getenv("S3_PUBLIC_BASE_URL", "")            # empty -> presigned URLs
+
+# Language detection (script histogram fast path, lingua fallback)
+LANG_DETECT_SAMPLE_CHARS = int(os.getenv("LANG_DETECT_SAMPLE_CHARS", "2000"))
+LANG_DETECT_SCRIPT_DOMINANCE = float(os.getenv("LANG_DETECT_SCRIPT_DOMINANCE", "0.6"))
+LANG_DETECT_CACHE_SIZE = int(os.getenv("LANG_DETECT_CACHE_SIZE", "4096"))
+CODE_MIX_MIN_LATIN_WORDS = int(os.getenv("CODE_MIX_MIN_LATIN_WORDS", "3"))  # shorter English runs = loanwords
@@ -0,0 +1,110 @@
+"""
+Content-addressed text blobs for db.records.
+
+Large top-level strings of a record (input, cleaned, source_text,
+transcribed_text, translated_text, summaries, ...) are stored once in
+db.blobs, compressed, under the sha256 of the text; the record keeps only
+
+    {"_blob": "<sha256>", "chars": <len>}
+
+The same text in several fields or several records (cleaned == source_text,
+re-uploads, two users sending the same announcement) is one blob.
+rehydrate() resolves the references of the fields a reader asks for with
+one query.
+
+Codec is zstd when the `zstandard` package is installed, zlib otherwise;
+each blob records its codec so both can be read back.
+"""
+
+import zlib
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+from bson import Binary
+from pymongo import UpdateOne
+
+from ..config.settings import RECORD_BLOB_MIN_CHARS, RECORD_BLOB_CODEC
+
+try:
+    import zstandard
+except Exception:
+    zstandard = None
+
+# never offloaded: stamped metadata the indexes / history listing use
+KEEP_INLINE = {"user_id", "kind", "content_hash", "target_lang", "output_pref", "detected_lang", "json_path"}
+
+
+def _codec() -> str:
+    return "zstd" if RECORD_BLOB_CODEC == "zstd" and zstandard is not None else "zlib"
+
+
+def compress(text: str):
+    raw = text.encode("utf-8")
+    codec = _codec()
+    if codec == "zstd":
+        return codec, zstandard.ZstdCompressor(level=9).compress(raw)
+    return codec, zlib.compress(raw, 6)
+
+
+def decompress(codec: str, data: bytes) -> str:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("blob is zstd-compressed but zstandard is not installed")
+        raw = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        raw = zlib.decompress(data)
+    return raw.decode("utf-8")
+
+
+def is_ref(value) -> bool:
+    return isinstance(value, dict) and "_blob" in value
+
+
+def offload(db, doc: dict, min_chars: int = RECORD_BLOB_MIN_CHARS) -> dict:
+    """
+    Copy of `doc` with large strings replaced by blob references; the blobs
+    are upserted (insert-if-absent) in one bulk write.
+    """
+    out = dict(doc)
+    blobs: Dict[str, str] = {}
+    for key, value in doc.items():
+        if key in KEEP_INLINE or not isinstance(value, str) or len(value) < min_chars:
+            continue
+        digest = hashlib.sha256(value.encode("utf-8")).hexdigest()
+        blobs[digest] = value
+        out[key] = {"_blob": digest, "chars": len(value)}
+    if blobs:
+        ops = []
+        for digest, text in blobs.items():
+            codec, data = compress(text)
+            ops.append(UpdateOne(
+                {"_id": digest},
+                {"$setOnInsert": {"codec": codec, "data": Binary(data), "chars": len(text), "bytes": len(data)}},
+                upsert=True,
+            ))
+        db.blobs.bulk_write(ops, ordered=False)
+    return out
+
+
+def rehydrate(db, docs: List[dict], fields: Optional[Iterable[str]] = None) -> List[dict]:
+    """
+    Resolves blob references in place (only `fields` when given), one
+    query for all docs.
+    """
+    refs = []
+    for doc in docs:
+        for k in (list(fields) if fields is not None else list(doc)):
+            if is_ref(doc.get(k)):
+                refs.append((doc, k))
+    if not refs:
+        return docs
+    digests = list({doc[k]["_blob"] for doc, k in refs})
+    texts = {
+        b["_id"]: decompress(b.get("codec", "zlib"), bytes(b["data"]))
+        for b in db.blobs.find({"_id": {"$in": digests}})
+    }
+    for doc, k in refs:
+        text = texts.get(doc[k]["_blob"])
+        if text is not None:
+            doc[k] = text
+    return docs
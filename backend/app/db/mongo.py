@@ -1,6 +1,60 @@
-from pymongo import MongoClient
-from ..config.settings import MONGO_URI, DB_NAME
+import threading
+
+from pymongo import MongoClient, ASCENDING, DESCENDING
+from ..config.settings import MONGO_URI, DB_NAME, MONGO_MAX_POOL_SIZE
+
+# One client per process: MongoClient owns a connection pool and monitor
+# threads, so creating one per call paid a TCP/handshake per insert.
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> MongoClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MongoClient(MONGO_URI, maxPoolSize=MONGO_MAX_POOL_SIZE)
+    return _client
+
 
 def get_db():
-    client = MongoClient(MONGO_URI)
-    return client[DB_NAME]
+    return get_client()[DB_NAME]
+
+
+def reset_client() -> None:
+    """Drop the cached client (e.g. in a forked worker); the next get_db() reconnects."""
+    global _client
+    with _client_lock:
+        _client = None
+
+
+# collection -> [(keys, options)]
+INDEXES = {
+    "records": [
+        ([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], {"name": "user_history"}),
+        ([("user_id", ASCENDING), ("kind", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+         {"name": "user_kind_history"}),
+        ([("created_at", DESCENDING)], {"name": "created_at"}),
+        ([("user_id", ASCENDING), ("content_hash", ASCENDING), ("kind", ASCENDING), ("target_lang", ASCENDING),
+          ("created_at", DESCENDING)], {"name": "user_content_lookup"}),
+    ],
+    "document_versions": [
+        ([("user_id", ASCENDING), ("target_lang", ASCENDING), ("unit_fps", ASCENDING), ("created_at", DESCENDING)],
+         {"name": "user_lang_units"}),
+    ],
+    "document_units": [
+        ([("doc_key", ASCENDING)], {"name": "doc_key"}),
+    ],
+    "translation_memory": [
+        ([("user_id", ASCENDING), ("target_lang", ASCENDING), ("created_at", DESCENDING)], {"name": "user_lang_recent"}),
+    ],
+}
+
+
+def ensure_indexes(db=None) -> None:
+    """Idempotent; run once at startup."""
+    db = db if db is not None else get_db()
+    for coll, specs in INDEXES.items():
+        for keys, opts in specs:
+            db[coll].create_index(keys, background=True, **opts)
@@ -0,0 +1,185 @@
+"""
+db.records: stamping, history listing and lookup by content hash.
+
+Handlers only see the result dict; who asked and for which input is set
+once per workflow run with `record_context()` and added to every record
+written inside it. Stamped fields:
+
+    user_id, kind, created_at, content_hash, target_lang, output_pref
+
+History is paginated by keyset on (created_at, _id) - descending, served
+by the user_history index - so page N costs the same as page 1, and only
+projected fields leave the server.
+
+Large text fields are stored as blob references (see db.blobs) and only
+resolved for readers that ask for them.
+"""
+
+import re
+import base64
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional, List
+
+from bson import ObjectId
+
+from ..config.settings import HISTORY_PAGE_SIZE, HISTORY_MAX_PAGE_SIZE, RECORD_BLOBS_ENABLED
+from .mongo import get_db
+from .blobs import offload, rehydrate
+from ..utils.artifact_store import get_store
+
+# listing default: small fields only, never transcripts / translations
+HISTORY_FIELDS = [
+    "kind", "created_at", "user_id", "content_hash", "detected_lang", "target_lang",
+    "output_pref", "same_language", "json_path", "total_cost_usd",
+]
+_FIELD_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_.]*$")
+
+_record_ctx: contextvars.ContextVar = contextvars.ContextVar("record_ctx", default=None)
+
+
+@contextmanager
+def record_context(request: dict):
+    """Request metadata for records inserted during one workflow run."""
+    token = _record_ctx.set({
+        "user_id": request.get("user_id") or "guest",
+        "kind": request.get("kind") or "text",
+        "content_hash": request.get("content_hash"),
+        "target_lang": request.get("target_lang"),
+        "output_pref": request.get("output_pref"),
+    })
+    try:
+        yield
+    finally:
+        _record_ctx.reset(token)
+
+
+def insert_record(result: dict) -> str:
+    """
+    Inserts result + request metadata into db.records and returns the id.
+    `result` itself is not modified (no _id / stamp fields in the response).
+    """
+    ctx = _record_ctx.get() or {}
+    doc = {**result}
+    for k, v in ctx.items():
+        if v is not None:
+            doc.setdefault(k, v)
+    doc.setdefault("user_id", "guest")
+    doc["created_at"] = datetime.now(timezone.utc)
+    db = get_db()
+    if RECORD_BLOBS_ENABLED:
+        doc = offload(db, doc)
+    return str(db.records.insert_one(doc).inserted_id)
+
+
+def insert_shared_record(result: dict, request: dict) -> str:
+    """
+    Record for a request that shared another user's execution (singleflight):
+    the same result, stamped with this request's user / metadata.
+    """
+    doc = {k: v for k, v in result.items() if k not in ("db_id", "timings")}
+    with record_context(request):
+        return insert_record(doc)
+
+
+# -----------------------------
+# History (keyset pagination)
+# -----------------------------
+def encode_cursor(doc: dict) -> str:
+    ts = doc["created_at"]
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    raw = f"{int(ts.timestamp() * 1000)}:{doc['_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """(created_at, ObjectId); ValueError on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ms, oid = raw.split(":", 1)
+        return datetime.fromtimestamp(int(ms) / 1000, tz=timezone.utc), ObjectId(oid)
+    except Exception:
+        raise ValueError("invalid cursor")
+
+
+def projection(fields: Optional[List[str]]) -> dict:
+    names = fields or HISTORY_FIELDS
+    bad = [f for f in names if not _FIELD_NAME.match(f) or f.startswith("_")]
+    if bad:
+        raise ValueError(f"invalid field(s): {', '.join(bad)}")
+    # created_at + _id are always needed for the next cursor
+    proj = {f: 1 for f in names}
+    proj["created_at"] = 1
+    return proj
+
+
+def list_history(user_id: str, kind: Optional[str] = None, limit: int = HISTORY_PAGE_SIZE,
+                 cursor: Optional[str] = None, fields: Optional[List[str]] = None) -> dict:
+    """Newest first. Returns {"items": [...], "next_cursor": str | None}."""
+    limit = max(1, min(limit, HISTORY_MAX_PAGE_SIZE))
+    db = get_db()
+    query = {"user_id": user_id}
+    if kind:
+        query["kind"] = kind
+    if cursor:
+        ts, oid = decode_cursor(cursor)
+        query["$or"] = [
+            {"created_at": {"$lt": ts}},
+            {"created_at": ts, "_id": {"$lt": oid}},
+        ]
+
+    docs = list(
+        db.records.find(query, projection(fields))
+        .sort([("created_at", -1), ("_id", -1)])
+        .limit(limit + 1)
+    )
+    more = len(docs) > limit
+    docs = docs[:limit]
+    next_cursor = encode_cursor(docs[-1]) if more else None
+    for d in docs:
+        d["id"] = str(d.pop("_id"))
+    if fields:
+        rehydrate(db, docs, fields)
+    return {"items": docs, "next_cursor": next_cursor}
+
+
+# -----------------------------
+# Lookup by content hash
+# -----------------------------
+def find_by_hash(content_hash: str, user_id: str, kind: Optional[str] = None, target_lang: Optional[str] = None,
+                 output_pref: Optional[str] = None) -> Optional[dict]:
+    """
+    The user's newest stored result for this input (same sha256 as the
+    upload / singleflight key). Never another user's record: knowing a
+    file's hash must not be enough to read someone else's result.
+    """
+    query = {"user_id": user_id, "content_hash": content_hash}
+    if kind:
+        query["kind"] = kind
+    if target_lang:
+        query["target_lang"] = target_lang
+    if output_pref:
+        query["output_pref"] = output_pref
+    db = get_db()
+    for doc in db.records.find(query).sort("created_at", -1).limit(5):
+        if not artifacts_alive(doc):
+            continue
+        doc["db_id"] = str(doc.pop("_id"))
+        rehydrate(db, [doc])
+        return doc
+    return None
+
+
+def artifacts_alive(doc: dict) -> bool:
+    """
+    False when a stored artifact URL (json_path, audio, units) points at an
+    object the sweeper has evicted: such a record would hand out dead links.
+    """
+    store = get_store()
+    for value in doc.values():
+        key = store.key_for_url(value) if isinstance(value, str) else None
+        if key is not None and not store.exists(key):
+            return False
+    return True
@@ -1,12 +1,38 @@
 #E:\HOPEAI\PJT\genai_translation\backend\app\main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from .routers import translate_router
 from fastapi.staticfiles import StaticFiles
 from app.ai_engine.generate_workflow_png import generate_workflow_png
+from app.utils.metrics import render_metrics, CONTENT_TYPE_LATEST
+from app.utils.artifact_store import ArtifactSweeper
+from app.services.audio_enhance import warmup_enhancer, shutdown_enhancer
+from app.services.ocr_pool import warmup_ocr
+from app.db.mongo import ensure_indexes
+from app.config.settings import LOG_LEVEL
 from contextlib import asynccontextmanager
+import logging
 import uvicorn
 
+# --------------------------------------------------
+# LOGGING
+# --------------------------------------------------
+# Module loggers live under `app.`; without a handler of their own their
+# INFO lines (llm_route, artifact sweeps, ...) fall through to the root
+# logger's WARNING default and are dropped. Configured at import so every
+# gunicorn worker inherits it.
+def configure_logging() -> None:
+    log = logging.getLogger("app")
+    if not log.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s"))
+        log.addHandler(handler)
+    log.setLevel(LOG_LEVEL)
+    log.propagate = False
+
+
+configure_logging()
+
 # --------------------------------------------------
 # LIFESPAN HANDLER (Modern FastAPI startup method)
 # --------------------------------------------------
@@ -19,9 +45,33 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print("Failed to generate workflow diagram:", e)
 
+    # load Demucs once in its worker processes (no-op when USE_DEMUCS=False)
+    try:
+        warmup_enhancer()
+    except Exception as e:
+        print("Demucs warm-up failed:", e)
+
+    # build PaddleOCR engines before the first image request
+    try:
+        warmup_ocr()
+    except Exception as e:
+        print("OCR warm-up failed:", e)
+
+    # records / history / translation memory indexes (idempotent)
+    try:
+        ensure_indexes()
+    except Exception as e:
+        print("Mongo index creation failed:", e)
+
+    # retention sweep for app/static artifacts + stale temp dirs
+    sweeper = ArtifactSweeper()
+    sweeper.start()
+
     yield  # application runs here
 
-    # Shutdown logic (not needed here)
+    # Shutdown logic
+    sweeper.stop()
+    shutdown_enhancer()
     print("Shutting down…")
 
 # --------------------------------------------------
@@ -53,5 +103,10 @@ app.include_router(translate_router.router, prefix='/api', tags=['translation'])
 def ping():
     return {'ok': True}
 
+# ---------- PROMETHEUS ----------
+@app.get('/metrics', include_in_schema=False)
+def metrics():
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
 if __name__ == '__main__':
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,50 @@
+# app/prefork.py
+"""
+Hooks for the preforking server (gunicorn.conf.py).
+
+preload()     master, after `app.main` is imported and before any fork:
+              builds what import did not already load (the punctuation
+              model, lingua and torch load on import), then freezes the
+              heap so workers share all of it copy-on-write.
+after_fork()  each worker, right after fork: drops per-process state
+              that must not be inherited (sockets, event loops, pools)
+              and splits the CPU threads between workers.
+
+Nothing here runs model inference in the master: inference starts
+OpenMP / MKL-DNN thread pools, which do not survive fork.
+"""
+
+import gc
+import os
+import sys
+
+
+def preload() -> None:
+    from .services.ocr_pool import warmup_ocr
+    from .utils.cost_utils import count_tokens
+
+    try:
+        warmup_ocr(infer=False)          # engines only; lifespan runs the first inference per worker
+    except Exception as e:
+        print("OCR preload failed:", e)
+    count_tokens("warm")                 # tiktoken BPE ranks
+
+    # everything allocated so far becomes immortal for the collector: a GC
+    # pass in a worker would otherwise write gc headers into (and so copy)
+    # every shared page holding a tracked object
+    gc.collect()
+    gc.freeze()
+    print(f"prefork: {gc.get_freeze_count()} objects frozen in master {os.getpid()}")
+
+
+def after_fork(workers: int) -> None:
+    from .db import mongo
+    from .utils import artifact_store, hedging
+
+    mongo.reset_client()
+    artifact_store._store = None         # boto3 clients are not fork-safe
+    hedging._loop = None                 # the loop thread exists only in the process that started it
+
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // max(1, workers)))
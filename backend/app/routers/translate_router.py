@@ -1,12 +1,18 @@
 #E:\HOPEAI\PJT\genai_translation\backend\app\routers\translate_router.py
-from fastapi import APIRouter, HTTPException, Request, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request, UploadFile, File, Form, Query
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 import os
+import json
 import tempfile
-import shutil
+from typing import Optional
 
 from app.ai_engine.langgraph_workflow import run_langgraph_workflow
+from app.utils.singleflight import pipeline_flight, request_key, content_hash
+from app.utils.tts_utils import iter_tts_chunks
+from app.db.records import list_history, find_by_hash, insert_shared_record
+from app.config.settings import HISTORY_PAGE_SIZE, HISTORY_MAX_PAGE_SIZE
 
 router = APIRouter()
 
@@ -19,12 +25,96 @@ class TextIn(BaseModel):
     user_id: str = "guest"
     translate: bool = True
     original_actions: dict = {}
+    timings: bool = False
+
+
+# ---------- SHARED PIPELINE RUNNERS ----------
+def _with_timings(res, want_timings: bool):
+    """
+    Timings are always collected (the result may be shared by coalesced
+    requests); strip them from a copy for callers that did not ask.
+    """
+    if want_timings or not isinstance(res, dict) or "timings" not in res:
+        return res
+    res = dict(res)
+    res.pop("timings", None)
+    return res
+
+
+def _own_record(res, request: dict):
+    """
+    Follower of another user's execution: stores the shared result under
+    this request's user_id so it shows up in their history / results.
+    """
+    if not isinstance(res, dict):
+        return res
+    try:
+        db_id = insert_shared_record(res, request)
+    except Exception as e:
+        print("DB save failed", e)
+        return res
+    res = dict(res)
+    if "db_id" in res:
+        res["db_id"] = db_id
+    return res
+
+
+def _run_upload(kind: str, filename: str, data: bytes, digest: str,
+                target_lang: str, output_pref: str, user_id: str):
+    """
+    Writes the upload to a temp file, runs the workflow, removes the file.
+    Executed once per distinct in-flight request (see pipeline_flight).
+    """
+    safe_name = os.path.basename(filename or "upload").replace(" ", "_")
+    # unique per execution: runs with the same bytes but another
+    # target_lang / output_pref must not share (and delete) the file;
+    # the name still ends in the original extension for validate_file
+    fd, temp_path = tempfile.mkstemp(prefix=f"{digest[:12]}_", suffix=f"_{safe_name}")
+
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+
+    try:
+        request = {
+            "kind": kind,
+            "text": None,
+            "file_path": temp_path,
+            "target_lang": target_lang,
+            "output_pref": output_pref,
+            "user_id": user_id,
+            "content_hash": digest,
+            "timings": True,
+        }
+        return run_langgraph_workflow(request)
+    finally:
+        try:
+            os.remove(temp_path)
+        except:
+            pass
+
+
+async def _coalesced_upload(kind: str, file: UploadFile, target_lang: str,
+                            output_pref: str, user_id: str, timings: bool = False):
+    data = await file.read()
+    digest = content_hash(data)
+    key = request_key(kind, digest, target_lang, output_pref)
+    res, needs_record = await pipeline_flight.do(
+        key, user_id, _run_upload, kind, file.filename, data, digest,
+        target_lang, output_pref, user_id,
+    )
+    if needs_record:
+        res = await run_in_threadpool(_own_record, res, {
+            "kind": kind, "user_id": user_id, "content_hash": digest,
+            "target_lang": target_lang, "output_pref": output_pref,
+        })
+    return _with_timings(res, timings)
 
 
 # ---------- TEXT ----------
 @router.post("/text/translate")
 async def translate_text_endpoint(payload: TextIn):
     try:
+        digest = content_hash(payload.text)
         request = {
             "kind": "text",
             "text": payload.text,
@@ -34,9 +124,17 @@ async def translate_text_endpoint(payload: TextIn):
             "user_id": payload.user_id,
             "translate": payload.translate,
             "original_actions": payload.original_actions,
+            "content_hash": digest,
+            "timings": True,
         }
-        res = run_langgraph_workflow(request)
-        return res
+        key = request_key(
+            "text", digest, payload.target_lang, payload.output_pref,
+            payload.translate, json.dumps(payload.original_actions, sort_keys=True),
+        )
+        res, needs_record = await pipeline_flight.do(key, payload.user_id, run_langgraph_workflow, request)
+        if needs_record:
+            res = await run_in_threadpool(_own_record, res, request)
+        return _with_timings(res, payload.timings)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -47,30 +145,10 @@ async def upload_audio(
     file: UploadFile = File(...),
     target_lang: str = Form("en"),
     output_pref: str = Form("both"),
-    user_id: str = Form("guest")
+    user_id: str = Form("guest"),
+    timings: bool = Form(False),
 ):
-    temp_dir = tempfile.gettempdir()
-    temp_path = os.path.join(temp_dir, file.filename)
-
-    with open(temp_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
-
-    try:
-        request = {
-            "kind": "audio",
-            "text": None,
-            "file_path": temp_path,
-            "target_lang": target_lang,
-            "output_pref": output_pref,
-            "user_id": user_id,
-        }
-        res = run_langgraph_workflow(request)
-        return res
-    finally:
-        try:
-            os.remove(temp_path)
-        except:
-            pass
+    return await _coalesced_upload("audio", file, target_lang, output_pref, user_id, timings)
 
 
 # ---------- DOCUMENT ----------
@@ -79,63 +157,21 @@ async def upload_document(
     file: UploadFile = File(...),
     target_lang: str = Form("en"),
     output_pref: str = Form("both"),
-    user_id: str = Form("guest")
+    user_id: str = Form("guest"),
+    timings: bool = Form(False),
 ):
-    temp_dir = tempfile.gettempdir()
-    temp_path = os.path.join(temp_dir, file.filename.replace(" ", "_"))
-
-    with open(temp_path, "wb") as f:
-        f.write(await file.read())
-
-    try:
-        request = {
-            "kind": "document",
-            "text": None,
-            "file_path": temp_path,
-            "target_lang": target_lang,
-            "output_pref": output_pref,
-            "user_id": user_id,
-        }
-        res = run_langgraph_workflow(request)
-        return res
+    return await _coalesced_upload("document", file, target_lang, output_pref, user_id, timings)
 
-    finally:
-        try:
-            os.remove(temp_path)
-        except:
-            pass
 
 @router.post("/image/upload")
 async def upload_image(
     file: UploadFile = File(...),
     target_lang: str = Form("en"),
     output_pref: str = Form("both"),
-    user_id: str = Form("guest")
+    user_id: str = Form("guest"),
+    timings: bool = Form(False),
 ):
-    temp_dir = tempfile.gettempdir()
-    filename = file.filename.replace(" ", "_")
-    temp_path = os.path.join(temp_dir, filename)
-
-    with open(temp_path, "wb") as f:
-        f.write(await file.read())
-
-    try:
-        request = {
-            "kind": "image",
-            "text": None,
-            "file_path": temp_path,
-            "target_lang": target_lang,
-            "output_pref": output_pref,
-            "user_id": user_id,
-        }
-        res = run_langgraph_workflow(request)
-        return res
-
-    finally:
-        try:
-            os.remove(temp_path)
-        except:
-            pass
+    return await _coalesced_upload("image", file, target_lang, output_pref, user_id, timings)
 
 
 # ---------- VIDEO ----------
@@ -144,31 +180,72 @@ async def upload_video(
     file: UploadFile = File(...),
     target_lang: str = Form("en"),
     output_pref: str = Form("both"),
-    user_id: str = Form("guest")
+    user_id: str = Form("guest"),
+    timings: bool = Form(False),
 ):
-    temp_dir = tempfile.gettempdir()
-    temp_path = os.path.join(temp_dir, file.filename)
+    return await _coalesced_upload("video", file, target_lang, output_pref, user_id, timings)
+
+
+# ---------- STREAMING TTS ----------
+class TTSIn(BaseModel):
+    text: str
+    lang: str = "en"
+
 
-    with open(temp_path, "wb") as f:
-        f.write(await file.read())
+@router.post("/tts/stream")
+def stream_tts(payload: TTSIn):
+    """
+    Streams MP3 audio sentence by sentence as chunks are synthesized,
+    instead of waiting for the whole text.
+    """
+    if not payload.text or not payload.text.strip():
+        raise HTTPException(status_code=400, detail="text is empty")
 
+    return StreamingResponse(
+        iter_tts_chunks(payload.text, payload.lang),
+        media_type="audio/mpeg",
+    )
+
+
+# ---------- HISTORY ----------
+@router.get("/history")
+def history(
+    user_id: str,
+    kind: Optional[str] = None,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=HISTORY_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="comma-separated top-level fields; default: metadata only"),
+):
+    """
+    A user's records, newest first. Pass `next_cursor` back as `cursor`
+    for the next page.
+    """
     try:
-        request = {
-            "kind": "video",
-            "text": None,
-            "file_path": temp_path,
-            "target_lang": target_lang,
-            "output_pref": output_pref,
-            "user_id": user_id,
-        }
-        res = run_langgraph_workflow(request)
-        return res
+        return list_history(
+            user_id, kind=kind, limit=limit, cursor=cursor,
+            fields=[f.strip() for f in fields.split(",") if f.strip()] if fields else None,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    finally:
-        try:
-            os.remove(temp_path)
-        except:
-            pass
+
+@router.get("/results/{digest}")
+def result_by_hash(
+    digest: str,
+    user_id: str,
+    kind: Optional[str] = None,
+    target_lang: Optional[str] = None,
+    output_pref: Optional[str] = None,
+):
+    """
+    The user's stored result for an input they already processed. `digest`
+    is the sha256 of the uploaded bytes (text: of the normalized text, as
+    in singleflight).
+    """
+    doc = find_by_hash(digest.lower(), user_id, kind=kind, target_lang=target_lang, output_pref=output_pref)
+    if doc is None:
+        raise HTTPException(status_code=404, detail="no result for this content hash")
+    return doc
 
 
 # ---------- WORKFLOW GRAPH IN ENDPOINT ----------
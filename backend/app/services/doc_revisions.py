@@ -0,0 +1,304 @@
+# app/services/doc_revisions.py
+"""
+Paragraph-level reuse across revisions of the same document.
+
+Text is cut into units at content-defined boundaries (a rolling hash over
+the text, not fixed offsets), so an edit only changes the fingerprints of
+the units it touches. Translations are cached per (user, target language,
+unit fingerprint) in `translation_units`; every upload is recorded in
+`document_versions` with its unit fingerprints. On re-upload only new or
+changed units go to the LLM. TTS needs nothing extra: unchanged units
+translate to identical sentences, which the per-sentence TTS cache serves.
+"""
+
+import re
+import time
+import hashlib
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from pymongo import ReplaceOne
+
+from ..config.settings import (
+    DOC_UNIT_CHARS,
+    DOC_STREAM_WORKERS,
+    DOC_CDC_MIN_CHARS,
+    DOC_CDC_AVG_CHARS,
+    DOC_REVISION_MIN_OVERLAP,
+)
+from ..db.mongo import get_db
+from ..utils.cost_utils import estimate_llm_cost
+from ..utils.metrics import stage, map_traced
+from .translation_service import translate_text, summarize_text
+
+_PARA_BREAK = re.compile(r"\n\s*\n")
+
+# Rabin–Karp rolling hash over the last _RH_WINDOW characters
+_RH_WINDOW = 32
+_RH_BASE = 257
+_RH_MOD = (1 << 61) - 1
+_RH_OUT = pow(_RH_BASE, _RH_WINDOW - 1, _RH_MOD)
+
+
+# -----------------------------
+# Fingerprints + content-defined units
+# -----------------------------
+def fingerprint(text: str) -> str:
+    """Whitespace-insensitive 128-bit fingerprint."""
+    return hashlib.blake2b(" ".join(text.split()).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def cdc_split(
+    text: str,
+    min_chars: int = DOC_CDC_MIN_CHARS,
+    avg_chars: int = DOC_CDC_AVG_CHARS,
+    max_chars: int = DOC_UNIT_CHARS,
+) -> List[str]:
+    """
+    Splits a long paragraph where the rolling hash of the preceding
+    window hits the divisor (cut at the next whitespace), or at the last
+    whitespace before max_chars. Cut points depend only on nearby text, so
+    inserting a sentence moves at most the pieces around it.
+    """
+    divisor = max(1, avg_chars - min_chars)
+    pieces, start, h, pending = [], 0, 0, False
+    for i, ch in enumerate(text):
+        if i >= _RH_WINDOW:
+            h = (h - ord(text[i - _RH_WINDOW]) * _RH_OUT) % _RH_MOD
+        h = (h * _RH_BASE + ord(ch)) % _RH_MOD
+        size = i + 1 - start
+        if size >= min_chars and h % divisor == 0:
+            pending = True
+        if pending and ch.isspace():
+            cut = i + 1
+        elif size >= max_chars:
+            cut = text.rfind(" ", start + min_chars, i + 1) + 1 or i + 1
+        else:
+            continue
+        pieces.append(text[start:cut])
+        start, pending = cut, False
+    pieces.append(text[start:])
+    return [p.strip() for p in pieces if p.strip()]
+
+
+def _is_boundary(piece_fp: str) -> bool:
+    return int(piece_fp[:8], 16) % 2 == 0
+
+
+def iter_units(
+    paragraphs: Iterable[Tuple[int, str]],
+    max_chars: int = DOC_UNIT_CHARS,
+    min_chars: int = DOC_CDC_MIN_CHARS,
+) -> Iterator[dict]:
+    """
+    Groups (page, paragraph) pairs into units of min_chars..max_chars.
+    A unit ends after a paragraph whose fingerprint marks a boundary once
+    min_chars is reached; paragraphs over max_chars go through cdc_split.
+    Each unit carries its fingerprint as `fp`.
+    """
+    index = 0
+    buf, size, first_page = [], 0, None
+
+    def emit():
+        nonlocal index, buf, size, first_page
+        text = "\n\n".join(buf)
+        unit = {"index": index, "page": first_page, "text": text, "fp": fingerprint(text)}
+        index += 1
+        buf, size, first_page = [], 0, None
+        return unit
+
+    for page, para in paragraphs:
+        pieces = [para] if len(para) <= max_chars else cdc_split(para, max_chars=max_chars)
+        for piece in pieces:
+            if buf and size + len(piece) > max_chars:
+                yield emit()
+            if first_page is None:
+                first_page = page
+            buf.append(piece)
+            size += len(piece)
+            if size >= min_chars and _is_boundary(fingerprint(piece)):
+                yield emit()
+    if buf:
+        yield emit()
+
+
+def text_units(text: str) -> List[dict]:
+    return list(iter_units((1, p) for p in _PARA_BREAK.split(text or "") if p.strip()))
+
+
+# -----------------------------
+# Storage
+# -----------------------------
+def _unit_id(user_id: str, target_lang: str, fp: str) -> str:
+    return f"{user_id}:{target_lang}:{fp}"
+
+
+def load_units(db, user_id: str, target_lang: str, fps: Iterable[str]) -> dict:
+    """fp → cached unit ({translated_text, source_lang, elapsed_sec})."""
+    ids = [_unit_id(user_id, target_lang, fp) for fp in set(fps)]
+    if not ids:
+        return {}
+    try:
+        with stage("db_find", model="mongo"):
+            docs = db.translation_units.find(
+                {"_id": {"$in": ids}},
+                {"fp": 1, "translated_text": 1, "source_lang": 1, "elapsed_sec": 1},
+            )
+            return {d["fp"]: d for d in docs}
+    except Exception as e:
+        print("Unit cache lookup failed", e)
+        return {}
+
+
+def save_units(db, user_id: str, target_lang: str, units: List[dict]) -> None:
+    """units: dicts with fp, translated_text, source_lang, elapsed_sec."""
+    if not units:
+        return
+    now = datetime.now(timezone.utc)
+    ops = [
+        ReplaceOne(
+            {"_id": _unit_id(user_id, target_lang, u["fp"])},
+            {**u, "user_id": user_id, "target_lang": target_lang, "updated_at": now},
+            upsert=True,
+        )
+        for u in units
+    ]
+    try:
+        with stage("db_insert", model="mongo"):
+            db.translation_units.bulk_write(ops, ordered=False)
+    except Exception as e:
+        print("Unit cache save failed", e)
+
+
+def find_previous_version(db, user_id: str, target_lang: str, fps: List[str]) -> Optional[dict]:
+    """
+    Latest earlier upload by this user sharing at least
+    DOC_REVISION_MIN_OVERLAP of its units with `fps`, else None.
+    """
+    if not fps:
+        return None
+    wanted = set(fps)
+    try:
+        with stage("db_find", model="mongo"):
+            candidates = list(
+                db.document_versions.find(
+                    {"user_id": user_id, "target_lang": target_lang, "unit_fps": {"$in": list(wanted)}}
+                ).sort("created_at", -1).limit(5)
+            )
+    except Exception as e:
+        print("Version lookup failed", e)
+        return None
+    for cand in candidates:
+        shared = len(wanted.intersection(cand.get("unit_fps", [])))
+        if shared / len(wanted) >= DOC_REVISION_MIN_OVERLAP:
+            return cand
+    return None
+
+
+def save_version(db, user_id: str, target_lang: str, fps: List[str], previous: Optional[dict], **extra) -> int:
+    """Records this upload; returns its version number."""
+    version = (previous.get("version", 1) + 1) if previous else 1
+    doc = {
+        "user_id": user_id,
+        "target_lang": target_lang,
+        "version": version,
+        "previous_id": previous.get("_id") if previous else None,
+        "doc_fp": fingerprint(" ".join(fps)),
+        "unit_fps": fps,
+        "created_at": datetime.now(timezone.utc),
+        **extra,
+    }
+    try:
+        with stage("db_insert", model="mongo"):
+            db.document_versions.insert_one(doc)
+    except Exception as e:
+        print("Version save failed", e)
+    return version
+
+
+def revision_report(version, previous, units, reused_units, reused_chars, total_chars, saved_sec) -> dict:
+    return {
+        "version": version,
+        "previous_version_id": str(previous["_id"]) if previous else None,
+        "units": units,
+        "reused_units": reused_units,
+        "reused_fraction": round(reused_chars / (total_chars or 1), 3),
+        "time_saved_sec": round(saved_sec, 2),
+    }
+
+
+# -----------------------------
+# Whole-text documents (handle_document)
+# -----------------------------
+class DocumentRevision:
+    """
+    One upload of an in-memory document: summarizes and translates it
+    reusing whatever an earlier version already produced.
+
+        rev = DocumentRevision(cleaned, user_id, target_lang)
+        summary = rev.summarize(detected)
+        translated, cost = rev.translate()
+        result["revision"] = rev.finish()
+    """
+
+    def __init__(self, text: str, user_id: str, target_lang: str):
+        self.text = text
+        self.user_id = user_id
+        self.target_lang = target_lang
+        self.units = text_units(text)
+        self.fps = [u["fp"] for u in self.units]
+        self.doc_fp = fingerprint(" ".join(self.fps))
+        self.db = get_db()
+        self.previous = find_previous_version(self.db, user_id, target_lang, self.fps)
+        self.reused_units = 0
+        self.reused_chars = 0
+        self.saved_sec = 0.0
+        self.summary = {}
+
+    def summarize(self, lang: str) -> str:
+        prev = self.previous
+        if prev and prev.get("doc_fp") == self.doc_fp and prev.get("summary_lang") == lang and prev.get("summary_source"):
+            self.saved_sec += prev.get("summary_elapsed_sec", 0.0)
+            self.summary = {k: prev[k] for k in ("summary_source", "summary_lang", "summary_elapsed_sec") if k in prev}
+            return prev["summary_source"]
+
+        t0 = time.perf_counter()
+        summary = summarize_text(self.text, language=lang)
+        self.summary = {
+            "summary_source": summary,
+            "summary_lang": lang,
+            "summary_elapsed_sec": round(time.perf_counter() - t0, 3),
+        }
+        return summary
+
+    def translate(self) -> Tuple[str, float]:
+        """Full translation (units joined by blank lines) and the cost of the new units."""
+        cached = load_units(self.db, self.user_id, self.target_lang, self.fps)
+        misses = list({u["fp"]: u for u in self.units if u["fp"] not in cached}.values())
+
+        def _one(unit):
+            t0 = time.perf_counter()
+            out = translate_text(unit["text"], self.target_lang)
+            return {"fp": unit["fp"], "translated_text": out, "elapsed_sec": round(time.perf_counter() - t0, 3)}
+
+        with ThreadPoolExecutor(max_workers=DOC_STREAM_WORKERS, thread_name_prefix="doc-rev") as pool:
+            fresh = map_traced(pool, _one, misses)
+        save_units(self.db, self.user_id, self.target_lang, fresh)
+
+        cost = sum(estimate_llm_cost(u["text"], f["translated_text"]) for u, f in zip(misses, fresh))
+        done = {**cached, **{f["fp"]: f for f in fresh}}
+        for u in self.units:
+            if u["fp"] in cached:
+                self.reused_units += 1
+                self.reused_chars += len(u["text"])
+                self.saved_sec += cached[u["fp"]].get("elapsed_sec", 0.0)
+        return "\n\n".join(done[u["fp"]]["translated_text"] for u in self.units), cost
+
+    def finish(self) -> dict:
+        """Stores this version; returns the reuse report for the result."""
+        version = save_version(self.db, self.user_id, self.target_lang, self.fps, self.previous, **self.summary)
+        return revision_report(
+            version, self.previous, len(self.units), self.reused_units,
+            self.reused_chars, sum(len(u["text"]) for u in self.units), self.saved_sec,
+        )
@@ -0,0 +1,319 @@
+# app/services/document_stream.py
+"""
+Bounded-memory pipeline for large documents.
+
+Pages are split into paragraph units and each unit is cleaned, moderated,
+translated and voiced on its own. At most DOC_MAX_INFLIGHT units exist at
+any time; finished units are appended in order to a JSONL artifact and to
+Mongo (`document_units`), so neither the full text nor the full
+translation is ever held in memory or stored in one BSON document.
+Units are content-defined (doc_revisions), so re-uploads of a revised
+document reuse the cached translations of unchanged units.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from ..config.settings import (
+    PDF_LAYOUT_MODE,
+    DOC_STREAM_MIN_PAGES,
+    DOC_STREAM_MIN_BYTES,
+    DOC_UNIT_CHARS,
+    DOC_STREAM_WORKERS,
+    DOC_MAX_INFLIGHT,
+    DOC_DB_BATCH,
+    DOC_SUMMARY_CHUNK_CHARS,
+    DOC_SUMMARY_FANIN,
+    DOC_REUSE_ENABLED,
+)
+from ..db.mongo import get_db
+from ..utils.helpers import clean_text, moderate_text
+from ..utils.cost_utils import estimate_llm_cost, estimate_tts_cost
+from ..utils.tts_utils import iter_tts_chunks, fix_tamil_phonemes, save_tts
+from ..utils.artifact_store import get_store
+from ..utils.metrics import stage, set_source_lang, submit_traced
+from .lang_detect import detect_language
+from .pdf_extract import iter_document_pages
+from .doc_revisions import iter_units, load_units, save_units, find_previous_version, save_version, revision_report
+from .translation_service import translate_text, summarize_text
+
+
+# -----------------------------
+# Routing
+# -----------------------------
+def should_stream(file_path: str) -> bool:
+    """PDFs with many pages, or large text/docx files."""
+    try:
+        if str(file_path).lower().endswith(".pdf"):
+            with fitz.open(file_path) as doc:
+                return doc.page_count > DOC_STREAM_MIN_PAGES
+        return os.path.getsize(file_path) > DOC_STREAM_MIN_BYTES
+    except Exception:
+        return False
+
+
+# -----------------------------
+# Paragraphs
+# -----------------------------
+_PARA_BREAK = re.compile(r"\n\s*\n")
+
+
+def _iter_paragraphs(file_path: str, layout: bool) -> Iterator[Tuple[int, str]]:
+    """(page, paragraph) pairs; page is 1 for formats without pages."""
+    ext = str(file_path).lower()
+    if ext.endswith(".pdf"):
+        for page_no, text, _source in iter_document_pages(file_path, layout=layout):
+            for para in _PARA_BREAK.split(text):
+                if para.strip():
+                    yield page_no, para
+        return
+
+    if ext.endswith(".docx"):
+        import docx
+
+        for p in docx.Document(file_path).paragraphs:
+            if p.text.strip():
+                yield 1, p.text
+        return
+
+    # TXT / others: read line by line, blank line = paragraph break
+    buf = []
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            if line.strip():
+                buf.append(line)
+            elif buf:
+                yield 1, "".join(buf)
+                buf = []
+    if buf:
+        yield 1, "".join(buf)
+
+
+# -----------------------------
+# Hierarchical summary
+# -----------------------------
+class RollingSummary:
+    """
+    Summary of an unbounded stream in bounded memory: text is buffered up
+    to DOC_SUMMARY_CHUNK_CHARS and summarized into a partial; once
+    DOC_SUMMARY_FANIN partials pile up they are summarized into one.
+    """
+
+    def __init__(self, chunk_chars: int = DOC_SUMMARY_CHUNK_CHARS, fan_in: int = DOC_SUMMARY_FANIN):
+        self.chunk_chars = chunk_chars
+        self.fan_in = max(2, fan_in)
+        self.buf, self.size = [], 0
+        self.partials = []
+        self.calls = 0
+
+    def _summarize(self, text: str, lang: str) -> str:
+        self.calls += 1
+        return summarize_text(text, language=lang)
+
+    def add(self, text: str, lang: str) -> None:
+        self.buf.append(text)
+        self.size += len(text)
+        if self.size >= self.chunk_chars:
+            self._flush(lang)
+
+    def _flush(self, lang: str) -> None:
+        if self.buf:
+            self.partials.append(self._summarize("\n\n".join(self.buf), lang))
+            self.buf, self.size = [], 0
+        if len(self.partials) >= self.fan_in:
+            self.partials = [self._summarize("\n\n".join(self.partials), lang)]
+
+    def finish(self, lang: str) -> str:
+        if not self.partials:
+            # short stream: one summary of everything buffered
+            return self._summarize("\n\n".join(self.buf), lang) if self.buf else ""
+        self._flush(lang)
+        if len(self.partials) == 1:
+            return self.partials[0]
+        return self._summarize("\n\n".join(self.partials), lang)
+
+
+# -----------------------------
+# Per-unit work (runs in the worker pool)
+# -----------------------------
+def _process_unit(unit: dict, target_lang: str, want_audio: bool, db=None, user_id: str = "guest") -> Optional[dict]:
+    """db given → translations are looked up in / added to the unit cache."""
+    cleaned = clean_text(unit["text"])
+    if not cleaned:
+        return None
+
+    rec = {"index": unit["index"], "page": unit["page"], "fp": unit["fp"]}
+    moderation = moderate_text(cleaned)
+    if not moderation.get("is_safe", True):
+        # skipped, and none of its text (source or flagged word) is persisted
+        # to the JSONL artifact / document_units: only that it was unsafe
+        rec["unsafe"] = True
+        rec["moderation"] = {"category": moderation.get("category")}
+        return rec
+    rec["source_text"] = cleaned
+
+    lang = detect_language(cleaned)
+    rec["detected_lang"] = lang
+    if lang != target_lang:
+        hit = load_units(db, user_id, target_lang, [unit["fp"]]).get(unit["fp"]) if db is not None else None
+        if hit:
+            translated = hit["translated_text"]
+            rec["reused"] = True
+            rec["saved_sec"] = hit.get("elapsed_sec", 0.0)
+        else:
+            t0 = time.perf_counter()
+            translated = translate_text(cleaned, target_lang)
+            rec["translation_cost_usd"] = estimate_llm_cost(cleaned, translated)
+            if db is not None:
+                save_units(db, user_id, target_lang, [{
+                    "fp": unit["fp"], "translated_text": translated, "source_lang": lang,
+                    "elapsed_sec": round(time.perf_counter() - t0, 3),
+                }])
+        rec["translated_text"] = translated
+        if want_audio and translated.strip():
+            tts_text = fix_tamil_phonemes(translated) if target_lang == "ta" else translated
+            try:
+                rec["_audio"] = b"".join(iter_tts_chunks(tts_text, target_lang))
+                rec["tts_cost_usd"] = estimate_tts_cost(translated, target_lang)
+            except Exception as e:
+                print("Unit TTS failed:", e)
+    return rec
+
+
+# -----------------------------
+# Pipeline
+# -----------------------------
+def handle_document_stream(
+    file_path: str,
+    target_lang: str = "en",
+    output_pref: str = "both",
+    user_id: str = "guest",
+    layout: bool = PDF_LAYOUT_MODE,
+) -> dict:
+    """
+    Same result shape as handle_document's long-document branch, plus
+    `units_path` (JSONL with every unit's source/translation) and
+    `doc_key` (Mongo `document_units.doc_key`).
+    """
+    want_audio = output_pref in ("audio", "both")
+    doc_key = uuid.uuid4().hex
+    store = get_store()
+    db = get_db()
+
+    units_out = store.open_writer("json", "jsonl")
+    audio_out = store.open_writer("audio", "mp3") if want_audio else None
+    summary = RollingSummary()
+    lang_chars: Counter = Counter()
+    pages = set()
+    totals = {"units": 0, "unsafe_units": 0, "translation_cost_usd": 0.0, "tts_cost_usd": 0.0}
+    reuse = {"units": 0, "chars": 0, "total_chars": 0, "saved_sec": 0.0}
+    fps = []
+    db_batch = []
+
+    def flush_db():
+        if db_batch:
+            try:
+                with stage("db_insert", model="mongo"):
+                    db.document_units.insert_many(list(db_batch), ordered=False)
+            except Exception as e:
+                print("DB unit save failed", e)
+            db_batch.clear()
+
+    def drain(fut):
+        rec = fut.result()
+        if rec is None:
+            return
+        audio = rec.pop("_audio", None)
+        totals["units"] += 1
+        pages.add(rec["page"])
+        fps.append(rec["fp"])
+        reuse["total_chars"] += len(rec.get("source_text", ""))
+        if rec.pop("reused", False):
+            reuse["units"] += 1
+            reuse["chars"] += len(rec["source_text"])
+            reuse["saved_sec"] += rec.pop("saved_sec", 0.0)
+        if rec.get("unsafe"):
+            totals["unsafe_units"] += 1
+        else:
+            lang = rec["detected_lang"]
+            lang_chars[lang] += len(rec["source_text"])
+            summary.add(rec["source_text"], lang_chars.most_common(1)[0][0])
+            totals["translation_cost_usd"] += rec.get("translation_cost_usd", 0.0)
+            totals["tts_cost_usd"] += rec.get("tts_cost_usd", 0.0)
+        units_out.write((json.dumps(rec, ensure_ascii=False) + "\n").encode("utf-8"))
+        if audio and audio_out is not None:
+            audio_out.write(audio)
+        db_batch.append({**rec, "doc_key": doc_key, "user_id": user_id})
+        if len(db_batch) >= DOC_DB_BATCH:
+            flush_db()
+
+    inflight = deque()
+    with ThreadPoolExecutor(max_workers=DOC_STREAM_WORKERS, thread_name_prefix="doc-unit") as pool:
+        for unit in iter_units(_iter_paragraphs(file_path, layout)):
+            inflight.append(submit_traced(
+                pool, _process_unit, unit, target_lang, want_audio, db if DOC_REUSE_ENABLED else None, user_id,
+            ))
+            if len(inflight) >= DOC_MAX_INFLIGHT:
+                drain(inflight.popleft())
+        while inflight:
+            drain(inflight.popleft())
+    flush_db()
+
+    if not totals["units"]:
+        return {"error": "empty_document", "message": "Could not extract text.", "input_file": file_path}
+
+    detected = lang_chars.most_common(1)[0][0] if lang_chars else "unknown"
+    set_source_lang(detected)
+
+    result = {
+        "input_file": file_path,
+        "pages": len(pages),
+        "detected_lang": detected,
+        "target_lang": target_lang,
+        "streamed": True,
+        "doc_key": doc_key,
+        "units": totals["units"],
+        "unsafe_units": totals["unsafe_units"],
+        "units_path": units_out.commit(),
+    }
+
+    summary_src = summary.finish(detected)
+    result["summary_source"] = summary_src
+    result["summary_calls"] = summary.calls
+    if want_audio and summary_src:
+        try:
+            result["summary_audio_source"] = save_tts(summary_src, lang=detected)
+            totals["tts_cost_usd"] += estimate_tts_cost(summary_src, detected)
+        except Exception:
+            pass
+    if detected != target_lang and summary_src:
+        result["summary_translated"] = translate_text(summary_src, target_lang)
+
+    if audio_out is not None:
+        if audio_out.size:
+            result["translated_audio"] = audio_out.commit()
+        else:
+            audio_out.discard()     # nothing was voiced
+
+    if DOC_REUSE_ENABLED:
+        previous = find_previous_version(db, user_id, target_lang, fps)
+        version = save_version(db, user_id, target_lang, fps, previous, doc_key=doc_key)
+        result["revision"] = revision_report(
+            version, previous, totals["units"], reuse["units"],
+            reuse["chars"], reuse["total_chars"], reuse["saved_sec"],
+        )
+
+    if totals["translation_cost_usd"]:
+        result["translation_cost_usd"] = round(totals["translation_cost_usd"], 6)
+    if totals["tts_cost_usd"]:
+        result["tts_cost_usd"] = round(totals["tts_cost_usd"], 6)
+    result["total_cost_usd"] = round(totals["translation_cost_usd"] + totals["tts_cost_usd"], 6)
+    return result
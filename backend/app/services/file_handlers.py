@@ -1,77 +1,37 @@
 #E:\HOPEAI\PJT\genai_translation\backend\app\services\file_handlers.py
 import os, tempfile, shutil,re
 from pathlib import Path
-from ..config.settings import MAX_UPLOAD_MB, AUDIO_EXTS, VIDEO_EXTS, DOC_EXTS, ALLOWED_EXTS
+from ..config.settings import MAX_UPLOAD_MB, AUDIO_EXTS, VIDEO_EXTS, DOC_EXTS, ALLOWED_EXTS, OCR_PREPROCESS, PDF_LAYOUT_MODE, DOC_REUSE_ENABLED
 from ..utils.helpers import validate_file, clean_text, detect_domain_tone, moderate_text
 from .transcribe_service import transcribe_with_openai, restore_punctuation
-from .translation_service import translate_text, summarize_text
+from .translation_service import translate_text, summarize_text, translate_segments
 from ..utils.tts_utils import save_tts, fix_tamil_phonemes
 from ..utils.cost_utils import (
     estimate_llm_cost,
     estimate_tts_cost,
     estimate_audio_cost,
 )
-from ..db.mongo import get_db
+from ..db.records import insert_record
+from ..utils.metrics import stage, timed, set_source_lang
 from .audio_enhance import enhance_voice
-from paddleocr import PaddleOCR
-from PIL import Image
+from .media import AudioClip, load_audio, prepare_stt_upload
+from .vad import condense_speech
+from .ocr_pool import get_ocr_pool
+from .image_prep import prepare_image
+from .pdf_extract import iter_document_pages
+from .document_stream import should_stream, handle_document_stream
+from .doc_revisions import DocumentRevision
+from .translation_memory import translate_with_memory
+from .lang_detect import detect_language, script_fraction, segment_languages, is_code_mixed
+from ..utils.artifact_store import get_store
 import json
 
-# PDF Extraction
-import pdfplumber
-import pytesseract
-pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-from PIL import Image
-import fitz  # PyMuPDF
-
-# From Video - extract Audio
-import subprocess
-import uuid
-
 # -------------------- Language detection --------------------
-# Optional high-accuracy detector (Lingua). Falls back to langdetect safe detector if not installed.
-try:
-    from lingua import Language, LanguageDetectorBuilder
-
-    LANGUAGES = [Language.ENGLISH, Language.TAMIL, Language.HINDI]
-    detector = LanguageDetectorBuilder.from_languages(*LANGUAGES).build()
-
-    def detect_lang(text: str):
-        try:
-            lang = detector.detect_language_of(text)
-            if lang is None:
-                return "unknown"
-            if lang == Language.ENGLISH:
-                return "en"
-            if lang == Language.TAMIL:
-                return "ta"
-            if lang == Language.HINDI:
-                return "hi"
-            # fallback to short name
-            return lang.name.lower()[:2]
-        except Exception:
-            return "unknown"
-
-except Exception:
-    # Fallback: simple safe langdetect usage (less accurate but works without extra deps)
-    try:
-        from langdetect import detect
-        from langdetect.lang_detect_exception import LangDetectException
-
-        def detect_lang(text: str):
-            try:
-                # for very short text default to English
-                if not text or len(text.split()) < 2:
-                    return "en"
-                return detect(text)
-            except LangDetectException:
-                return "unknown"
-            except Exception:
-                return "unknown"
-
-    except Exception:
-        def detect_lang(text: str):
-            return "unknown"
+@timed("detect_lang", model="script+lingua")
+def detect_lang(text: str):
+    lang = detect_language(text)
+    set_source_lang(lang)
+    return lang
 
 
 #OUTPUT_JSON_DIR = "static/json"
@@ -94,39 +54,27 @@ def _remove_mongo_id(d: dict):
         d.pop("_id", None)
 
 
+@timed("save_json")
 def _save_json(data: dict, prefix: str = "result") -> str:
-    fname = f"{prefix}_{int(os.times()[4])}.json"
-    path = os.path.join(OUTPUT_JSON_DIR, fname)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    #return path
-    return "/" + path.replace("\\", "/")   # Convert path → URL format
+    """
+    Store result JSON content-addressed (json/<prefix>/ab/cd/<sha256>.json).
+    Identical results share one file; different ones can never collide.
+    """
+    payload = json.dumps(data, ensure_ascii=False, indent=2, default=str).encode("utf-8")
+    return get_store().put(payload, f"json/{prefix}", ".json")   # URL format
 
 
-def get_audio_duration(file_path: str) -> float:
+def _insert_record(result: dict):
     """
-    Use ffprobe (FFmpeg) to get audio duration in seconds.
-    Returns 0.0 if anything fails.
+    Insert result into db.records (stamped with user / kind / content hash,
+    see db.records). Returns inserted id as str, or None on failure.
     """
     try:
-        result = subprocess.run(
-            [
-                "ffprobe",
-                "-v",
-                "error",
-                "-show_entries",
-                "format=duration",
-                "-of",
-                "default=noprint_wrappers=1:nokey=1",
-                file_path,
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        return float(result.stdout.strip())
-    except Exception:
-        return 0.0
+        with stage("db_insert", model="mongo"):
+            return insert_record(result)
+    except Exception as e:
+        print("DB save failed", e)
+        return None
 
 
 # =====================================================
@@ -143,6 +91,11 @@ def handle_text(text: str, target_lang: str = "en", output_pref: str = "both", u
     domain_tone = detect_domain_tone(cleaned)
     detected = detect_lang(cleaned) if cleaned else "unknown"
 
+    # span-level languages (Tanglish / Hinglish in native script + English)
+    with stage("segment_languages"):
+        segments = segment_languages(cleaned) if cleaned else []
+    code_mixed = is_code_mixed(segments, target_lang)
+
     result = {
         "input": text,
         "cleaned": cleaned,
@@ -157,7 +110,8 @@ def handle_text(text: str, target_lang: str = "en", output_pref: str = "both", u
 
     try:
         # SAME LANGUAGE TEXT → NO TRANSLATION
-        if detected == target_lang:
+        # (a target-language message with foreign spans still gets those translated)
+        if detected == target_lang and not code_mixed:
             result["same_language"] = True
             result["source_text"] = cleaned
 
@@ -183,11 +137,21 @@ def handle_text(text: str, target_lang: str = "en", output_pref: str = "both", u
                 except Exception:
                     result["audio_source"] = None
 
-            # Full translation (short text → no summary)
-            translated = translate_text(cleaned, target_lang)
+            # Full translation (short text → no summary);
+            # code-mixed input: only the spans not already in target_lang
+            # cost of what was actually sent: TM hits and target-language
+            # spans never reach the LLM
+            if code_mixed:
+                translated, mix_stats = translate_segments(segments, target_lang)
+                result["code_mixed"] = mix_stats
+                translation_cost = mix_stats["cost_usd"]
+            else:
+                translated, tm_stats = translate_with_memory(cleaned, target_lang, user_id)
+                if tm_stats:
+                    result["translation_memory"] = tm_stats
+                translation_cost = tm_stats["cost_usd"] if tm_stats else estimate_llm_cost(cleaned, translated)
             result["translated_text"] = translated
 
-            translation_cost = estimate_llm_cost(cleaned, translated)
             # Target audio
             if output_pref in ("audio", "both"):
                 try:
@@ -208,11 +172,7 @@ def handle_text(text: str, target_lang: str = "en", output_pref: str = "both", u
         json_path = _save_json(result, prefix="text")
         result["json_path"] = json_path
 
-        try:
-            db = get_db()
-            db.records.insert_one(result)
-        except Exception as e:
-            print("DB save failed", e)
+        _insert_record(result)
 
         _remove_mongo_id(result)
         return result
@@ -230,14 +190,46 @@ def handle_audio(file_path: str, target_lang: str = "en", output_pref: str = "bo
     if isinstance(validation, dict) and "error" in validation:
         return validation
 
-    # 2. ENHANCE VOICE FIRST (Demucs)
-    file_path = enhance_voice(file_path)
+    # 2. DECODE ONCE (in-process / single ffmpeg pipe)
+    try:
+        clip = load_audio(file_path)
+    except Exception as e:
+        print("Audio decode failed:", e)
+        return {"error": "audio_decode_failed", "message": "Could not decode audio."}
+
+    return _process_audio(clip, file_path, target_lang, output_pref, user_id)
+
+
+def _process_audio(clip: AudioClip, upload_path, target_lang: str, output_pref: str, user_id: str):
+    """
+    Shared audio/video pipeline on decoded PCM.
+    `upload_path`: original file, sent to STT as-is when it is smaller than
+    the re-encoded upload; None → always re-encode.
+    """
+    file_path = clip.source_path
+
+    # 2.1 ENHANCE VOICE (Demucs, on samples)
+    enhanced = enhance_voice(clip)
 
-    # 2.1 DURATION FOR COST
-    duration_sec = get_audio_duration(file_path)
+    # 2.2 DURATION (from the decoded stream, no probe)
+    duration_sec = clip.duration
 
-    # 3. TRANSCRIBE
-    text, stt_model = transcribe_with_openai(file_path)  # stt_model should be like "whisper-1"
+    # 2.3 VOICE ACTIVITY → speech only; no speech → skip the paid call
+    speech, speech_map = condense_speech(enhanced)
+    if speech_map is not None and not speech_map.regions:
+        return {
+            "error": "no_speech_detected",
+            "input_file": file_path,
+            "message": "Speech not detected or audio too noisy",
+            "audio_duration_sec": duration_sec,
+            "speech_sec": 0.0,
+            "stt_skipped": True,
+            "transcription_cost_usd": 0.0,
+        }
+
+    # 3. TRANSCRIBE (speech only, low-bitrate speech codec)
+    upload, upload_info = prepare_stt_upload(speech, upload_path if speech is clip else None)
+    text, stt_model = transcribe_with_openai(upload)  # stt_model should be like "whisper-1"
     if not text or not text.strip():
         return {
             "error": "no_speech_detected",
@@ -250,8 +242,8 @@ def handle_audio(file_path: str, target_lang: str = "en", output_pref: str = "bo
     moderation = moderate_text(cleaned)
     detected = detect_lang(cleaned) if cleaned else "unknown"
 
-    # transcription cost
-    transcription_cost = estimate_audio_cost(duration_sec, stt_model)
+    # transcription cost (billed on the uploaded speech-only audio)
+    transcription_cost = estimate_audio_cost(upload_info["duration_sec"], stt_model)
 
     result = {
         "input_file": file_path,
@@ -263,7 +255,12 @@ def handle_audio(file_path: str, target_lang: str = "en", output_pref: str = "bo
         "stt_model": stt_model,
         "audio_duration_sec": duration_sec,
         "transcription_cost_usd": round(transcription_cost, 6),
+        "stt_upload": upload_info,
     }
+    if speech_map is not None:
+        # original-recording timestamps of what was sent
+        result["speech_sec"] = round(speech_map.speech_sec, 3)
+        result["speech_segments"] = speech_map.as_list()
 
     if not moderation.get("is_safe", True):
         result["error"] = "unsafe"
@@ -326,9 +323,11 @@ def handle_audio(file_path: str, target_lang: str = "en", output_pref: str = "bo
                     tts_cost += estimate_tts_cost(translated_full, target_lang)
 
             else:
-                translated = translate_text(cleaned, target_lang)
+                translated, tm_stats = translate_with_memory(cleaned, target_lang, user_id)
+                if tm_stats:
+                    result["translation_memory"] = tm_stats
                 result["translated_text"] = translated
-                translation_cost = estimate_llm_cost(cleaned, translated)
+                translation_cost = tm_stats["cost_usd"] if tm_stats else estimate_llm_cost(cleaned, translated)
 
                 if output_pref in ("audio", "both"):
                     audio_tgt = save_tts(translated, lang=target_lang, out_dir=OUTPUT_AUDIO_DIR)
@@ -350,11 +349,7 @@ def handle_audio(file_path: str, target_lang: str = "en", output_pref: str = "bo
         json_path = _save_json(result, prefix="audio")
         result["json_path"] = json_path
 
-        try:
-            db = get_db()
-            db.records.insert_one(result)
-        except Exception as e:
-            print("DB save failed", e)
+        _insert_record(result)
 
         _remove_mongo_id(result)
         return result
@@ -367,11 +362,13 @@ def handle_audio(file_path: str, target_lang: str = "en", output_pref: str = "bo
 # DOCUMENT HANDLER
 # =====================================================
 
-def extract_text_universal(file_path: str):
+@timed("extract_text")
+def extract_text_universal(file_path: str, layout: bool = PDF_LAYOUT_MODE):
     """
     Extracts English + Tamil + Hindi text using:
-      1. pdfplumber (for digital PDFs)
-      2. OCR fallback (eng+tam+hin)
+      1. PyMuPDF text layer, page by page (pdfplumber when layout=True)
+      2. OCR per page for scanned / Tamil / Hindi pages, with only the
+         tesseract packs that page needs
       3. docx extraction
     """
     ext = str(file_path).lower()
@@ -379,29 +376,16 @@ def extract_text_universal(file_path: str):
 
     # PDF
     if ext.endswith(".pdf"):
+        parts, sources = [], {}
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    txt = page.extract_text() or ""
-                    text += txt + "\n"
-        except Exception:
-            text = ""
-
-        contains_tamil = any("\u0B80" <= ch <= "\u0BFF" for ch in text)
-        contains_hindi = any("\u0900" <= ch <= "\u097F" for ch in text)
-
-        if contains_tamil or contains_hindi or len(text.strip()) < 300:
-            print("Using OCR for multilingual PDF...")
-            ocr_text = ""
-            doc = fitz.open(file_path)
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                pix = page.get_pixmap()
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                ocr_text += pytesseract.image_to_string(img, lang="eng+tam+hin") + "\n"
-            text = ocr_text
-
-        return text.strip()
+            for _n, txt, source in iter_document_pages(file_path, layout=layout):
+                parts.append(txt + "\n")
+                sources[source] = sources.get(source, 0) + 1
+        except Exception as e:
+            print("PDF extraction failed:", e)
+        if any(src.startswith("ocr:") for src in sources):
+            print("PDF pages by source:", sources)
+        return "".join(parts).strip()
 
     # DOCX
     if ext.endswith(".docx"):
@@ -443,6 +427,18 @@ def handle_document(
     if isinstance(validation, dict) and "error" in validation:
         return validation
 
+    # 1.1 LARGE DOCUMENT → bounded streaming pipeline (per page/paragraph)
+    if should_stream(file_path):
+        result = handle_document_stream(file_path, target_lang, output_pref, user_id)
+        if "error" in result:
+            return result
+        result["json_path"] = _save_json(result, prefix="document")
+        db_id = _insert_record(result)
+        if db_id:
+            result["db_id"] = db_id
+        _remove_mongo_id(result)
+        return result
+
     # 2. EXTRACT
     text = extract_text_universal(file_path)
     if not text or not text.strip():
@@ -475,6 +471,9 @@ def handle_document(
     if not is_long:
         result["source_text"] = cleaned
 
+    # revision of an earlier upload → reuse its unchanged paragraphs
+    revision = DocumentRevision(cleaned, user_id, target_lang) if DOC_REUSE_ENABLED else None
+
     translation_cost = 0.0
     tts_cost = 0.0
 
@@ -495,7 +494,10 @@ def handle_document(
 
     # LONG DOCUMENT
     if is_long:
-        summary_src = summarize_text(cleaned, language=detected)
+        if revision:
+            summary_src = revision.summarize(detected)
+        else:
+            summary_src = summarize_text(cleaned, language=detected)
         result["summary_source"] = summary_src
 
         audio_src = _audio(summary_src, detected)
@@ -504,6 +506,8 @@ def handle_document(
 
         if detected == target_lang:
             # same language, stop here
+            if revision:
+                result["revision"] = revision.finish()
             json_path = _save_json(result, prefix="document")
             result["json_path"] = json_path
 
@@ -511,24 +515,27 @@ def handle_document(
                 result["tts_cost_usd"] = round(tts_cost, 6)
             result["total_cost_usd"] = round(tts_cost, 6)
 
-            try:
-                ins = get_db().records.insert_one(result)
-                result["db_id"] = str(ins.inserted_id)
-            except Exception:
-                pass
+            db_id = _insert_record(result)
+            if db_id:
+                result["db_id"] = db_id
 
             _remove_mongo_id(result)
             return result
 
         # diff language → full translation
-        translated_full = translate_text(cleaned, target_lang)
+        if revision:
+            translated_full, translation_cost = revision.translate()
+        else:
+            translated_full = translate_text(cleaned, target_lang)
+            translation_cost = estimate_llm_cost(cleaned, translated_full)
         result["translated_text"] = translated_full
-        translation_cost = estimate_llm_cost(cleaned, translated_full)
 
         audio_tgt = _audio(translated_full, target_lang)
         if audio_tgt:
             result["translated_audio"] = audio_tgt
 
+        if revision:
+            result["revision"] = revision.finish()
         json_path = _save_json(result, prefix="document")
         result["json_path"] = json_path
 
@@ -538,11 +545,9 @@ def handle_document(
             result["tts_cost_usd"] = round(tts_cost, 6)
         result["total_cost_usd"] = round(translation_cost + tts_cost, 6)
 
-        try:
-            ins = get_db().records.insert_one(result)
-            result["db_id"] = str(ins.inserted_id)
-        except Exception:
-            pass
+        db_id = _insert_record(result)
+        if db_id:
+            result["db_id"] = db_id
 
         _remove_mongo_id(result)
         return result
@@ -554,6 +559,8 @@ def handle_document(
         if audio_src:
             result["audio_source"] = audio_src
 
+        if revision:
+            result["revision"] = revision.finish()
         json_path = _save_json(result, prefix="document")
         result["json_path"] = json_path
 
@@ -561,11 +568,9 @@ def handle_document(
             result["tts_cost_usd"] = round(tts_cost, 6)
         result["total_cost_usd"] = round(tts_cost, 6)
 
-        try:
-            ins = get_db().records.insert_one(result)
-            result["db_id"] = str(ins.inserted_id)
-        except Exception:
-            pass
+        db_id = _insert_record(result)
+        if db_id:
+            result["db_id"] = db_id
 
         _remove_mongo_id(result)
         return result
@@ -575,14 +580,19 @@ def handle_document(
     if audio_src:
         result["audio_source"] = audio_src
 
-    translated_full = translate_text(cleaned, target_lang)
+    if revision:
+        translated_full, translation_cost = revision.translate()
+    else:
+        translated_full = translate_text(cleaned, target_lang)
+        translation_cost = estimate_llm_cost(cleaned, translated_full)
     result["translated_text"] = translated_full
-    translation_cost = estimate_llm_cost(cleaned, translated_full)
 
     audio_tgt = _audio(translated_full, target_lang)
     if audio_tgt:
         result["translated_audio"] = audio_tgt
 
+    if revision:
+        result["revision"] = revision.finish()
     json_path = _save_json(result, prefix="document")
     result["json_path"] = json_path
 
@@ -592,11 +602,9 @@ def handle_document(
         result["tts_cost_usd"] = round(tts_cost, 6)
     result["total_cost_usd"] = round(translation_cost + tts_cost, 6)
 
-    try:
-        ins = get_db().records.insert_one(result)
-        result["db_id"] = str(ins.inserted_id)
-    except Exception:
-        pass
+    db_id = _insert_record(result)
+    if db_id:
+        result["db_id"] = db_id
 
     _remove_mongo_id(result)
     return result
@@ -605,34 +613,6 @@ def handle_document(
 # VIDEO HANDLER
 # =====================================================
 
-def extract_audio_ffmpeg(video_path: str) -> str:
-    """
-    Converts video → WAV audio using FFmpeg.
-    Returns path to temp WAV file.
-    """
-    out_path = os.path.join(tempfile.gettempdir(), f"video_audio_{uuid.uuid4().hex}.wav")
-
-    command = [
-        "ffmpeg",
-        "-i",
-        video_path,
-        "-vn",
-        "-acodec",
-        "pcm_s16le",
-        "-ar",
-        "16000",
-        "-ac",
-        "1",
-        out_path,
-    ]
-
-    try:
-        subprocess.run(command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        return out_path
-    except subprocess.CalledProcessError:
-        return None
-
-
 def handle_video(
     file_path: str,
     target_lang: str = "en",
@@ -640,74 +620,50 @@ def handle_video(
     user_id: str = "guest",
 ):
     """
-    VIDEO → Extract audio using FFmpeg → Process exactly like handle_audio().
+    VIDEO → Decode the audio track straight to PCM → Process exactly like handle_audio().
     """
     # validate video
     validation = validate_file(file_path, ALLOWED_EXTS, MAX_UPLOAD_MB)
     if isinstance(validation, dict) and "error" in validation:
         return validation
 
-    temp_audio_path = extract_audio_ffmpeg(file_path)
-    if not temp_audio_path or not os.path.exists(temp_audio_path):
+    try:
+        clip = load_audio(file_path)
+    except Exception as e:
+        print("Video audio decode failed:", e)
+        clip = None
+    if clip is None or not len(clip.samples):
         return {"error": "audio_extraction_failed", "message": "FFmpeg could not extract audio."}
 
-    # optional: enhance voice of the extracted audio
-    temp_audio_path = enhance_voice(temp_audio_path)
-
-    # process audio as usual
-    audio_result = handle_audio(
-        file_path=temp_audio_path,
-        target_lang=target_lang,
-        output_pref=output_pref,
-        user_id=user_id,
-    )
+    # process audio as usual (decoded samples, uploaded as in-memory WAV)
+    audio_result = _process_audio(clip, None, target_lang, output_pref, user_id)
 
     # store original video path
     audio_result["input_video"] = file_path
 
-    # cleanup
-    try:
-        os.remove(temp_audio_path)
-    except Exception:
-        pass
-
     return audio_result
 
 # =====================================================
 # IMAGE HANDLER – Tamil + Hindi + English OCR Upgrade
 # =====================================================
-_OCR_CACHE = {}
-
-def get_ocr(lang):
-    if lang not in _OCR_CACHE:
-        _OCR_CACHE[lang] = PaddleOCR(lang=lang, use_gpu=False)
-    return _OCR_CACHE[lang]
-
-
 # ---------- Language Detection (Priority-based) ----------
-def detect_image_lang(file_path):
-
-    def score_tamil(txt):
-        tamil_chars = sum(1 for c in txt if "\u0B80" <= c <= "\u0BFF")
-        return tamil_chars / max(len(txt), 1)
-
-    def score_hindi(txt):
-        hindi_chars = sum(1 for c in txt if "\u0900" <= c <= "\u097F")
-        return hindi_chars / max(len(txt), 1)
+@timed("ocr_lang_detect", model="paddleocr")
+def detect_image_lang(image):
+    # `image`: file path or the pre-processed array shared with recognition
 
     # Read OCR via both first layer (fast check, not return)
     try:
-        raw_hi = extract_text_from_ocr(get_ocr("devanagari").ocr(file_path))
+        raw_hi = extract_text_from_ocr(get_ocr_pool().ocr("devanagari", image))
     except:
         raw_hi = ""
 
     try:
-        raw_ta = extract_text_from_ocr(get_ocr("ta").ocr(file_path))
+        raw_ta = extract_text_from_ocr(get_ocr_pool().ocr("ta", image))
     except:
         raw_ta = ""
 
-    s_hi = score_hindi(raw_hi)
-    s_ta = score_tamil(raw_ta)
+    s_hi = script_fraction(raw_hi, "devanagari")
+    s_ta = script_fraction(raw_ta, "tamil")
 
     # Priority rule
     if s_ta >= 0.10 and s_ta > s_hi:     # ≥10% Tamil chars
@@ -797,10 +753,19 @@ def polish(text, lang):
 # MAIN IMAGE HANDLER
 # =================================================
 def handle_image(file_path: str, target_lang="en", output_pref="both", user_id="guest"):
+    # decode + shrink/deskew/crop once; every OCR pass reuses the array
+    image, prep = file_path, None
+    if OCR_PREPROCESS:
+        try:
+            image, prep = prepare_image(file_path)
+        except Exception as e:
+            print("Image pre-processing failed, using original:", e)
+
     try:
-        detected = detect_image_lang(file_path)
-        ocr = get_ocr(detected)
-        extracted = extract_text_from_ocr(ocr.ocr(file_path))
+        detected = detect_image_lang(image)
+        set_source_lang(detected)
+        with stage("ocr", model=f"paddleocr-{detected}"):
+            extracted = extract_text_from_ocr(get_ocr_pool().ocr(detected, image))
     except Exception as e:
         return {"error": "ocr_failed", "message": str(e)}
 
@@ -819,6 +784,8 @@ def handle_image(file_path: str, target_lang="en", output_pref="both", user_id="
         "target_lang": target_lang,
         "analysis": domain_tone,
     }
+    if prep:
+        result["image_prep"] = prep
 
     # same language
     if detected == target_lang:
@@ -827,13 +794,18 @@ def handle_image(file_path: str, target_lang="en", output_pref="both", user_id="
 
     # different language
     else:
-        translated = translate_text(cleaned, target_lang)
+        translated, tm_stats = translate_with_memory(cleaned, target_lang, user_id)
+        if tm_stats:
+            result["translation_memory"] = tm_stats
         result["translated_text"] = translated
         if output_pref in ("audio", "both"):
             result["audio_target"] = save_tts(translated, target_lang, OUTPUT_AUDIO_DIR)
 
     # ---- COST CALC ----
-    translation_cost = estimate_llm_cost(cleaned, result.get("translated_text", cleaned)) if "translated_text" in result else 0
+    if "translation_memory" in result:
+        translation_cost = result["translation_memory"]["cost_usd"]
+    else:
+        translation_cost = estimate_llm_cost(cleaned, result.get("translated_text", cleaned)) if "translated_text" in result else 0
     tts_cost = 0
     if "audio_source" in result: tts_cost += estimate_tts_cost(cleaned, detected)
     if "audio_target" in result: tts_cost += estimate_tts_cost(result["translated_text"], target_lang)
@@ -844,10 +816,9 @@ def handle_image(file_path: str, target_lang="en", output_pref="both", user_id="
     # ---- SAVE ----
     json_path = _save_json(result, prefix="image")
     result["json_path"] = json_path
-    try:
-        ins = get_db().records.insert_one(result)
-        result["db_id"] = str(ins.inserted_id)
-    except: pass
+    db_id = _insert_record(result)
+    if db_id:
+        result["db_id"] = db_id
 
     _remove_mongo_id(result)
     return result
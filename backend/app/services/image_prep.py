@@ -0,0 +1,126 @@
+# app/services/image_prep.py
+
+from typing import Tuple, Union
+
+import cv2
+import numpy as np
+
+from ..config.settings import (
+    OCR_TARGET_TEXT_PX,
+    OCR_MAX_SIDE,
+    OCR_MAX_DESKEW_DEG,
+    OCR_MIN_GLYPHS,
+)
+from ..utils.metrics import timed
+
+
+# -----------------------------
+# Text mask + glyph boxes
+# -----------------------------
+def _text_mask(gray: np.ndarray) -> np.ndarray:
+    """Otsu binarization, text = 255 (light-on-dark images are inverted)."""
+    _t, bw = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    if cv2.countNonZero(bw) > bw.size // 2:
+        bw = cv2.bitwise_not(bw)
+    return bw
+
+
+def _glyph_boxes(mask: np.ndarray) -> np.ndarray:
+    """(x, y, w, h) of connected components that look like glyphs."""
+    _n, _labels, stats, _c = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    boxes = stats[1:]      # row 0 is the background
+    h = boxes[:, cv2.CC_STAT_HEIGHT]
+    keep = (boxes[:, cv2.CC_STAT_AREA] >= 12) & (h >= 4) & (h <= mask.shape[0] // 3)
+    return boxes[keep][:, :4]
+
+
+def _resize(img: np.ndarray, scale: float) -> np.ndarray:
+    size = (max(1, int(img.shape[1] * scale)), max(1, int(img.shape[0] * scale)))
+    return cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+
+
+def _rotate(img: np.ndarray, angle: float, border: int) -> np.ndarray:
+    h, w = img.shape[:2]
+    m = cv2.getRotationMatrix2D((w / 2.0, h / 2.0), angle, 1.0)
+    return cv2.warpAffine(img, m, (w, h), flags=cv2.INTER_LINEAR,
+                          borderMode=cv2.BORDER_CONSTANT, borderValue=border)
+
+
+# -----------------------------
+# Deskew (projection profile)
+# -----------------------------
+def estimate_skew(mask: np.ndarray, max_deg: float = OCR_MAX_DESKEW_DEG, step: float = 0.5) -> float:
+    """
+    Angle (degrees) that makes text lines horizontal: the rotation whose
+    row profile of text pixels is the most peaked. Searched on a ≤512 px
+    copy of the mask, so it costs a few milliseconds.
+    """
+    scale = min(1.0, 512.0 / max(mask.shape))
+    small = _resize(mask, scale) if scale < 1.0 else mask
+    best, best_score = 0.0, -1.0
+    for angle in np.arange(-max_deg, max_deg + step / 2, step):
+        rows = _rotate(small, float(angle), 0).sum(axis=1, dtype=np.float64)
+        score = float(np.var(rows))
+        if score > best_score:
+            best, best_score = float(angle), score
+    return best
+
+
+# -----------------------------
+# Public API
+# -----------------------------
+@timed("image_prep", model="opencv")
+def prepare_image(source: Union[str, np.ndarray]) -> Tuple[np.ndarray, dict]:
+    """
+    Decode once and shape the image for OCR:
+      grayscale → cap the long side → downsample so glyphs are about
+      OCR_TARGET_TEXT_PX tall (never upsampled) → deskew → crop to text.
+
+    Returns the grayscale array (shared by every OCR pass) and a summary
+    of what was done.
+    """
+    if isinstance(source, np.ndarray):
+        gray = source if source.ndim == 2 else cv2.cvtColor(source, cv2.COLOR_BGR2GRAY)
+    else:
+        # np.fromfile + imdecode: also works for non-ASCII paths
+        gray = cv2.imdecode(np.fromfile(source, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        raise ValueError("could not decode image")
+
+    info = {"original_size": [int(gray.shape[1]), int(gray.shape[0])]}
+
+    if max(gray.shape) > OCR_MAX_SIDE:
+        gray = _resize(gray, OCR_MAX_SIDE / float(max(gray.shape)))
+
+    mask = _text_mask(gray)
+    boxes = _glyph_boxes(mask)
+    text_h = float(np.median(boxes[:, 3])) if len(boxes) >= OCR_MIN_GLYPHS else None
+    info["text_height_px"] = round(text_h, 1) if text_h else None
+
+    if text_h and text_h > OCR_TARGET_TEXT_PX:
+        scale = OCR_TARGET_TEXT_PX / text_h
+        gray = _resize(gray, scale)
+        mask = _text_mask(gray)
+        boxes = _glyph_boxes(mask)
+
+    angle = estimate_skew(mask) if len(boxes) >= OCR_MIN_GLYPHS else 0.0
+    if abs(angle) >= 0.5:
+        gray = _rotate(gray, angle, 255)
+        mask = _text_mask(gray)
+        boxes = _glyph_boxes(mask)
+    info["deskew_deg"] = angle
+
+    if len(boxes) >= OCR_MIN_GLYPHS:
+        h, w = gray.shape
+        margin = int(max(8, np.median(boxes[:, 3])))
+        x0 = max(0, int(boxes[:, 0].min()) - margin)
+        y0 = max(0, int(boxes[:, 1].min()) - margin)
+        x1 = min(w, int((boxes[:, 0] + boxes[:, 2]).max()) + margin)
+        y1 = min(h, int((boxes[:, 1] + boxes[:, 3]).max()) + margin)
+        if (x1 - x0) * (y1 - y0) < 0.9 * w * h:
+            gray = gray[y0:y1, x0:x1]
+            info["crop"] = [x0, y0, x1, y1]
+
+    gray = np.ascontiguousarray(gray)
+    info["size"] = [int(gray.shape[1]), int(gray.shape[0])]
+    return gray, info
@@ -0,0 +1,273 @@
+# app/services/lang_detect.py
+
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ..config.settings import (
+    LANG_DETECT_SAMPLE_CHARS,
+    LANG_DETECT_SCRIPT_DOMINANCE,
+    LANG_DETECT_CACHE_SIZE,
+    CODE_MIX_MIN_LATIN_WORDS,
+)
+
+# -------------------- Statistical detector (fallback only) --------------------
+# Optional high-accuracy detector (Lingua). Falls back to langdetect safe detector if not installed.
+try:
+    from lingua import Language, LanguageDetectorBuilder
+
+    LANGUAGES = [Language.ENGLISH, Language.TAMIL, Language.HINDI]
+    # preloaded: no lazy model load on the first request
+    detector = (
+        LanguageDetectorBuilder.from_languages(*LANGUAGES)
+        .with_preloaded_language_models()
+        .build()
+    )
+
+    def _statistical_detect(text: str) -> str:
+        try:
+            lang = detector.detect_language_of(text)
+            if lang is None:
+                return "unknown"
+            if lang == Language.ENGLISH:
+                return "en"
+            if lang == Language.TAMIL:
+                return "ta"
+            if lang == Language.HINDI:
+                return "hi"
+            # fallback to short name
+            return lang.name.lower()[:2]
+        except Exception:
+            return "unknown"
+
+except Exception:
+    detector = None
+    # Fallback: simple safe langdetect usage (less accurate but works without extra deps)
+    try:
+        from langdetect import detect
+        from langdetect.lang_detect_exception import LangDetectException
+
+        def _statistical_detect(text: str) -> str:
+            try:
+                # for very short text default to English
+                if not text or len(text.split()) < 2:
+                    return "en"
+                return detect(text)
+            except LangDetectException:
+                return "unknown"
+            except Exception:
+                return "unknown"
+
+    except Exception:
+        def _statistical_detect(text: str) -> str:
+            return "unknown"
+
+
+# -------------------- Unicode script histogram --------------------
+# (lo, hi) inclusive code point ranges; only letters/marks are counted
+SCRIPT_RANGES = {
+    "tamil": [(0x0B80, 0x0BFF)],
+    "devanagari": [(0x0900, 0x097F)],
+    "latin": [(0x41, 0x5A), (0x61, 0x7A), (0xC0, 0x24F)],
+}
+
+# scripts that identify a language on their own (for our en/ta/hi set)
+SCRIPT_LANG = {"tamil": "ta", "devanagari": "hi"}
+
+
+def _codepoints(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+def script_histogram(text: str) -> Dict[str, int]:
+    """
+    Counts of Tamil / Devanagari / Latin / other letters in `text`,
+    computed with vectorized range masks over the code points.
+    ASCII digits, punctuation and whitespace are not counted.
+    """
+    if not text:
+        return {s: 0 for s in list(SCRIPT_RANGES) + ["other"]}
+
+    cps = _codepoints(text)
+    hist = {}
+    known = np.zeros(cps.shape, dtype=bool)
+    for script, ranges in SCRIPT_RANGES.items():
+        mask = np.zeros(cps.shape, dtype=bool)
+        for lo, hi in ranges:
+            mask |= (cps >= lo) & (cps <= hi)
+        hist[script] = int(mask.sum())
+        known |= mask
+    # non-ASCII code points outside the known scripts (other alphabets, CJK, emoji...)
+    hist["other"] = int(((cps > 0xBF) & ~known & ~((cps >= 0x2000) & (cps <= 0x2BFF))).sum())
+    return hist
+
+
+def script_fraction(text: str, script: str) -> float:
+    """Share of `script` characters over ALL characters of text (incl. spaces)."""
+    if not text:
+        return 0.0
+    return script_histogram(text).get(script, 0) / max(len(text), 1)
+
+
+def sample_text(text: str, max_chars: int = LANG_DETECT_SAMPLE_CHARS) -> str:
+    """
+    Bounded sample for detection: the whole text when short, otherwise
+    four evenly spaced windows (start, middle, end) joined together.
+    """
+    if len(text) <= max_chars:
+        return text
+    windows = 4
+    width = max_chars // windows
+    step = (len(text) - width) // (windows - 1)
+    return " ".join(text[i * step: i * step + width] for i in range(windows))
+
+
+def dominant_script(hist: Dict[str, int]):
+    total = sum(hist.values())
+    if not total:
+        return None, 0.0
+    script = max(hist, key=hist.get)
+    return script, hist[script] / total
+
+
+# -------------------- Cache --------------------
+_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_get(key: bytes):
+    with _cache_lock:
+        lang = _cache.get(key)
+        if lang is not None:
+            _cache.move_to_end(key)
+        return lang
+
+
+def _cache_put(key: bytes, lang: str) -> None:
+    with _cache_lock:
+        _cache[key] = lang
+        _cache.move_to_end(key)
+        while len(_cache) > LANG_DETECT_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+# -------------------- Public API --------------------
+def detect_language(text: str) -> str:
+    """
+    "en" | "ta" | "hi" | other ISO-639-1 | "unknown".
+
+    1. bounded sample of the text
+    2. script histogram → Tamil / Devanagari dominant: decided instantly
+    3. Latin or mixed → statistical detector (lingua / langdetect) on the sample
+    Results are cached by the sample's hash.
+    """
+    if not text or not text.strip():
+        return "unknown"
+
+    sample = sample_text(text)
+    key = hashlib.blake2b(sample.encode("utf-8"), digest_size=16).digest()
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    script, share = dominant_script(script_histogram(sample))
+    if script is None:
+        lang = "unknown"
+    elif script in SCRIPT_LANG and share >= LANG_DETECT_SCRIPT_DOMINANCE:
+        lang = SCRIPT_LANG[script]
+    else:
+        lang = _statistical_detect(sample)
+
+    _cache_put(key, lang)
+    return lang
+
+
+# -------------------- Code-mixed segmentation --------------------
+_TOKEN = re.compile(r"\S+|\s+")
+
+
+def _token_script(token: str):
+    """Dominant script of one whitespace-free token; None for digits/punctuation."""
+    script, _share = dominant_script(script_histogram(token))
+    return script
+
+
+def segment_languages(text: str, min_latin_words: int = CODE_MIX_MIN_LATIN_WORDS) -> List[Tuple[str, str]]:
+    """
+    Split code-mixed text (Tanglish / Hinglish in native script + English)
+    into ordered (lang, span) pieces; "".join(spans) == text.
+
+    Script run-length segmentation: consecutive words of one script form
+    a run, punctuation/digits/whitespace stay with the current run.
+    Short Latin runs (< min_latin_words words) inside or next to a
+    Tamil/Devanagari run are loanwords ("office", "meeting") and stay in
+    that run. Longer Latin runs are labeled by the statistical detector.
+    """
+    if not text:
+        return []
+
+    # 1. runs of (script, [tokens], word_count)
+    runs = []
+    for tok in _TOKEN.findall(text):
+        script = None if tok.isspace() else _token_script(tok)
+        if script is None or script == "other":
+            if runs:
+                runs[-1][1].append(tok)
+            else:
+                runs.append([None, [tok], 0])
+            continue
+        if runs and runs[-1][0] in (script, None):
+            runs[-1][0] = script
+            runs[-1][1].append(tok)
+            runs[-1][2] += 1
+        else:
+            runs.append([script, [tok], 1])
+
+    # 2. fold short Latin runs into a neighbouring native-script run
+    folded = []
+    for i, run in enumerate(runs):
+        script, toks, words = run
+        if script == "latin" and words < min_latin_words:
+            prev_native = folded and folded[-1][0] in SCRIPT_LANG
+            next_native = i + 1 < len(runs) and runs[i + 1][0] in SCRIPT_LANG
+            if prev_native:
+                folded[-1][1].extend(toks)
+                folded[-1][2] += words
+                continue
+            if next_native:
+                runs[i + 1][1][:0] = toks
+                runs[i + 1][2] += words
+                continue
+        if folded and folded[-1][0] == script:
+            folded[-1][1].extend(toks)
+            folded[-1][2] += words
+        else:
+            folded.append(run)
+
+    # 3. label runs, merge neighbours with the same label
+    segments: List[Tuple[str, str]] = []
+    for script, toks, _words in folded:
+        span = "".join(toks)
+        if script in SCRIPT_LANG:
+            lang = SCRIPT_LANG[script]
+        elif script == "latin":
+            lang = _statistical_detect(span)
+            if lang == "unknown":
+                lang = "en"
+        else:
+            lang = "unknown"
+        if segments and (segments[-1][0] == lang or lang == "unknown"):
+            segments[-1] = (segments[-1][0], segments[-1][1] + span)
+        else:
+            segments.append((lang, span))
+    return segments
+
+
+def is_code_mixed(segments: List[Tuple[str, str]], target_lang: str) -> bool:
+    """True when some spans are already in target_lang and others are not."""
+    langs = {lang for lang, _ in segments if lang != "unknown"}
+    return target_lang in langs and len(langs) > 1
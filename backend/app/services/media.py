@@ -0,0 +1,241 @@
+# app/services/media.py
+
+import io
+import os
+import wave
+import subprocess
+from typing import Optional
+
+import numpy as np
+
+from ..config.settings import (
+    MEDIA_SAMPLE_RATE,
+    STT_UPLOAD_CODEC,
+    STT_UPLOAD_BITRATE_K,
+    STT_UPLOAD_MIN_BITRATE_K,
+    STT_UPLOAD_MAX_MB,
+    STT_TRIM_THRESHOLD_DB,
+    STT_TRIM_PAD_MS,
+    STT_UPLINK_MBPS,
+)
+from ..utils.metrics import timed, record_stt_upload
+
+# PyAV optional: decodes in-process (no process spawn at all)
+try:
+    import av
+except Exception:
+    av = None
+
+
+# -----------------------------
+# Decoded audio
+# -----------------------------
+class AudioClip:
+    """
+    Mono float32 PCM in memory, plus where it came from.
+    Duration is derived from the decoded samples, not from a probe.
+    """
+
+    __slots__ = ("samples", "sample_rate", "source_path")
+
+    def __init__(self, samples: np.ndarray, sample_rate: int, source_path: Optional[str] = None):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.source_path = source_path
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / float(self.sample_rate) if self.sample_rate else 0.0
+
+    def with_samples(self, samples: np.ndarray) -> "AudioClip":
+        return AudioClip(samples, self.sample_rate, self.source_path)
+
+
+# -----------------------------
+# Decoders
+# -----------------------------
+def _pcm16_to_float(raw: bytes, channels: int) -> np.ndarray:
+    pcm = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    if channels > 1:
+        pcm = pcm.reshape(-1, channels).mean(axis=1)
+    return pcm
+
+
+def _decode_wav(path: str, sr: int) -> Optional[np.ndarray]:
+    """16-bit PCM WAV already at `sr`: read in-process with the wave module."""
+    try:
+        with wave.open(path, "rb") as w:
+            if w.getsampwidth() != 2 or w.getframerate() != sr or w.getcomptype() != "NONE":
+                return None
+            return _pcm16_to_float(w.readframes(w.getnframes()), w.getnchannels())
+    except (wave.Error, EOFError):
+        return None
+
+
+def _decode_pyav(path: str, sr: int) -> np.ndarray:
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=sr)
+    chunks = []
+    with av.open(path) as container:
+        stream = next(s for s in container.streams if s.type == "audio")
+        for frame in container.decode(stream):
+            for out in resampler.resample(frame):
+                chunks.append(out.to_ndarray().reshape(-1))
+        for out in resampler.resample(None):
+            chunks.append(out.to_ndarray().reshape(-1))
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(chunks).astype(np.float32) / 32768.0
+
+
+def _decode_ffmpeg_pipe(path: str, sr: int) -> np.ndarray:
+    """
+    One ffmpeg process, PCM streamed over stdout into memory
+    (video containers included) — no intermediate WAV on disk.
+    """
+    res = subprocess.run(
+        ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", path,
+         "-vn", "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(sr), "pipe:1"],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+    )
+    return _pcm16_to_float(res.stdout, 1)
+
+
+@timed("decode_audio", model="media")
+def load_audio(path: str, sr: int = MEDIA_SAMPLE_RATE) -> AudioClip:
+    """
+    Decode any audio/video file to mono float32 PCM at `sr`.
+    Order: WAV fast path → PyAV (in-process) → single ffmpeg pipe.
+    """
+    samples = _decode_wav(path, sr)
+    if samples is None and av is not None:
+        try:
+            samples = _decode_pyav(path, sr)
+        except Exception:
+            samples = None
+    if samples is None:
+        samples = _decode_ffmpeg_pipe(path, sr)
+
+    return AudioClip(samples, sr, path)
+
+
+def wav_bytes(clip: AudioClip) -> bytes:
+    """16-bit mono WAV of the clip, built in memory."""
+    pcm = (np.clip(clip.samples, -1.0, 1.0) * 32767.0).astype("<i2")
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(clip.sample_rate)
+        w.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+# -----------------------------
+# Speech-to-text upload
+# -----------------------------
+_CODECS = {
+    # codec: (filename, ffmpeg output args)
+    "opus": ("audio.ogg", ["-c:a", "libopus", "-application", "voip", "-f", "ogg"]),
+    "mp3": ("audio.mp3", ["-c:a", "libmp3lame", "-f", "mp3"]),
+}
+
+
+def trim_silence(clip: AudioClip, threshold_db: float = STT_TRIM_THRESHOLD_DB,
+                 pad_ms: int = STT_TRIM_PAD_MS, frame_ms: float = 20.0) -> AudioClip:
+    """
+    Cut leading/trailing frames quieter than `threshold_db` below the
+    loudest frame, keeping `pad_ms` of margin. An all-quiet clip is
+    returned unchanged.
+    """
+    samples = clip.samples
+    frame = max(1, int(clip.sample_rate * frame_ms / 1000))
+    n = len(samples) // frame
+    if n < 2:
+        return clip
+    energy = np.square(samples[: n * frame].reshape(n, frame), dtype=np.float64).mean(axis=1)
+    peak = energy.max()
+    if peak <= 1e-12:
+        return clip
+    loud = np.flatnonzero(energy >= peak * 10 ** (threshold_db / 10.0))
+    pad = int(clip.sample_rate * pad_ms / 1000)
+    start = max(0, loud[0] * frame - pad)
+    end = min(len(samples), (loud[-1] + 1) * frame + pad)
+    if start == 0 and end == len(samples):
+        return clip
+    return clip.with_samples(samples[start:end])
+
+
+def upload_bitrate_k(duration_s: float, base_k: int = STT_UPLOAD_BITRATE_K) -> int:
+    """
+    Speech bitrate for a recording of `duration_s`: the base rate while it
+    fits the upload cap, lower for long recordings (never below the floor).
+    """
+    if duration_s <= 0:
+        return base_k
+    budget_bits = STT_UPLOAD_MAX_MB * 1024 * 1024 * 8 * 0.95   # container overhead
+    fit_k = int(budget_bits / duration_s / 1000)
+    return max(STT_UPLOAD_MIN_BITRATE_K, min(base_k, fit_k))
+
+
+def _encode_ffmpeg_pipe(clip: AudioClip, codec: str, bitrate_k: int) -> bytes:
+    """PCM in on stdin, compressed speech out on stdout — one process, no files."""
+    _name, out_args = _CODECS[codec]
+    pcm = (np.clip(clip.samples, -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+    res = subprocess.run(
+        ["ffmpeg", "-nostdin", "-loglevel", "error",
+         "-f", "s16le", "-ar", str(clip.sample_rate), "-ac", "1", "-i", "pipe:0",
+         "-b:a", f"{bitrate_k}k", *out_args, "pipe:1"],
+        input=pcm, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+    )
+    return res.stdout
+
+
+@timed("stt_encode", model=STT_UPLOAD_CODEC)
+def prepare_stt_upload(clip: AudioClip, original_path: Optional[str] = None):
+    """
+    (filename, bytes) payload for transcribe_with_openai plus a stats dict.
+
+    Edge silence is trimmed, then the clip is encoded with a low-bitrate
+    speech codec sized by duration. `original_path` (untouched source
+    file) is sent instead when it is already smaller. Falls back to an
+    in-memory WAV when encoding is disabled or ffmpeg fails.
+    """
+    trimmed = trim_silence(clip)
+    raw_bytes = 44 + 2 * len(clip.samples)          # what a 16-bit WAV of the input weighs
+    codec = STT_UPLOAD_CODEC
+    bitrate_k = None
+
+    payload = None
+    if codec in _CODECS:
+        bitrate_k = upload_bitrate_k(trimmed.duration)
+        try:
+            payload = (_CODECS[codec][0], _encode_ffmpeg_pipe(trimmed, codec, bitrate_k))
+        except Exception as e:
+            print("STT upload encode failed, sending WAV:", e)
+    if payload is None:
+        codec, bitrate_k = "wav", None
+        payload = ("audio.wav", wav_bytes(trimmed))
+
+    if original_path and trimmed is clip:
+        try:
+            if os.path.getsize(original_path) <= len(payload[1]):
+                with open(original_path, "rb") as f:
+                    payload = (os.path.basename(original_path), f.read())
+                codec, bitrate_k = "original", None
+        except OSError:
+            pass
+
+    uploaded = len(payload[1])
+    saved = raw_bytes - uploaded
+    record_stt_upload(codec, uploaded, saved)
+    info = {
+        "codec": codec,
+        "bitrate_kbps": bitrate_k,
+        "bytes": uploaded,
+        "wav_bytes": raw_bytes,
+        "duration_sec": round(trimmed.duration, 3),
+        "trimmed_sec": round(clip.duration - trimmed.duration, 3),
+        # upload time only; the API also processes fewer seconds when trimmed
+        "est_upload_ms_saved": round(max(0, saved) * 8 / (STT_UPLINK_MBPS * 1e6) * 1000, 1),
+    }
+    return payload, info
@@ -0,0 +1,146 @@
+# app/services/model_router.py
+"""
+Difficulty-based routing for translate / summarize calls.
+
+classify() only looks at cheap features (length, script mix, domain terms
+and triggered style rules) and picks a tier:
+
+    cache     same input seen recently          → stored output, no call
+    trivial   a few words, nothing special      → minimal prompt, ROUTER_FAST_MODEL
+                                                  (summaries: short text returned as is)
+    standard                                    → rule-filtered prompt, LLM_MODEL
+    hard      long, domain-heavy or mixed script → full prompt, ROUTER_HARD_MODEL
+
+Every decision is logged with its features, latency and cost so the
+thresholds can be tuned from the logs / the llm_route_* metrics.
+"""
+
+import re
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from ..config.settings import (
+    LLM_MODEL,
+    ROUTER_ENABLED,
+    ROUTER_FAST_MODEL,
+    ROUTER_HARD_MODEL,
+    ROUTER_TRIVIAL_WORDS,
+    ROUTER_HARD_WORDS,
+    ROUTER_HARD_DOMAIN_HITS,
+    ROUTER_SUMMARY_MIN_WORDS,
+    ROUTER_CACHE_SIZE,
+)
+from ..utils.metrics import record_route
+from .lang_detect import script_histogram
+from .prompt_rules import select_rules
+
+logger = logging.getLogger(__name__)
+
+# legal / medical / financial vocabulary (en, ta, hi)
+_DOMAIN_TERMS = re.compile(
+    r"\b(hereby|whereas|hereinafter|herein|thereof|plaintiff|defendant|petitioner|respondent|"
+    r"indemnif\w*|liabilit\w*|arbitration|jurisdiction|clause|agreement|contract|tenant|landlord|"
+    r"lessee|lessor|affidavit|notary|statut\w*|diagnos\w*|prescri\w*|dosage|symptom\w*|surgery|"
+    r"patient|invoice|interest rate|loan|mortgage|premium|insur\w*)\b"
+    r"|ஒப்பந்த|நீதிமன்ற|வழக்கு|சட்ட|நோயாளி|மருந்து|கடன்|வட்டி"
+    r"|अनुबंध|न्यायालय|अदालत|शपथ|कानून|मरीज|दवा|ऋण|ब्याज",
+    re.IGNORECASE,
+)
+
+
+# -----------------------------
+# Classification
+# -----------------------------
+def classify(text: str, kind: str = "translate", target_lang: str = "en") -> dict:
+    """
+    Tier + the features it was decided on. kind: "translate" | "summarize".
+    """
+    words = len(text.split())
+    # letter scripts only: "other" also holds emoji and symbols, and
+    # "hello 😀" is not mixed-script text
+    hist = {s: n for s, n in script_histogram(text).items() if s != "other"}
+    letters = sum(hist.values()) or 1
+    scripts = sorted(s for s, n in hist.items() if n / letters >= 0.1)
+    domain_hits = len(_DOMAIN_TERMS.findall(text))
+    rule_hits = sum(1 for r in select_rules(text, target_lang) if r.get("triggers")) if kind == "translate" else 0
+
+    decision = {
+        "kind": kind,
+        "words": words,
+        "scripts": scripts,
+        "domain_hits": domain_hits,
+        "rule_hits": rule_hits,
+    }
+
+    if not ROUTER_ENABLED:
+        tier, reason = "standard", "router disabled"
+    elif words >= ROUTER_HARD_WORDS and kind == "translate":
+        tier, reason = "hard", f"{words} words"
+    elif domain_hits >= ROUTER_HARD_DOMAIN_HITS:
+        tier, reason = "hard", f"{domain_hits} domain terms"
+    elif len(scripts) > 1 and kind == "translate":
+        tier, reason = "hard", "mixed script"
+    elif kind == "summarize" and words < ROUTER_SUMMARY_MIN_WORDS:
+        tier, reason = "trivial", f"{words} words, nothing to summarize"
+    elif kind == "translate" and words <= ROUTER_TRIVIAL_WORDS and not domain_hits and not rule_hits:
+        tier, reason = "trivial", f"{words} words"
+    else:
+        tier, reason = "standard", "default"
+
+    decision["tier"] = tier
+    decision["reason"] = reason
+    decision["model"] = {"trivial": ROUTER_FAST_MODEL, "hard": ROUTER_HARD_MODEL}.get(tier, LLM_MODEL)
+    return decision
+
+
+# -----------------------------
+# Output cache (exact input)
+# -----------------------------
+_cache: "OrderedDict[str, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def cache_key(kind: str, text: str, *params) -> str:
+    raw = "\n".join([kind, *map(str, params), text])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def cache_get(key: str) -> Optional[str]:
+    if not ROUTER_ENABLED:
+        return None
+    with _cache_lock:
+        out = _cache.get(key)
+        if out is not None:
+            _cache.move_to_end(key)
+        return out
+
+
+def cache_put(key: str, value: str) -> None:
+    if not ROUTER_ENABLED or ROUTER_CACHE_SIZE <= 0:
+        return
+    with _cache_lock:
+        _cache[key] = value
+        _cache.move_to_end(key)
+        while len(_cache) > ROUTER_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+# -----------------------------
+# Logging
+# -----------------------------
+def log_route(decision: dict, seconds: float, cost_usd: float) -> None:
+    logger.info(
+        "llm_route kind=%s tier=%s model=%s reason=%r words=%d scripts=%s domain=%d rules=%d ms=%.1f cost=%.6f",
+        decision["kind"], decision["tier"], decision["model"], decision["reason"], decision["words"],
+        ",".join(decision["scripts"]) or "-", decision["domain_hits"], decision["rule_hits"],
+        seconds * 1000, cost_usd,
+    )
+    record_route(decision["kind"], decision["tier"], decision["model"], seconds, cost_usd)
+
+
+def cached_decision(kind: str) -> dict:
+    return {"kind": kind, "tier": "cache", "model": "-", "reason": "exact input cached",
+            "words": 0, "scripts": [], "domain_hits": 0, "rule_hits": 0}
@@ -0,0 +1,121 @@
+# app/services/ocr_pool.py
+
+import queue
+import threading
+from contextlib import contextmanager, ExitStack
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from ..config.settings import (
+    OCR_PRELOAD_LANGS,
+    OCR_ENGINES_PER_LANG,
+    OCR_CPU_THREADS,
+    OCR_ENABLE_MKLDNN,
+)
+from ..utils.metrics import stage
+
+from paddleocr import PaddleOCR
+
+
+class OCREnginePool:
+    """
+    PaddleOCR engines of this process, per language.
+
+    A PaddleOCR predictor is not re-entrant, so each engine is checked out
+    by one caller at a time; up to OCR_ENGINES_PER_LANG engines exist per
+    language (default 1 → one engine per worker process per language).
+    Engines are built under a per-language lock, so concurrent first
+    requests never construct duplicates.
+    """
+
+    def __init__(self, per_lang: int = OCR_ENGINES_PER_LANG):
+        self.per_lang = max(1, per_lang)
+        self._idle: Dict[str, "queue.Queue"] = {}
+        self._built: Dict[str, int] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lang_lock(self, lang: str) -> threading.Lock:
+        with self._locks_guard:
+            if lang not in self._locks:
+                self._locks[lang] = threading.Lock()
+                self._idle[lang] = queue.Queue()
+                self._built[lang] = 0
+            return self._locks[lang]
+
+    def _build(self, lang: str):
+        with stage("ocr_engine_load", model=f"paddleocr-{lang}"):
+            return PaddleOCR(
+                lang=lang,
+                use_gpu=False,
+                cpu_threads=OCR_CPU_THREADS,
+                enable_mkldnn=OCR_ENABLE_MKLDNN,
+                show_log=False,
+            )
+
+    @contextmanager
+    def engine(self, lang: str):
+        """Exclusive use of one engine for `lang`."""
+        lock = self._lang_lock(lang)
+        idle = self._idle[lang]
+        try:
+            eng = idle.get_nowait()
+        except queue.Empty:
+            eng = None
+            with lock:
+                if self._built[lang] < self.per_lang:
+                    eng = self._build(lang)
+                    self._built[lang] += 1
+            if eng is None:
+                eng = idle.get()       # all engines busy: wait for one
+        try:
+            yield eng
+        finally:
+            idle.put(eng)
+
+    def ocr(self, lang: str, image):
+        """One image (path or ndarray) → raw PaddleOCR result."""
+        with self.engine(lang) as eng:
+            return eng.ocr(image)
+
+    def ocr_batch(self, lang: str, images: Iterable) -> List:
+        """
+        Many images / crops with a single checkout: one lock round-trip
+        for the whole batch instead of one per image.
+        """
+        with self.engine(lang) as eng:
+            return [eng.ocr(img) for img in images]
+
+    def warmup(self, langs: Iterable[str], infer: bool = True) -> None:
+        """
+        Build the engines and run one tiny inference each (first call is slow).
+        infer=False only builds them: used in the prefork master, where no
+        inference threads may exist before fork (see app.prefork).
+        """
+        blank = np.full((32, 96, 3), 255, dtype=np.uint8)
+        for lang in langs:
+            with ExitStack() as stack:
+                engines = [stack.enter_context(self.engine(lang)) for _ in range(self.per_lang)]
+                if infer:
+                    for eng in engines:
+                        eng.ocr(blank)
+
+    def clear(self) -> None:
+        with self._locks_guard:
+            self._idle.clear()
+            self._built.clear()
+            self._locks.clear()
+
+
+_pool = OCREnginePool()
+
+
+def get_ocr_pool() -> OCREnginePool:
+    return _pool
+
+
+def warmup_ocr(infer: bool = True) -> None:
+    """Preload OCR_PRELOAD_LANGS engines (call at startup)."""
+    if OCR_PRELOAD_LANGS:
+        _pool.warmup(OCR_PRELOAD_LANGS, infer=infer)
@@ -0,0 +1,137 @@
+# app/services/pdf_extract.py
+
+import re
+from typing import Iterator, Optional, Tuple
+
+import fitz  # PyMuPDF
+import pdfplumber
+import pytesseract
+pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+from PIL import Image
+
+from ..config.settings import PDF_OCR_MIN_PAGE_CHARS, PDF_OCR_DPI, PDF_OSD_MIN_CONF
+from ..utils.metrics import stage
+from .lang_detect import script_histogram
+
+ALL_PACKS = "eng+tam+hin"
+
+# script → tesseract traineddata
+SCRIPT_PACKS = {"tamil": "tam", "devanagari": "hin", "latin": "eng"}
+OSD_SCRIPTS = {"Latin": "latin", "Tamil": "tamil", "Devanagari": "devanagari"}
+
+
+# -----------------------------
+# Text layer
+# -----------------------------
+def iter_pdf_pages(file_path: str, layout: bool = False) -> Iterator[Tuple[int, str]]:
+    """
+    Yields (page_number, text) one page at a time; only the current page
+    is held in memory.
+
+    Default: PyMuPDF text layer (blocks sorted top-left → bottom-right).
+    layout=True: pdfplumber with layout preservation (column/space
+    alignment kept) — much slower, only when the layout matters.
+    """
+    if layout:
+        with pdfplumber.open(file_path) as pdf:
+            for i, page in enumerate(pdf.pages):
+                yield i + 1, page.extract_text(layout=True) or ""
+                page.flush_cache()      # drop parsed objects of this page
+        return
+
+    with fitz.open(file_path) as doc:
+        for i in range(doc.page_count):
+            page = doc.load_page(i)
+            yield i + 1, page.get_text("text", sort=True) or ""
+
+
+# -----------------------------
+# Scanned pages (OCR)
+# -----------------------------
+def render_page(doc, page_index: int, dpi: int = PDF_OCR_DPI) -> Image.Image:
+    pix = doc.load_page(page_index).get_pixmap(dpi=dpi)
+    return Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+
+
+def iter_ocr_pages(file_path: str, lang: str = "eng+tam+hin") -> Iterator[Tuple[int, str]]:
+    """Tesseract over rendered pages, one page at a time."""
+    with fitz.open(file_path) as doc:
+        for i in range(doc.page_count):
+            img = render_page(doc, i)
+            with stage("ocr", model="tesseract"):
+                text = pytesseract.image_to_string(img, lang=lang)
+            yield i + 1, text
+
+
+# -----------------------------
+# Per-page language selection
+# -----------------------------
+def packs_for_scripts(scripts) -> str:
+    """Indic packs first, English always last (Indian documents mix it in)."""
+    packs = [SCRIPT_PACKS[s] for s in ("tamil", "devanagari") if s in scripts]
+    return "+".join(packs + ["eng"])
+
+
+def langs_from_text(text: str, min_share: float = 0.05) -> Optional[str]:
+    """Packs for the scripts that make up ≥ min_share of a page's letters."""
+    hist = script_histogram(text)
+    letters = sum(hist.values())
+    if not letters:
+        return None
+    return packs_for_scripts({s for s in SCRIPT_PACKS if hist[s] / letters >= min_share})
+
+
+_OSD_SCRIPT = re.compile(r"Script:\s*(\w+)")
+_OSD_CONF = re.compile(r"Script confidence:\s*([\d.]+)")
+
+
+def langs_from_osd(img: Image.Image) -> Optional[str]:
+    """
+    Tesseract OSD on the rendered page: detects the dominant script
+    without running recognition. None when OSD is unavailable/unsure.
+    """
+    try:
+        with stage("ocr_osd", model="tesseract"):
+            osd = pytesseract.image_to_osd(img)
+    except Exception:
+        return None
+    script = _OSD_SCRIPT.search(osd)
+    conf = _OSD_CONF.search(osd)
+    if not script or script.group(1) not in OSD_SCRIPTS:
+        return None
+    if conf and float(conf.group(1)) < PDF_OSD_MIN_CONF:
+        return None
+    return packs_for_scripts({OSD_SCRIPTS[script.group(1)]})
+
+
+def page_needs_ocr(text: str) -> bool:
+    """
+    Scanned (little or no text layer) or Indic text layer — Tamil/Hindi
+    text layers often come out with broken glyph order, OCR reads them better.
+    """
+    hist = script_histogram(text)
+    return hist["tamil"] > 0 or hist["devanagari"] > 0 or len(text.strip()) < PDF_OCR_MIN_PAGE_CHARS
+
+
+def iter_document_pages(file_path: str, layout: bool = False) -> Iterator[Tuple[int, str, str]]:
+    """
+    Yields (page_number, text, source) per page; source is "text" for the
+    text layer or "ocr:<packs>" for tesseract with the packs it used.
+
+    OCR language per page: from the text layer's script histogram when
+    it has at least PDF_OCR_MIN_PAGE_CHARS (a scan's stray footer or Latin
+    watermark says nothing about the body), else from a low-DPI OSD pass
+    on the render, else all packs.
+    """
+    with fitz.open(file_path) as doc:
+        for page_no, text in iter_pdf_pages(file_path, layout=layout):
+            if not page_needs_ocr(text):
+                yield page_no, text, "text"
+                continue
+
+            img = render_page(doc, page_no - 1)
+            hint = langs_from_text(text) if len(text.strip()) >= PDF_OCR_MIN_PAGE_CHARS else None
+            langs = hint or langs_from_osd(img) or ALL_PACKS
+            with stage("ocr", model=f"tesseract-{langs}"):
+                ocr_text = pytesseract.image_to_string(img, lang=langs)
+            yield page_no, ocr_text, f"ocr:{langs}"
@@ -0,0 +1,196 @@
+# app/services/prompt_rules.py
+"""
+Translation prompt assembly from a rule registry.
+
+Every rule names a target language ("*" = any) and optionally a tone and
+trigger patterns. Rules without triggers always apply (for their tone);
+triggered rules only when one of their patterns occurs in the input, so a
+three-word chat message does not carry the whole style guide. Triggers of
+one target language are compiled into a single regex with one named group
+per rule.
+"""
+
+import re
+import threading
+from typing import List, Optional
+
+from ..config.settings import PROMPT_RULES_FILTER
+
+# -----------------------------
+# Registry
+# -----------------------------
+RULES = [
+    # --- any target language ---
+    {"id": "core_meaning", "lang": "*",
+     "text": "Translate meaning, not words: no word-by-word literal translation. Rewrite freely for natural "
+             "readability while preserving meaning, nuance and tone."},
+    {"id": "core_translit", "lang": "*",
+     "text": "Do not transliterate English words into the target script unless they are proper nouns."},
+    {"id": "core_mixing", "lang": "*",
+     "text": "Match the cultural norms and grammar of the target language. Do not mix languages unless the original is mixed."},
+    {"id": "tone_formal", "lang": "*", "tone": "formal",
+     "text": "Tone formal: polished, respectful, grammatically correct text; no slang, dialect or colloquial forms."},
+    {"id": "tone_neutral", "lang": "*", "tone": "neutral",
+     "text": "Tone neutral: clear, natural, balanced text for general purposes; no slang, regional dialect or crude colloquial forms."},
+    {"id": "tone_casual", "lang": "*", "tone": "casual",
+     "text": "Tone casual: friendly, conversational text without vulgar slang; no academic or unnatural phrasing."},
+
+    # --- Tamil ---
+    {"id": "ta_style", "lang": "ta",
+     "text": "Write elegant, natural Tamil that reads as if originally written in Tamil. Restructure sentences for "
+             "natural Tamil rhythm; never copy the source sentence structure or translate English adjectives literally."},
+    {"id": "ta_formal", "lang": "ta", "tone": "formal",
+     "text": "Formal Tamil: polished, use 'அவர்', avoid colloquial verbs such as 'போயிடுச்சு', 'கிட்ட இருந்து'."},
+    {"id": "ta_neutral", "lang": "ta", "tone": "neutral",
+     "text": "Use standard written Tamil, not colloquial forms such as 'போயிடுச்சு', 'கிட்ட இருந்து'."},
+    {"id": "ta_casual", "lang": "ta", "tone": "casual",
+     "text": "Casual Tamil: friendly, 'அவன்/அவள்' allowed, but no slang."},
+    {"id": "ta_sociable", "lang": "ta", "triggers": [r"\bsociab", r"\boutgoing\b", r"\bfriendly\b", r"சமூகமா"],
+     "text": "NEVER translate 'sociable', 'sociability' or 'outgoing' as 'சமூகமாக', 'சமூகமானவர்', 'சமூகமாக உள்ளவர்' "
+             "or 'சமூகவியல் உள்ளவன்'. Use 'பழகும் தன்மையுடையவர்', 'பழகும் குணம் கொண்டவர்' or 'அன்பாக பழகும் ஒருவர்' "
+             "('he is sociable' → 'அவர் பழகும் தன்மையுடையவர்'). This rule overrides all others."},
+    {"id": "ta_away", "lang": "ta", "triggers": [r"\baway\b", r"\blong time\b", r"दूर"],
+     "text": "Prefer refined forms like 'நீண்ட காலமாக விலகி உள்ளார்'."},
+    {"id": "ta_travel", "lang": "ta", "triggers": [r"\btravel", r"\bworld\b", r"यात्रा"],
+     "text": "Prefer refined forms like 'உலகம் முழுவதும் பயணம் செய்துள்ளார்'."},
+    {"id": "ta_know", "lang": "ta", "triggers": [r"\bknow", r"\bmany people\b", r"जानत"],
+     "text": "Prefer refined forms like 'அவர் பலரை அறியவில்லை'."},
+
+    # --- Hindi ---
+    {"id": "hi_style", "lang": "hi",
+     "text": "Write natural, culturally authentic Hindi with correct gender and number agreement. Do not force English "
+             "sentence order; avoid Sanskrit-heavy constructions in normal contexts and Hinglish unless the original is mixed."},
+    {"id": "hi_formal", "lang": "hi", "tone": "formal",
+     "text": "Formal Hindi: polished, clean vocabulary (e.g. 'उन्होंने', 'कृपया', 'ध्यान दें')."},
+    {"id": "hi_neutral", "lang": "hi", "tone": "neutral",
+     "text": "Use standard modern Hindi suitable for narration, news or general writing."},
+    {"id": "hi_casual", "lang": "hi", "tone": "casual",
+     "text": "Casual Hindi: friendly modern spoken Hindi without slang or fillers ('yaar', 'matlab', 'na', 'है न', "
+             "'तो क्या', 'ऐसा बोल सकते हैं')."},
+    {"id": "hi_gender", "lang": "hi",
+     "triggers": [r"\b(he|she|him|her|his|hers|they|them|their)\b", r"\bsaid\b", r"\bsaw\b", r"அவ(ர்|ன்|ள்)"],
+     "text": "Keep masculine/feminine verb forms consistent (e.g. 'उन्होंने कहा', 'उसने देखा', 'वह नहीं जानता/जानती'); "
+             "no किया/किया गया mismatches."},
+    {"id": "hi_connectors", "lang": "hi",
+     "triggers": [r"\b(but|however|although|though|therefore|despite|so)\b", r"ஆனால்", r"இருப்பினும்"],
+     "text": "Use natural connectors such as 'लेकिन', 'हालाँकि', 'इसलिए', 'इसके बावजूद'."},
+    {"id": "hi_away", "lang": "hi", "triggers": [r"\baway\b", r"\blong time\b", r"விலகி"],
+     "text": "'away from New York for a long time' → 'लंबे समय से न्यूयॉर्क से दूर है' (not 'दूर रहा है'), "
+             "e.g. 'वह लंबे समय से न्यूयॉर्क से दूर हैं'."},
+    {"id": "hi_travel", "lang": "hi", "triggers": [r"\btravel", r"\bworld\b", r"பயண"],
+     "text": "Prefer phrasing like 'उन्होंने दुनिया भर की यात्रा की है'."},
+    {"id": "hi_know", "lang": "hi", "triggers": [r"\bknow", r"\bmany people\b", r"அறிய"],
+     "text": "Prefer phrasing like 'वह यहाँ बहुत लोगों को नहीं जानते'."},
+    {"id": "hi_sociable", "lang": "hi", "triggers": [r"\bsociab", r"\boutgoing\b", r"\bfriendly\b", r"பழகும்"],
+     "text": "Use 'मिलनसार' or 'मिलनसार स्वभाव का' for 'sociable' (e.g. 'वह मिलनसार स्वभाव के हैं')."},
+    {"id": "hi_exclaim", "lang": "hi", "triggers": [r"\b(oh|ah|wow|alas)\b"],
+     "text": "Do not translate exclamations like 'Oh' unless the context requires the emotion."},
+
+    # --- English ---
+    {"id": "en_style", "lang": "en",
+     "text": "Write natural, fluent, modern English as if originally written in English. Never mimic Tamil/Hindi word "
+             "or verb order; avoid old-fashioned, stiff or academic phrasing; keep natural rhythm and punctuation."},
+    {"id": "en_formal", "lang": "en", "tone": "formal",
+     "text": "Formal English: polished, respectful, no contractions."},
+    {"id": "en_neutral", "lang": "en", "tone": "neutral",
+     "text": "Clear, modern English for narration, articles or general content; no over-formality."},
+    {"id": "en_casual", "lang": "en", "tone": "casual",
+     "text": "Casual English: conversational, with contractions (he's, she's, they're)."},
+    {"id": "en_passive", "lang": "en", "triggers": [r"किया गया", r"की गई", r"जाता है", r"जाती है", r"பட்டது", r"படுகிறது", r"படும்"],
+     "text": "Avoid unnatural passive constructions; prefer the active voice."},
+    {"id": "en_away", "lang": "en", "triggers": [r"न्यूयॉर्क", r"நியூயார்க்", r"दूर", r"விலகி"],
+     "text": "Prefer phrasing like 'He has been away from New York for a long time'."},
+    {"id": "en_travel", "lang": "en", "triggers": [r"यात्रा", r"பயண"],
+     "text": "Prefer phrasing like 'He has traveled all over the world'."},
+    {"id": "en_know", "lang": "en", "triggers": [r"जानत", r"அறிய"],
+     "text": "Prefer phrasing like 'He doesn't know many people here'."},
+    {"id": "en_sociable", "lang": "en", "triggers": [r"मिलनसार", r"பழகும்"],
+     "text": "Prefer idiomatic phrasing like 'He's quite friendly and wants to meet everyone'."},
+]
+
+
+# -----------------------------
+# Matcher
+# -----------------------------
+_matchers = {}
+_matchers_lock = threading.Lock()
+
+
+def _matcher(target_lang: str):
+    """(untriggered rules, compiled trigger regex or None, group name → rule) for one target language."""
+    m = _matchers.get(target_lang)
+    if m is None:
+        with _matchers_lock:
+            m = _matchers.get(target_lang)
+            if m is None:
+                rules = [r for r in RULES if r["lang"] in ("*", target_lang)]
+                always = [r for r in rules if not r.get("triggers")]
+                groups = {f"r{i}": r for i, r in enumerate(rules) if r.get("triggers")}
+                pattern = "|".join(f"(?P<{g}>{'|'.join(r['triggers'])})" for g, r in groups.items())
+                regex = re.compile(pattern, re.IGNORECASE) if pattern else None
+                m = _matchers[target_lang] = (always, regex, groups)
+    return m
+
+
+def select_rules(text: str, target_lang: str, tone: str = "neutral", filtered: bool = PROMPT_RULES_FILTER) -> List[dict]:
+    """
+    Rules for this call, in registry order. filtered=False returns every
+    rule of the language (all tones, all triggered rules).
+    """
+    always, regex, groups = _matcher(target_lang)
+    if not filtered:
+        return always + list(groups.values())
+
+    hit = set()
+    if regex is not None:
+        # one scan; a rule whose trigger starts where another rule's trigger
+        # matched is only picked up by its other occurrences
+        for m in regex.finditer(text):
+            hit.add(m.lastgroup)
+    chosen = [r for r in always if r.get("tone") in (None, tone)]
+    chosen += [groups[g] for g in groups if g in hit]
+    return chosen
+
+
+def build_translation_prompt(
+    text: str,
+    target_lang: str,
+    tone: str = "neutral",
+    politeness: str = "neutral",
+    gender: str = "neutral",
+    examples: Optional[list] = None,
+    filtered: bool = PROMPT_RULES_FILTER,
+    minimal: bool = False,
+    numbered: bool = False,
+) -> str:
+    """
+    minimal=True: core rules only (trivial inputs, see model_router).
+    numbered=True: the input is independent lines prefixed with ⟦n⟧ markers
+    that the output must keep (batched segments, see translation_memory).
+    """
+    chosen = select_rules(text, target_lang, tone, filtered)
+    if minimal:
+        chosen = [r for r in chosen if r["id"].startswith("core_")]
+    rules = "\n".join(f"- {r['text']}" for r in chosen)
+    memory = ""
+    if examples:
+        memory = (
+            "\nTRANSLATION MEMORY (earlier translations of similar sentences; keep their "
+            "terminology and phrasing, change only what differs in the input):\n"
+            + "\n".join(f"- {src} => {tgt}" for src, tgt in examples)
+            + "\n"
+        )
+    if numbered:
+        memory += (
+            "\nThe input is independent numbered lines. Translate each line on its own line and "
+            "start it with the same ⟦n⟧ marker; do not merge, split or drop lines.\n"
+        )
+    return (
+        f"Translate the following text into the target language: {target_lang}\n"
+        f"Output ONLY the translated text (no commentary, no explanation).\n"
+        f"Context: tone={tone}, politeness={politeness}, gender={gender}\n\n"
+        f"RULES:\n{rules}\n"
+        f"{memory}\n"
+        f"### INPUT TEXT:\n{text}\n\n"
+        f"Provide ONLY the final translation."
+    )
@@ -4,27 +4,34 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from openai import OpenAI
+from app.utils.metrics import timed
 OPENAI_KEY = os.getenv('OPENAI_API_KEY', '')
 client = OpenAI(api_key=OPENAI_KEY) if OPENAI_KEY else None
 
-def transcribe_with_openai(file_path: str):
+@timed("transcribe", model="whisper-1")
+def transcribe_with_openai(source):
     
     """
     Uses OpenAI speech with improved accuracy for Tamil / English / Hindi.
     Automatically detects language.
+    `source` is a file path or an in-memory (filename, bytes) upload.
     """
      
     if client is None:
         return '', 'no-client'
     
     try:
-        with open(file_path, "rb") as f:
-            res = client.audio.transcriptions.create(
-                model="whisper-1",  #gpt-4o-mini-transcribe
-                file=f,
-                #language="auto",               
-                temperature=0,
-            )
+        if isinstance(source, tuple):
+            upload = source
+        else:
+            with open(source, "rb") as f:
+                upload = (os.path.basename(source), f.read())
+        res = client.audio.transcriptions.create(
+            model="whisper-1",  #gpt-4o-mini-transcribe
+            file=upload,
+            #language="auto",               
+            temperature=0,
+        )
         return res.text.strip(), "openai"
     
     except Exception as e:
@@ -35,6 +42,7 @@ def transcribe_with_openai(file_path: str):
 from deepmultilingualpunctuation import PunctuationModel
 punct_model = PunctuationModel()
 
+@timed("punctuation", model="deepmultilingualpunctuation")
 def restore_punctuation(text: str) -> str:
     try:
         return punct_model.restore_punctuation(text)
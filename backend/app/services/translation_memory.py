@@ -0,0 +1,327 @@
+# app/services/translation_memory.py
+"""
+Segment-level translation memory.
+
+Translated sentences are stored in Mongo (`translation_memory`) and
+indexed in memory per user and target language by character trigrams.
+Candidates for a new sentence are the entries sharing the most trigrams;
+they are scored with rapidfuzz:
+
+    same normalized sentence → stored translation reused
+    score ≥ TM_HINT_SCORE    → given to the LLM as an example
+    below                    → plain translation
+
+Near matches are never reused verbatim: one changed word ("not", a name)
+barely moves the score but changes the meaning. Entries are scoped to
+the user who produced them, so one user's names and content never show
+up in another user's output.
+"""
+
+import re
+import time
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from rapidfuzz import fuzz
+
+from ..config.settings import (
+    TM_ENABLED,
+    TM_HINT_SCORE,
+    TM_MIN_CHARS,
+    TM_MAX_SEGMENTS,
+    TM_MAX_ENTRIES,
+    TM_CANDIDATES,
+    TM_MAX_POSTING,
+    TM_MAX_USERS,
+)
+from ..db.mongo import get_db
+from ..utils.cost_utils import estimate_llm_cost
+from ..utils.metrics import stage, record_tm_lookup
+from .translation_service import translate_text
+
+# sentence ends (. ! ? । ॥) or line breaks; the separator is kept for reassembly.
+# Not after common abbreviations or before a digit ("No. 4521", "Dr. Rao").
+_SEGMENT_SPLIT = re.compile(
+    r"((?<=[.!?।॥])(?<!\bNo\.)(?<!\bMr\.)(?<!\bMs\.)(?<!\bDr\.)(?<!\bMrs\.)(?<!\bRs\.)[ \t]+(?=\D)|\s*\n\s*)"
+)
+_FALLBACK_MARKERS = ("(no-llm-translation)", "(translation failed:")
+
+
+def split_segments(text: str) -> List[Tuple[str, str]]:
+    """[(segment, separator_after), ...]; joining them gives back the text."""
+    parts = _SEGMENT_SPLIT.split(text or "")
+    parts.append("")
+    return [(parts[i], parts[i + 1]) for i in range(0, len(parts) - 1, 2)]
+
+
+def _norm(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _grams(norm: str) -> set:
+    return {norm[i:i + 3] for i in range(len(norm) - 2)} or {norm}
+
+
+# -----------------------------
+# Index
+# -----------------------------
+class TranslationMemory:
+    """
+    Trigram index over stored segments, one per (user, target language).
+    Loaded lazily from Mongo (newest TM_MAX_ENTRIES), then kept in sync by
+    add(); the TM_MAX_USERS most recently used indexes stay in memory.
+    Trigrams shared by more than TM_MAX_POSTING entries are skipped during
+    candidate generation (stop-grams such as " th").
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._langs: "OrderedDict[Tuple[str, str], dict]" = OrderedDict()
+        self.outcomes = Counter()
+        self.lookup_sec = 0.0
+
+    def _load(self, user_id: str, lang: str) -> dict:
+        idx = {"norm": [], "src": [], "tgt": [], "postings": {}, "exact": {}}
+        try:
+            with stage("tm_load", model="mongo"):
+                docs = get_db().translation_memory.find(
+                    {"user_id": user_id, "target_lang": lang}, {"src": 1, "tgt": 1}
+                ).sort("created_at", -1).limit(TM_MAX_ENTRIES)
+                for d in docs:
+                    self._index(idx, d["src"], d["tgt"])
+        except Exception as e:
+            print("Translation memory load failed", e)
+        return idx
+
+    def _lang(self, lang: str, user_id: str) -> dict:
+        key = (user_id, lang)
+        with self._lock:
+            idx = self._langs.get(key)
+            if idx is not None:
+                self._langs.move_to_end(key)
+                return idx
+        idx = self._load(user_id, lang)             # outside the lock: Mongo round trip
+        with self._lock:
+            idx = self._langs.setdefault(key, idx)
+            self._langs.move_to_end(key)
+            while len(self._langs) > TM_MAX_USERS:
+                self._langs.popitem(last=False)
+        return idx
+
+    @staticmethod
+    def _index(idx: dict, src: str, tgt: str) -> None:
+        norm = _norm(src)
+        i = idx["exact"].get(norm)
+        if i is not None:
+            idx["tgt"][i] = tgt
+            return
+        i = len(idx["norm"])
+        idx["norm"].append(norm)
+        idx["src"].append(src)
+        idx["tgt"].append(tgt)
+        idx["exact"][norm] = i
+        for g in _grams(norm):
+            idx["postings"].setdefault(g, []).append(i)
+
+    def lookup(self, segment: str, lang: str, user_id: str) -> Tuple[str, Optional[Tuple[float, str, str]]]:
+        """
+        ("hit" | "hint" | "miss", (score, src, tgt) of the best match or None).
+        Only an exact (normalized) match is a hit; anything below 100 is at
+        most a hint.
+        """
+        t0 = time.perf_counter()
+        norm = _norm(segment)
+        idx = self._lang(lang, user_id)
+        with self._lock:
+            i = idx["exact"].get(norm)
+            if i is not None:
+                best = (100.0, idx["src"][i], idx["tgt"][i])
+                cands = []
+            else:
+                best = None
+                counts = Counter()
+                for g in _grams(norm):
+                    post = idx["postings"].get(g)
+                    if post and len(post) <= TM_MAX_POSTING:
+                        counts.update(post)
+                cands = [(idx["norm"][j], idx["src"][j], idx["tgt"][j]) for j, _ in counts.most_common(TM_CANDIDATES)]
+
+        for cand_norm, src, tgt in cands:
+            score = fuzz.ratio(norm, cand_norm)
+            if best is None or score > best[0]:
+                best = (score, src, tgt)
+
+        if best and best[0] >= 100.0:
+            outcome = "hit"
+        elif best and best[0] >= TM_HINT_SCORE:
+            outcome = "hint"
+        else:
+            outcome = "miss"
+
+        elapsed = time.perf_counter() - t0
+        with self._lock:
+            self.outcomes[outcome] += 1
+            self.lookup_sec += elapsed
+        record_tm_lookup(outcome, elapsed)
+        return outcome, best
+
+    def add(self, src: str, tgt: str, lang: str, user_id: str) -> None:
+        idx = self._lang(lang, user_id)
+        with self._lock:
+            self._index(idx, src, tgt)
+        key = hashlib.sha1(f"{user_id}\n{lang}\n{_norm(src)}".encode("utf-8")).hexdigest()
+        try:
+            with stage("db_insert", model="mongo"):
+                get_db().translation_memory.update_one(
+                    {"_id": key},
+                    {"$set": {"src": src, "tgt": tgt, "target_lang": lang, "user_id": user_id,
+                              "created_at": datetime.now(timezone.utc)}},
+                    upsert=True,
+                )
+        except Exception as e:
+            print("Translation memory save failed", e)
+
+    def size(self, lang: str, user_id: str) -> int:
+        idx = self._langs.get((user_id, lang))
+        return len(idx["norm"]) if idx else 0
+
+    def stats(self) -> dict:
+        """Entry / trigram counts summed per language over the loaded users."""
+        with self._lock:
+            total = sum(self.outcomes.values())
+            entries, trigrams = Counter(), Counter()
+            for (_user, lang), idx in self._langs.items():
+                entries[lang] += len(idx["norm"])
+                trigrams[lang] += len(idx["postings"])
+            return {
+                "users": len({user for user, _lang in self._langs}),
+                "entries": dict(entries),
+                "trigrams": dict(trigrams),
+                "lookups": total,
+                "hit_rate": round(self.outcomes["hit"] / total, 3) if total else 0.0,
+                "hint_rate": round(self.outcomes["hint"] / total, 3) if total else 0.0,
+                "avg_lookup_ms": round(self.lookup_sec / total * 1000, 3) if total else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._langs.clear()
+            self.outcomes.clear()
+            self.lookup_sec = 0.0
+
+
+_tm: Optional[TranslationMemory] = None
+_tm_lock = threading.Lock()
+
+
+def get_tm() -> TranslationMemory:
+    global _tm
+    if _tm is None:
+        with _tm_lock:
+            if _tm is None:
+                _tm = TranslationMemory()
+    return _tm
+
+
+# -----------------------------
+# Translation
+# -----------------------------
+_MARKER = re.compile(r"^[ \t]*⟦(\d+)⟧[ \t]?", re.M)
+
+
+def _numbered(segments: List[str]) -> str:
+    return "\n".join(f"⟦{n}⟧ {seg}" for n, seg in enumerate(segments, 1))
+
+
+def _unnumbered(text: str, n: int) -> Optional[List[str]]:
+    """Lines of a ⟦n⟧-numbered translation, or None when the markers did not survive."""
+    parts = _MARKER.split(text)
+    if parts[0].strip() or parts[1::2] != [str(i) for i in range(1, n + 1)]:
+        return None
+    lines = [p.strip() for p in parts[2::2]]
+    return lines if all(lines) else None
+
+
+def _learnable(seg: str, translated: str) -> bool:
+    return len(seg.strip()) >= TM_MIN_CHARS and not any(m in translated for m in _FALLBACK_MARKERS)
+
+
+def translate_with_memory(text: str, target_lang: str = "en", user_id: str = "guest") -> Tuple[str, Optional[dict]]:
+    """
+    Hits are copied from the memory; the remaining segments go to the LLM
+    in one call as ⟦n⟧-numbered lines (one segment: as is), with near
+    matches as examples. Only pairs from that call are learned: the
+    markers guarantee which translation belongs to which source sentence.
+
+    If the markers do not come back, nothing is learned and
+    - without hits the batch covered the whole text: its output (markers
+      removed) is the translation, no further call;
+    - with hits a second call translates the whole text, the hits given
+      as examples - the only case that costs two LLM calls.
+
+    Texts over TM_MAX_SEGMENTS segments go to translate_text whole.
+    Returns (translated_text, stats or None when the memory was not used);
+    stats["cost_usd"] covers only the text actually sent to the LLM.
+    """
+    pairs = split_segments(text)
+    if not TM_ENABLED or len(pairs) > TM_MAX_SEGMENTS:
+        return translate_text(text, target_lang), None
+
+    tm = get_tm()
+    out: List[Optional[str]] = [None] * len(pairs)
+    examples = []
+    counts = Counter()
+    t0 = time.perf_counter()
+    for i, (seg, _sep) in enumerate(pairs):
+        if len(seg.strip()) < TM_MIN_CHARS:
+            continue
+        outcome, match = tm.lookup(seg, target_lang, user_id)
+        counts[outcome] += 1
+        if outcome == "hit":
+            out[i] = match[2]
+        elif outcome == "hint" and (match[1], match[2]) not in examples:
+            examples.append((match[1], match[2]))
+    lookup_ms = (time.perf_counter() - t0) * 1000
+
+    todo = [i for i, (seg, _sep) in enumerate(pairs) if out[i] is None and seg.strip()]
+    stats = {
+        "segments": len(pairs),
+        "reused": counts["hit"],
+        "hinted": counts["hint"],
+        "translated": len(todo),
+        "lookup_ms": round(lookup_ms, 2),
+    }
+
+    joined = None
+    cost = 0.0
+    if todo:
+        segs = [pairs[i][0] for i in todo]
+        if len(segs) == 1:
+            sent = segs[0]
+            batch = translate_text(sent, target_lang, examples=examples or None)
+            lines = [batch]
+        else:
+            sent = _numbered(segs)
+            batch = translate_text(sent, target_lang, examples=examples or None, numbered=True)
+            lines = _unnumbered(batch, len(segs))
+        cost += estimate_llm_cost(sent, batch)
+        if lines is None and not counts["hit"]:
+            joined = _MARKER.sub("", batch)
+        elif lines is None:
+            hits = [(seg, out[i]) for i, (seg, _sep) in enumerate(pairs) if out[i] is not None]
+            joined = translate_text(text, target_lang, examples=hits + examples)
+            cost += estimate_llm_cost(text, joined)
+        else:
+            for i, seg, translated in zip(todo, segs, lines):
+                out[i] = translated
+                if _learnable(seg, batch):
+                    tm.add(seg, translated, target_lang, user_id)
+
+    if joined is None:
+        joined = "".join((out[i] if out[i] is not None else seg) + sep for i, (seg, sep) in enumerate(pairs))
+    stats["index_size"] = tm.size(target_lang, user_id)
+    stats["cost_usd"] = round(cost, 6)
+    return joined.strip(), stats
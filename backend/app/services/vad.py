@@ -0,0 +1,121 @@
+# app/services/vad.py
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..config.settings import (
+    VAD_ENABLED,
+    VAD_FRAME_MS,
+    VAD_THRESHOLD_DB,
+    VAD_ABS_FLOOR_DB,
+    VAD_MIN_SPEECH_MS,
+    VAD_MIN_SILENCE_MS,
+    VAD_PAD_MS,
+    VAD_GAP_MS,
+)
+from ..utils.metrics import timed
+from .media import AudioClip
+
+
+# -----------------------------
+# Frame-energy detector
+# -----------------------------
+def _runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """[start, end) index pairs of the True runs in a boolean array."""
+    if not mask.any():
+        return []
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return list(zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+
+
+def detect_speech(samples: np.ndarray, sr: int) -> List[Tuple[float, float]]:
+    """
+    Speech regions as (start_s, end_s).
+
+    A frame is speech when its energy is VAD_THRESHOLD_DB above the
+    recording's noise floor (10th percentile) and above the absolute floor
+    VAD_ABS_FLOOR_DB. Pauses shorter than VAD_MIN_SILENCE_MS are bridged,
+    blips shorter than VAD_MIN_SPEECH_MS dropped, and every region is
+    padded by VAD_PAD_MS.
+    """
+    frame = max(1, int(sr * VAD_FRAME_MS / 1000))
+    n = len(samples) // frame
+    if n == 0:
+        return []
+
+    energy = np.square(samples[: n * frame].reshape(n, frame), dtype=np.float64).mean(axis=1)
+    db = 10.0 * np.log10(energy + 1e-12)
+    threshold = max(np.percentile(db, 10) + VAD_THRESHOLD_DB, VAD_ABS_FLOOR_DB)
+    speech = db >= threshold
+
+    # bridge short pauses
+    min_sil = max(1, int(VAD_MIN_SILENCE_MS / VAD_FRAME_MS))
+    for a, b in _runs(~speech):
+        if a > 0 and b < n and b - a < min_sil:
+            speech[a:b] = True
+
+    min_speech = max(1, int(VAD_MIN_SPEECH_MS / VAD_FRAME_MS))
+    pad = VAD_PAD_MS / 1000.0
+    total = len(samples) / float(sr)
+    regions: List[Tuple[float, float]] = []
+    for a, b in _runs(speech):
+        if b - a < min_speech:
+            continue
+        start = max(0.0, float(a * frame) / sr - pad)
+        end = min(total, float(b * frame) / sr + pad)
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return regions
+
+
+# -----------------------------
+# Speech regions
+# -----------------------------
+class SpeechMap:
+    """
+    Speech regions of the original recording, in the order they are laid
+    out back to back (with `gap_s` of silence between them) in the
+    condensed audio.
+    """
+
+    def __init__(self, regions: List[Tuple[float, float]], gap_s: float):
+        self.regions = regions
+        self.gap_s = gap_s
+
+    @property
+    def speech_sec(self) -> float:
+        return sum(end - start for start, end in self.regions)
+
+    def as_list(self) -> List[List[float]]:
+        return [[round(s, 2), round(e, 2)] for s, e in self.regions]
+
+
+@timed("vad", model="energy")
+def condense_speech(clip: AudioClip) -> Tuple[AudioClip, Optional[SpeechMap]]:
+    """
+    Drop non-speech from `clip`.
+    Returns (clip, None) when VAD is disabled, (clip, map) when the whole
+    recording is speech, and a new speech-only clip otherwise. An empty
+    map means no speech at all.
+    """
+    if not VAD_ENABLED:
+        return clip, None
+
+    sr = clip.sample_rate
+    regions = detect_speech(clip.samples, sr)
+    smap = SpeechMap(regions, VAD_GAP_MS / 1000.0)
+    if not regions:
+        return clip, smap
+    if len(regions) == 1 and regions[0][0] == 0.0 and regions[0][1] >= clip.duration:
+        return clip, smap
+
+    gap = np.zeros(int(sr * smap.gap_s), dtype=np.float32)
+    parts = []
+    for i, (start, end) in enumerate(regions):
+        if i:
+            parts.append(gap)
+        parts.append(clip.samples[int(start * sr): int(end * sr)])
+    return clip.with_samples(np.concatenate(parts)), smap
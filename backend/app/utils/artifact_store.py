@@ -0,0 +1,461 @@
+# app/utils/artifact_store.py
+
+import os
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional, Tuple
+from urllib.parse import urlparse, unquote
+
+from ..config.settings import (
+    ARTIFACT_BACKEND,
+    ARTIFACT_ROOT,
+    ARTIFACT_MAX_MB,
+    ARTIFACT_MAX_AGE_DAYS,
+    ARTIFACT_SWEEP_INTERVAL_S,
+    ARTIFACT_NAMESPACES,
+    S3_BUCKET,
+    S3_ENDPOINT_URL,
+    S3_PREFIX,
+    S3_PUBLIC_BASE_URL,
+)
+
+logger = logging.getLogger(__name__)
+
+TMP_SUFFIX = ".tmp"
+S3_TOUCH_MIN_AGE_S = 3600
+
+
+# -----------------------------
+# Keys
+# -----------------------------
+def sharded_key(namespace: str, digest: str, ext: str) -> str:
+    """
+    json/3f/a2/3fa2....json — two levels of 256-way fan-out keeps every
+    directory small no matter how many artifacts accumulate.
+    """
+    ext = ext if ext.startswith(".") or not ext else f".{ext}"
+    return f"{namespace}/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+
+def content_key(data: bytes, namespace: str, ext: str) -> str:
+    return sharded_key(namespace, hashlib.sha256(data).hexdigest(), ext)
+
+
+# -----------------------------
+# Interface
+# -----------------------------
+class ArtifactStore(ABC):
+    """
+    Blob store for generated artifacts (result JSON, TTS audio, caches).
+
+    put()        – content-addressed write, returns the public URL
+    put_key()    – write under a caller-chosen key (derived caches)
+    open_writer()– streamed, content-addressed write (hash computed on the fly)
+
+    The sweeper evicts by mtime, so every re-use of an existing object
+    (put / commit of the same content, chunk cache hit) goes through
+    touch(): eviction order is then least-recently-used, not creation.
+    """
+
+    def put(self, data: bytes, namespace: str, ext: str) -> str:
+        key = content_key(data, namespace, ext)
+        if not self.touch(key):
+            self.put_key(key, data)
+        return self.url_for(key)
+
+    @abstractmethod
+    def put_key(self, key: str, data: bytes) -> None:
+        ...
+
+    def put_file(self, key: str, fileobj) -> None:
+        """Write from a file object; backends override to stream instead of buffering."""
+        self.put_key(key, fileobj.read())
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    def touch(self, key: str) -> bool:
+        """Marks the object as just used; False when it does not exist."""
+        return self.exists(key)
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def url_for(self, key: str) -> str:
+        ...
+
+    @abstractmethod
+    def key_for_url(self, url: str) -> Optional[str]:
+        """Inverse of url_for(); None for URLs this store did not issue."""
+
+    @abstractmethod
+    def iter_objects(self, namespace: str) -> Iterator[Tuple[str, int, float]]:
+        """Yields (key, size_bytes, mtime) for every object under namespace."""
+
+    def open_writer(self, namespace: str, ext: str) -> "ArtifactWriter":
+        return ArtifactWriter(self, namespace, ext)
+
+    # ---------- retention ----------
+    def sweep(self, max_bytes: int, max_age_s: float) -> dict:
+        """
+        Age- then size-based eviction over the managed namespaces.
+        Oldest objects go first once the total exceeds max_bytes.
+        """
+        now = time.time()
+        objects = []
+        removed = freed = 0
+        for ns in ARTIFACT_NAMESPACES:
+            for key, size, mtime in self.iter_objects(ns):
+                if max_age_s and now - mtime > max_age_s:
+                    self._safe_delete(key)
+                    removed += 1
+                    freed += size
+                else:
+                    objects.append((mtime, size, key))
+
+        total = sum(size for _, size, _ in objects)
+        if max_bytes and total > max_bytes:
+            objects.sort()
+            for mtime, size, key in objects:
+                if total <= max_bytes:
+                    break
+                self._safe_delete(key)
+                total -= size
+                removed += 1
+                freed += size
+
+        return {"removed": removed, "freed_bytes": freed, "remaining_bytes": total}
+
+    def _safe_delete(self, key: str) -> None:
+        try:
+            self.delete(key)
+        except Exception as e:
+            logger.warning("artifact sweep: could not delete %s: %s", key, e)
+
+
+class ArtifactWriter:
+    """
+    File-like writer that hashes while buffering to a temp file and
+    commits under the content key on close.
+    """
+
+    def __init__(self, store: ArtifactStore, namespace: str, ext: str):
+        self.store = store
+        self.namespace = namespace
+        self.ext = ext
+        self._hash = hashlib.sha256()
+        self._tmp = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        self.url: Optional[str] = None
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._hash.update(data)
+        self.size += len(data)
+        return self._tmp.write(data)
+
+    def commit(self) -> str:
+        key = sharded_key(self.namespace, self._hash.hexdigest(), self.ext)
+        if not self.store.touch(key):
+            self._tmp.seek(0)
+            self.store.put_file(key, self._tmp)
+        self._tmp.close()
+        self.url = self.store.url_for(key)
+        return self.url
+
+    def discard(self) -> None:
+        self._tmp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+
+# -----------------------------
+# Local filesystem
+# -----------------------------
+class LocalArtifactStore(ArtifactStore):
+    """
+    Files under `root` (app/static by default, served by the /static mount).
+    Writes go to a temp file in the target directory and are published
+    with os.replace, so readers never see a partial file.
+    """
+
+    def __init__(self, root: str = "app/static"):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def put_key(self, key: str, data: bytes) -> None:
+        self._publish(key, lambda f: f.write(data))
+
+    def put_file(self, key: str, fileobj) -> None:
+        self._publish(key, lambda f: shutil.copyfileobj(fileobj, f, 1024 * 1024))
+
+    def _publish(self, key: str, write) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=TMP_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except Exception:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def touch(self, key: str) -> bool:
+        try:
+            os.utime(self._path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def url_for(self, key: str) -> str:
+        # same "/app/static/..." form the handlers always returned
+        return "/" + self._path(key).replace("\\", "/").lstrip("/")
+
+    def key_for_url(self, url: str) -> Optional[str]:
+        base = "/" + self.root.replace("\\", "/").strip("/") + "/"
+        return url[len(base):] if isinstance(url, str) and url.startswith(base) else None
+
+    def iter_objects(self, namespace: str) -> Iterator[Tuple[str, int, float]]:
+        base = self._path(namespace)
+        for dirpath, _dirs, files in os.walk(base):
+            for name in files:
+                full = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(full)
+                except FileNotFoundError:
+                    continue
+                rel = os.path.relpath(full, self.root).replace(os.sep, "/")
+                yield rel, st.st_size, st.st_mtime
+
+    def sweep(self, max_bytes: int, max_age_s: float) -> dict:
+        stats = super().sweep(max_bytes, max_age_s)
+        self._prune_empty_dirs()
+        return stats
+
+    def _prune_empty_dirs(self) -> None:
+        for ns in ARTIFACT_NAMESPACES:
+            for dirpath, dirs, files in os.walk(self._path(ns), topdown=False):
+                if dirpath != self._path(ns) and not dirs and not files:
+                    try:
+                        os.rmdir(dirpath)
+                    except OSError:
+                        pass
+
+
+# -----------------------------
+# S3-compatible (AWS S3, MinIO, ...)
+# -----------------------------
+class S3ArtifactStore(ArtifactStore):
+    """
+    Same layout in a bucket. `endpoint_url` points at any S3-compatible
+    server, e.g. a local MinIO standing in for S3.
+    """
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None,
+                 prefix: str = "", public_base_url: Optional[str] = None):
+        import boto3
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.public_base_url = (public_base_url or "").rstrip("/")
+        self.client = boto3.client("s3", endpoint_url=endpoint_url or None)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put_key(self, key: str, data: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=self._key(key), Body=data)
+
+    def put_file(self, key: str, fileobj) -> None:
+        self.client.upload_fileobj(fileobj, self.bucket, self._key(key))
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._key(key))["Body"].read()
+        except self.client.exceptions.NoSuchKey:
+            return None
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+            return True
+        except Exception:
+            return False
+
+    def touch(self, key: str) -> bool:
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except Exception:
+            return False
+        # S3 has no utime: an in-place copy resets LastModified. Only when it
+        # is an hour old, so a hot chunk costs one HEAD per hit, not a copy.
+        if time.time() - head["LastModified"].timestamp() > S3_TOUCH_MIN_AGE_S:
+            try:
+                self.client.copy_object(
+                    Bucket=self.bucket, Key=self._key(key),
+                    CopySource={"Bucket": self.bucket, "Key": self._key(key)},
+                    MetadataDirective="REPLACE",
+                    ContentType=head.get("ContentType", "binary/octet-stream"),
+                    Metadata=head.get("Metadata", {}),
+                )
+            except Exception as e:
+                logger.warning("artifact touch failed for %s: %s", key, e)
+        return True
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def url_for(self, key: str) -> str:
+        if self.public_base_url:
+            return f"{self.public_base_url}/{self._key(key)}"
+        return self.client.generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket, "Key": self._key(key)}, ExpiresIn=7 * 24 * 3600,
+        )
+
+    def key_for_url(self, url: str) -> Optional[str]:
+        if not isinstance(url, str):
+            return None
+        if self.public_base_url:
+            if not url.startswith(self.public_base_url + "/"):
+                return None
+            path = url[len(self.public_base_url) + 1:]
+        else:
+            parsed = urlparse(url)
+            if not parsed.scheme:
+                return None
+            path = unquote(parsed.path).lstrip("/")
+            if path.startswith(self.bucket + "/"):        # path-style URL
+                path = path[len(self.bucket) + 1:]
+        if self.prefix:
+            if not path.startswith(self.prefix + "/"):
+                return None
+            path = path[len(self.prefix) + 1:]
+        return path
+
+    def iter_objects(self, namespace: str) -> Iterator[Tuple[str, int, float]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        strip = len(self.prefix) + 1 if self.prefix else 0
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self._key(namespace) + "/"):
+            for obj in page.get("Contents", []):
+                yield obj["Key"][strip:], obj["Size"], obj["LastModified"].timestamp()
+
+
+# -----------------------------
+# Singleton + sweeper
+# -----------------------------
+_store: Optional[ArtifactStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> ArtifactStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if ARTIFACT_BACKEND == "s3":
+                    _store = S3ArtifactStore(S3_BUCKET, S3_ENDPOINT_URL, S3_PREFIX, S3_PUBLIC_BASE_URL)
+                else:
+                    _store = LocalArtifactStore(ARTIFACT_ROOT)
+    return _store
+
+
+def sweep_temp_dirs(max_age_s: float, prefixes=("demucs_", "video_audio_")) -> int:
+    """
+    Removes leftovers of crashed requests (Demucs output dirs, extracted
+    video audio) from the system temp dir.
+    """
+    removed = 0
+    tmp = tempfile.gettempdir()
+    now = time.time()
+    for name in os.listdir(tmp):
+        if not name.startswith(prefixes):
+            continue
+        path = os.path.join(tmp, name)
+        try:
+            if now - os.path.getmtime(path) < max_age_s:
+                continue
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def run_sweep() -> dict:
+    max_age_s = ARTIFACT_MAX_AGE_DAYS * 86400
+    stats = get_store().sweep(ARTIFACT_MAX_MB * 1024 * 1024, max_age_s)
+    stats["temp_removed"] = sweep_temp_dirs(max_age_s=3600)
+    logger.info("artifact sweep: %s", stats)
+    return stats
+
+
+class ArtifactSweeper:
+    """Background thread running run_sweep() every ARTIFACT_SWEEP_INTERVAL_S."""
+
+    def __init__(self, interval_s: float = ARTIFACT_SWEEP_INTERVAL_S):
+        self.interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.interval_s <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="artifact-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                run_sweep()
+            except Exception as e:
+                logger.warning("artifact sweep failed: %s", e)
+            self._stop.wait(self.interval_s)
@@ -16,14 +16,41 @@ def estimate_audio_cost(duration_seconds: float, model: str) -> float:
 
 
 # --- TEXT TOKEN COST (translation / summarization) ---
+# $ per token (input, output)
 TOKEN_PRICE = {
-    "gpt-4o-mini": 0.0006 / 1000,   # $ per 1k tokens input
-    "gpt-4o-mini-out": 0.0009 / 1000   # $ per 1k tokens output
+    "gpt-4o-mini": (0.0006 / 1000, 0.0009 / 1000),
+    "gpt-4o": (0.0025 / 1000, 0.01 / 1000),
 }
 
-def estimate_llm_cost(tokens_in: int, tokens_out: int):
+_encoder = None
+
+
+def count_tokens(text) -> int:
+    """
+    Tokens in `text` (an int is returned as is). tiktoken when available,
+    else ~4 characters per token.
+    """
+    global _encoder
+    if isinstance(text, (int, float)):
+        return int(text)
+    if not text:
+        return 0
+    if _encoder is None:
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            _encoder = False
+    if _encoder:
+        return len(_encoder.encode(text))
+    return max(1, len(text) // 4)
+
+
+def estimate_llm_cost(text_in, text_out, model: str = "gpt-4o-mini"):
+    """text_in / text_out: strings (tokenized here) or token counts."""
     try:
-        cost = (TOKEN_PRICE["gpt-4o-mini"] * tokens_in) + (TOKEN_PRICE["gpt-4o-mini-out"] * tokens_out)
+        price_in, price_out = TOKEN_PRICE.get(model, TOKEN_PRICE["gpt-4o-mini"])
+        cost = price_in * count_tokens(text_in) + price_out * count_tokens(text_out)
         return round(cost, 6)
     except:
         return 0.0
@@ -0,0 +1,182 @@
+# app/utils/hedging.py
+"""
+Hedged LLM calls.
+
+A call still running after the rolling p95 latency gets a duplicate; the
+first response wins and the other request is cancelled (its HTTP request
+is aborted with the task). Hedges are capped at LLM_HEDGE_MAX_RATE of the
+recent calls so the extra spend stays bounded.
+
+Sync callers (translate_text runs in worker threads) go through one
+event loop on a background thread, so both requests are real `ainvoke`
+tasks that can be cancelled.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from ..config.settings import (
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_WINDOW,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_HEDGE_MIN_DELAY_MS,
+    LLM_HEDGE_MAX_RATE,
+)
+from .metrics import record_hedge
+
+
+def _percentile(sorted_vals, q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
+
+
+class Hedger:
+    """
+    Rolling window of the last `window` calls: latency (seconds) and
+    whether the call was hedged. The threshold is the window's p95,
+    never below min_delay; no hedging before min_samples calls. Hedges
+    still in flight count against the budget, so a burst of slow calls
+    cannot all hedge before the first of them is recorded.
+    """
+
+    def __init__(self, window: int = LLM_HEDGE_WINDOW, min_samples: int = LLM_HEDGE_MIN_SAMPLES,
+                 min_delay_ms: float = LLM_HEDGE_MIN_DELAY_MS, max_rate: float = LLM_HEDGE_MAX_RATE):
+        self.min_samples = min_samples
+        self.min_delay = min_delay_ms / 1000.0
+        self.max_rate = max_rate
+        self._lat = deque(maxlen=window)
+        self._hedged = deque(maxlen=window)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    # ---- threshold / budget ----
+    def threshold(self) -> Optional[float]:
+        """Seconds to wait before hedging, None while there is no baseline."""
+        with self._lock:
+            if len(self._lat) < self.min_samples:
+                return None
+            return max(self.min_delay, _percentile(sorted(self._lat), 0.95))
+
+    def _reserve_hedge(self) -> bool:
+        """Takes a hedge slot if the budget allows; released by _record / _release_hedge."""
+        with self._lock:
+            if sum(self._hedged) + self._in_flight >= self.max_rate * max(len(self._hedged), self.min_samples):
+                return False
+            self._in_flight += 1
+            return True
+
+    def _release_hedge(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _record(self, seconds: float, hedged: bool, hedge_won: bool) -> None:
+        with self._lock:
+            self._lat.append(seconds)
+            self._hedged.append(hedged)
+            if hedged:
+                self._in_flight -= 1     # the slot becomes the recorded hedge
+            self.calls += 1
+            self.hedges += hedged
+            self.hedge_wins += hedge_won
+        record_hedge(hedged, hedge_won)
+
+    # ---- calls ----
+    async def ainvoke(self, llm, messages):
+        t0 = time.perf_counter()
+        primary = asyncio.ensure_future(llm.ainvoke(messages))
+        delay = self.threshold()
+        done = set()
+        if delay is not None:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or delay is None or not self._reserve_hedge():
+            resp = await primary
+            self._record(time.perf_counter() - t0, False, False)
+            return resp
+
+        hedge = asyncio.ensure_future(llm.ainvoke(messages))
+        pending = {primary, hedge}
+        winner, error = None, None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        break
+                    error = task.exception()
+        except BaseException:
+            self._release_hedge()
+            raise
+        finally:
+            for task in pending:
+                task.cancel()
+        if winner is None:
+            self._release_hedge()
+            raise error
+        self._record(time.perf_counter() - t0, True, winner is hedge)
+        return winner.result()
+
+    def invoke(self, llm, messages):
+        """Blocking form for threads; runs on the shared hedging event loop."""
+        return asyncio.run_coroutine_threadsafe(self.ainvoke(llm, messages), _event_loop()).result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lat = sorted(self._lat)
+            return {
+                "calls": self.calls,
+                "hedges": self.hedges,
+                "hedge_rate": round(self.hedges / self.calls, 4) if self.calls else 0.0,
+                "hedge_win_rate": round(self.hedge_wins / self.hedges, 4) if self.hedges else 0.0,
+                "p50_ms": round(_percentile(lat, 0.50) * 1000, 1),
+                "p95_ms": round(_percentile(lat, 0.95) * 1000, 1),
+                "p99_ms": round(_percentile(lat, 0.99) * 1000, 1),
+            }
+
+
+# -----------------------------
+# Shared loop + one hedger per call kind
+# -----------------------------
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_hedgers = {}
+_hedgers_lock = threading.Lock()
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None:
+        with _hedgers_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-hedge", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def get_hedger(kind: str = "translate") -> Hedger:
+    """Translate and summarize calls have different latency profiles, so separate windows."""
+    h = _hedgers.get(kind)
+    if h is None:
+        with _hedgers_lock:
+            h = _hedgers.get(kind)
+            if h is None:
+                h = _hedgers[kind] = Hedger()
+    return h
+
+
+def hedge_stats() -> dict:
+    return {kind: h.stats() for kind, h in list(_hedgers.items())}
+
+
+def invoke_llm(llm, messages, kind: str = "translate"):
+    """llm.invoke(messages), hedged when LLM_HEDGE_ENABLED."""
+    if not LLM_HEDGE_ENABLED:
+        return llm.invoke(messages)
+    return get_hedger(kind).invoke(llm, messages)
@@ -2,6 +2,7 @@ import re, os
 import unicodedata
 from functools import lru_cache
 from pathlib import Path
+from .metrics import timed
 
 # transformers optional
 try:
@@ -51,6 +52,7 @@ def clean_text(text: str) -> str:
     return text
 
 #Moderate Text
+@timed("moderation")
 def moderate_text(text: str) -> dict:
     """
     Context-aware moderation:
@@ -218,6 +220,7 @@ def validate_file(path: str, allowed_exts, max_mb: int):
 # domain & tone using transformers if available, else heuristics
 DOMAIN_LABELS = ['business','education','technology','legal','medical','news','entertainment','general']
 
+@timed("domain_tone")
 @lru_cache(maxsize=200)
 def detect_domain_tone(text: str):
     if not text or len(text.split())<3:
@@ -0,0 +1,247 @@
+# app/utils/metrics.py
+
+import os
+import time
+import logging
+import functools
+import contextvars
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# prometheus_client optional: without it spans still feed the
+# per-request `timings` block, only the /metrics export is empty.
+# Under gunicorn (PROMETHEUS_MULTIPROC_DIR set by gunicorn.conf.py) every
+# worker writes its samples to mmap files there and /metrics aggregates
+# all of them, whichever worker serves the scrape.
+try:
+    from prometheus_client import Histogram, Counter, CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST
+    from prometheus_client import multiprocess
+except Exception:
+    Histogram = Counter = None
+    generate_latest = None
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80, 160)
+
+if Histogram is not None:
+    STAGE_SECONDS = Histogram(
+        "pipeline_stage_seconds",
+        "Latency of one pipeline stage (ffmpeg, demucs, whisper, punctuation, llm, tts, ...)",
+        ["stage", "kind", "lang_pair", "model", "status"],
+        buckets=LATENCY_BUCKETS,
+    )
+    REQUEST_SECONDS = Histogram(
+        "pipeline_request_seconds",
+        "End-to-end latency of one workflow execution",
+        ["kind", "lang_pair", "status"],
+        buckets=LATENCY_BUCKETS,
+    )
+    REQUESTS_TOTAL = Counter(
+        "pipeline_requests_total",
+        "Workflow executions",
+        ["kind", "status"],
+    )
+    STT_UPLOAD_BYTES = Histogram(
+        "stt_upload_bytes",
+        "Size of the audio payload sent to speech-to-text",
+        ["codec"],
+        buckets=(64e3, 256e3, 1e6, 4e6, 8e6, 16e6, 25e6),
+    )
+    STT_UPLOAD_SAVED_BYTES = Counter(
+        "stt_upload_saved_bytes_total",
+        "Bytes not uploaded thanks to trimming + speech codec, vs 16 kHz PCM WAV",
+        ["codec"],
+    )
+    TM_LOOKUPS = Counter(
+        "translation_memory_lookups_total",
+        "Translation memory lookups by outcome (hit = reused, hint = few-shot example, miss)",
+        ["outcome"],
+    )
+    TM_LOOKUP_SECONDS = Histogram(
+        "translation_memory_lookup_seconds",
+        "Candidate generation + fuzzy scoring of one segment",
+        buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+    )
+    ROUTE_SECONDS = Histogram(
+        "llm_route_seconds",
+        "LLM call latency by routing tier (cache = served without a call)",
+        ["kind", "tier", "model"],
+        buckets=LATENCY_BUCKETS,
+    )
+    ROUTE_COST_USD = Counter(
+        "llm_route_cost_usd_total",
+        "Estimated LLM cost by routing tier",
+        ["kind", "tier", "model"],
+    )
+    LLM_HEDGES = Counter(
+        "llm_hedged_calls_total",
+        "LLM calls by hedging outcome (none = primary in time, primary / hedge = which request won)",
+        ["outcome"],
+    )
+else:
+    STAGE_SECONDS = REQUEST_SECONDS = REQUESTS_TOTAL = None
+    STT_UPLOAD_BYTES = STT_UPLOAD_SAVED_BYTES = None
+    TM_LOOKUPS = TM_LOOKUP_SECONDS = None
+    ROUTE_SECONDS = ROUTE_COST_USD = None
+    LLM_HEDGES = None
+
+
+# -----------------------------
+# Request-scoped trace
+# -----------------------------
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("pipeline_trace", default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("pipeline_span", default=None)
+
+
+def _lang_pair(trace: Optional[dict]) -> str:
+    if not trace:
+        return "unknown->unknown"
+    return f"{trace.get('source_lang') or 'unknown'}->{trace.get('target_lang') or 'unknown'}"
+
+
+@contextmanager
+def trace_request(kind: str, target_lang: str):
+    """
+    Opens a trace for one workflow execution.
+    Spans recorded with `stage()` inside it are collected into
+    trace["timings"] and labeled with kind + language pair.
+    """
+    trace = {
+        "kind": kind or "unknown",
+        "source_lang": None,
+        "target_lang": target_lang,
+        "timings": [],
+    }
+    token = _current_trace.set(trace)
+    status = "ok"
+    t0 = time.perf_counter()
+    try:
+        yield trace
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - t0
+        trace["total_ms"] = round(elapsed * 1000, 2)
+        _current_trace.reset(token)
+        if REQUEST_SECONDS is not None:
+            REQUEST_SECONDS.labels(trace["kind"], _lang_pair(trace), status).observe(elapsed)
+            REQUESTS_TOTAL.labels(trace["kind"], status).inc()
+
+
+def set_source_lang(lang: str) -> None:
+    """Attach the detected source language to the running trace."""
+    trace = _current_trace.get()
+    if trace is not None and lang:
+        trace["source_lang"] = lang
+
+
+def get_timings() -> Optional[dict]:
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    return {"stages": list(trace["timings"]), "total_ms": trace.get("total_ms")}
+
+
+@contextmanager
+def stage(name: str, model: str = "none"):
+    """
+    Span around one pipeline stage. Safe to use outside a trace
+    (metrics are still exported with kind="unknown").
+    """
+    trace = _current_trace.get()
+    span = {"model": model}
+    token = _current_span.set(span)
+    status = "ok"
+    t0 = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - t0
+        _current_span.reset(token)
+        model = span["model"]
+        if trace is not None:
+            trace["timings"].append({
+                "stage": name,
+                "model": model,
+                "ms": round(elapsed * 1000, 2),
+                "status": status,
+            })
+        if STAGE_SECONDS is not None:
+            kind = trace["kind"] if trace else "unknown"
+            STAGE_SECONDS.labels(name, kind, _lang_pair(trace), model, status).observe(elapsed)
+
+
+def submit_traced(pool, fn, *args, **kwargs):
+    """
+    pool.submit() that keeps the caller's trace: executor threads do not
+    inherit contextvars, so spans opened in the task would otherwise be
+    missing from the request's timings. One context copy per task (a
+    Context cannot be entered by two threads at once).
+    """
+    return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def map_traced(pool, fn, iterable):
+    """pool.map() with the caller's trace, see submit_traced()."""
+    return [f.result() for f in [submit_traced(pool, fn, item) for item in iterable]]
+
+
+def set_stage_model(model: str) -> None:
+    """
+    Relabels the innermost open span, for stages whose model is only known
+    once they run (translate / summarize after model_router picked a tier).
+    """
+    span = _current_span.get()
+    if span is not None:
+        span["model"] = model
+
+
+def timed(name: str, model: str = "none"):
+    """Decorator form of `stage()`."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name, model):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def record_stt_upload(codec: str, uploaded: int, saved: int) -> None:
+    if STT_UPLOAD_BYTES is not None:
+        STT_UPLOAD_BYTES.labels(codec).observe(uploaded)
+        STT_UPLOAD_SAVED_BYTES.labels(codec).inc(max(0, saved))
+
+
+def record_tm_lookup(outcome: str, seconds: float) -> None:
+    if TM_LOOKUPS is not None:
+        TM_LOOKUPS.labels(outcome).inc()
+        TM_LOOKUP_SECONDS.observe(seconds)
+
+
+def record_route(kind: str, tier: str, model: str, seconds: float, cost_usd: float) -> None:
+    if ROUTE_SECONDS is not None:
+        ROUTE_SECONDS.labels(kind, tier, model).observe(seconds)
+        ROUTE_COST_USD.labels(kind, tier, model).inc(max(0.0, cost_usd))
+
+
+def record_hedge(hedged: bool, hedge_won: bool) -> None:
+    if LLM_HEDGES is not None:
+        LLM_HEDGES.labels("hedge" if hedge_won else "primary" if hedged else "none").inc()
+
+
+def render_metrics() -> bytes:
+    if generate_latest is None:
+        return b"# prometheus_client not installed\n"
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
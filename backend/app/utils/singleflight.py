@@ -0,0 +1,100 @@
+# app/utils/singleflight.py
+
+import asyncio
+import hashlib
+import logging
+import re
+import unicodedata
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+# -----------------------------
+# Request key
+# -----------------------------
+def normalize_for_key(text: str) -> str:
+    """
+    Normalize text so that trivially different submissions
+    (extra spaces, NFKC variants, trailing newline) share one key.
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def content_hash(data) -> str:
+    """
+    sha256 of str (normalized) or raw bytes.
+    """
+    if isinstance(data, str):
+        data = normalize_for_key(data).encode("utf-8")
+    return hashlib.sha256(data or b"").hexdigest()
+
+
+def request_key(kind: str, digest: str, target_lang: str, output_pref: str, *extra) -> str:
+    """
+    Key identifying identical pipeline executions.
+    user_id is deliberately NOT part of the key: two users
+    sending the same announcement share one execution (each
+    still gets its own record, see SingleFlight.do).
+    """
+    parts = [kind, digest, (target_lang or "").lower(), (output_pref or "").lower()]
+    parts.extend(str(e) for e in extra)
+    return "|".join(parts)
+
+
+# -----------------------------
+# Single-flight group
+# -----------------------------
+class SingleFlight:
+    """
+    Deduplicates concurrent calls sharing the same key.
+
+    The first caller (leader) starts `fn` in the threadpool;
+    callers arriving while it is still running await the same task.
+    The task is shielded, so a client disconnect on one request
+    never cancels the work other requests are waiting on.
+
+    The execution records its result for the leader's owner (user) only;
+    do() tells the first follower of every other owner to write its own.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._owners: Dict[str, Set[str]] = {}
+        self.stats = {"executions": 0, "coalesced": 0}
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def _done(self, key: str) -> None:
+        self._inflight.pop(key, None)
+        self._owners.pop(key, None)
+
+    async def do(self, key: str, owner: str, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, bool]:
+        """(result, needs_record): needs_record is True for the first caller of an owner the result was not recorded for."""
+        task: Optional[asyncio.Task] = self._inflight.get(key)
+        needs_record = False
+
+        if task is None:
+            task = asyncio.ensure_future(run_in_threadpool(fn, *args, **kwargs))
+            self._inflight[key] = task
+            self._owners[key] = {owner}
+            task.add_done_callback(lambda _t, k=key: self._done(k))
+            self.stats["executions"] += 1
+        else:
+            self.stats["coalesced"] += 1
+            owners = self._owners.setdefault(key, set())
+            needs_record = owner not in owners
+            owners.add(owner)
+            logger.info("singleflight: coalesced duplicate request %s", key[:80])
+
+        return await asyncio.shield(task), needs_record
+
+
+# shared group for the API process
+pipeline_flight = SingleFlight()
@@ -0,0 +1,197 @@
+# app/utils/tts_engines.py
+
+import io
+import os
+import shutil
+import logging
+import subprocess
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+from gtts import gTTS
+from .metrics import stage
+from ..config.settings import TTS_ENGINE_CHAIN, TTS_ENGINE_TIMEOUTS, PIPER_VOICES
+
+logger = logging.getLogger(__name__)
+
+
+# -----------------------------
+# Engine interface
+# -----------------------------
+class TTSEngine(ABC):
+    """
+    One TTS backend. `synthesize` returns MP3 bytes for a single
+    sentence so chunks from any engine can be concatenated.
+    """
+
+    name = "base"
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def supports(self, lang: str) -> bool:
+        ...
+
+    @abstractmethod
+    def synthesize(self, text: str, lang: str, timeout: float) -> bytes:
+        ...
+
+
+def _wav_to_mp3(wav: bytes, timeout: float) -> bytes:
+    """Transcode WAV bytes to mono MP3 through an ffmpeg pipe (no temp files)."""
+    res = subprocess.run(
+        ["ffmpeg", "-loglevel", "error", "-f", "wav", "-i", "pipe:0",
+         "-ac", "1", "-b:a", "64k", "-f", "mp3", "pipe:1"],
+        input=wav, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        timeout=timeout, check=True,
+    )
+    return res.stdout
+
+
+# -----------------------------
+# gTTS (network)
+# -----------------------------
+class GTTSEngine(TTSEngine):
+    name = "gtts"
+
+    def __init__(self):
+        try:
+            from gtts.lang import tts_langs
+            self._langs = set(tts_langs().keys())
+        except Exception:
+            self._langs = {"en", "ta", "hi"}
+
+    def supports(self, lang: str) -> bool:
+        return lang in self._langs
+
+    def synthesize(self, text: str, lang: str, timeout: float) -> bytes:
+        buf = io.BytesIO()
+        gTTS(text=text, lang=lang, timeout=timeout).write_to_fp(buf)
+        return buf.getvalue()
+
+
+# -----------------------------
+# espeak-ng (local CPU, mainly for testing / offline fallback)
+# -----------------------------
+class EspeakEngine(TTSEngine):
+    name = "espeak"
+
+    # espeak-ng voice names for our language codes
+    VOICES = {"en": "en", "ta": "ta", "hi": "hi", "te": "te", "kn": "kn",
+              "ml": "ml", "bn": "bn", "mr": "mr", "gu": "gu", "fr": "fr", "de": "de", "es": "es"}
+
+    def __init__(self):
+        self._bin = shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def available(self) -> bool:
+        return bool(self._bin) and bool(shutil.which("ffmpeg"))
+
+    def supports(self, lang: str) -> bool:
+        return lang in self.VOICES
+
+    def synthesize(self, text: str, lang: str, timeout: float) -> bytes:
+        res = subprocess.run(
+            [self._bin, "-v", self.VOICES[lang], "--stdout", text],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout, check=True,
+        )
+        return _wav_to_mp3(res.stdout, timeout)
+
+
+# -----------------------------
+# Piper (local neural CPU voices)
+# -----------------------------
+class PiperEngine(TTSEngine):
+    """
+    Uses the `piper` CLI with one .onnx voice per language, configured as
+    PIPER_VOICES="en=/models/en_US-lessac-medium.onnx,hi=/models/hi_IN-pratham-medium.onnx"
+    """
+
+    name = "piper"
+
+    def __init__(self, voices: Optional[Dict[str, str]] = None):
+        self._bin = shutil.which("piper")
+        self.voices = {k: v for k, v in (voices or {}).items() if os.path.exists(v)}
+
+    def available(self) -> bool:
+        return bool(self._bin) and bool(self.voices) and bool(shutil.which("ffmpeg"))
+
+    def supports(self, lang: str) -> bool:
+        return lang in self.voices
+
+    def synthesize(self, text: str, lang: str, timeout: float) -> bytes:
+        res = subprocess.run(
+            [self._bin, "--model", self.voices[lang], "--output_file", "-"],
+            input=text.encode("utf-8"), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            timeout=timeout, check=True,
+        )
+        return _wav_to_mp3(res.stdout, timeout)
+
+
+ENGINE_TYPES = {
+    "gtts": GTTSEngine,
+    "espeak": EspeakEngine,
+    "piper": lambda: PiperEngine(PIPER_VOICES),
+}
+
+
+# -----------------------------
+# Priority chain
+# -----------------------------
+class TTSChain:
+    """
+    Tries engines in priority order; an engine that does not support the
+    language, is not installed, times out or fails is skipped.
+    """
+
+    def __init__(self, names: List[str], timeouts: Dict[str, float]):
+        self.engines: List[TTSEngine] = []
+        for name in names:
+            factory = ENGINE_TYPES.get(name)
+            if factory is None:
+                logger.warning("tts: unknown engine '%s' in chain, ignored", name)
+                continue
+            engine = factory()
+            if engine.available():
+                self.engines.append(engine)
+            else:
+                logger.info("tts: engine '%s' not available, skipped", name)
+        self.timeouts = timeouts
+
+    @property
+    def signature(self) -> str:
+        """Part of the chunk cache key: changing the chain re-voices chunks."""
+        return ",".join(e.name for e in self.engines)
+
+    def supports(self, lang: str) -> bool:
+        return any(e.supports(lang) for e in self.engines)
+
+    def primary(self, lang: str) -> Optional[str]:
+        """Name of the engine that voices `lang` when nothing fails."""
+        return next((e.name for e in self.engines if e.supports(lang)), None)
+
+    def synthesize(self, text: str, lang: str) -> Tuple[bytes, str]:
+        errors = []
+        for engine in self.engines:
+            if not engine.supports(lang):
+                continue
+            try:
+                with stage("tts_engine", model=engine.name):
+                    data = engine.synthesize(text, lang, self.timeouts.get(engine.name, 20.0))
+                if data:
+                    return data, engine.name
+                errors.append(f"{engine.name}: empty audio")
+            except Exception as e:
+                logger.warning("tts: engine '%s' failed for lang=%s: %s", engine.name, lang, e)
+                errors.append(f"{engine.name}: {e}")
+        raise RuntimeError(f"no TTS engine succeeded for lang='{lang}' ({'; '.join(errors) or 'unsupported'})")
+
+
+_chain: Optional[TTSChain] = None
+
+
+def get_tts_chain() -> TTSChain:
+    global _chain
+    if _chain is None:
+        _chain = TTSChain(TTS_ENGINE_CHAIN, TTS_ENGINE_TIMEOUTS)
+    return _chain
@@ -2,11 +2,14 @@
 
 import os
 import re
-import time
 import hashlib
 import logging
-from typing import Optional
-from gtts import gTTS
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
+from .metrics import timed, submit_traced
+from .tts_engines import get_tts_chain
+from .artifact_store import get_store, sharded_key
+from ..config.settings import TTS_MAX_WORKERS, TTS_CHUNK_CHARS, TTS_CHUNK_DIR
 
 logger = logging.getLogger(__name__)
 
@@ -126,76 +129,149 @@ def normalize_text_for_tts(text: str, lang: str) -> str:
 
 
 # -----------------------------
-# Safe filename generator
+# Sentence segmentation
 # -----------------------------
-def _make_safe_filename(text: str, lang: str, ext: str = DEFAULT_TTS_EXT) -> str:
+# sentence ends: ASCII . ! ? (English + Tamil), danda । / double danda ॥ (Hindi)
+_SENT_END = re.compile(r"(?<=[.!?।॥])\s+")
+
+
+def split_sentences(text: str, max_chars: int = TTS_CHUNK_CHARS) -> List[str]:
     """
-    Generate a filesystem-safe, timestamped filename for TTS output.
+    Split normalized text into sentence chunks for TTS.
 
-    We:
-    - Use first line (preview) capped at 30 chars
-    - Strip invalid path characters
-    - Append a short hash for uniqueness
-    - Prefix with language and timestamp
+    One sentence = one chunk (no greedy merging), so editing one sentence
+    leaves every other chunk's cache key unchanged. Sentences longer than
+    `max_chars` are split on commas, then on spaces.
     """
-    base = (text or "").strip().splitlines()[0] if text else "audio"
-    base = base.strip()
+    chunks = []
+    for sent in _SENT_END.split(text or ""):
+        sent = sent.strip()
+        if not sent:
+            continue
+        while len(sent) > max_chars:
+            cut = max(sent.rfind(",", 0, max_chars), sent.rfind(" ", 0, max_chars))
+            if cut <= 0:
+                cut = max_chars
+            chunks.append(sent[: cut + 1].strip())
+            sent = sent[cut + 1:].strip()
+        if sent:
+            chunks.append(sent)
+    return chunks
+
+
+# -----------------------------
+# Per-chunk synthesis + cache
+# -----------------------------
+_TTS_POOL = ThreadPoolExecutor(max_workers=TTS_MAX_WORKERS, thread_name_prefix="tts")
 
-    # preview only (this is *not* the text we send to TTS)
-    if len(base) > 30:
-        base = base[:30]
 
-    # Remove forbidden characters for most file systems
-    base = re.sub(r'[\\/:*?"<>|]', "", base)
-    base = base.strip() or "audio"
+def _strip_id3(data: bytes) -> bytes:
+    """
+    Drop a leading ID3v2 tag so chunk MP3s can be concatenated frame-to-frame.
+    """
+    if len(data) > 10 and data[:3] == b"ID3":
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        return data[10 + size:]
+    return data
 
-    # short hash based on full text for uniqueness
-    hash_id = hashlib.md5((text or "").encode("utf-8")).hexdigest()[:8]
 
-    ts = time.strftime("%Y%m%d_%H%M%S")
+def _chunk_cache_key(chunk: str, lang: str) -> str:
+    key = f"{get_tts_chain().signature}\n{lang}\n{chunk}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return sharded_key(f"{TTS_CHUNK_DIR}/{lang}", digest, DEFAULT_TTS_EXT)
+
+
+def synthesize_chunk(chunk: str, lang: str) -> bytes:
+    """
+    MP3 bytes for one sentence; served from the chunk cache when present.
+    """
+    store = get_store()
+    key = _chunk_cache_key(chunk, lang)
+    cached = store.get(key)
+    if cached:
+        store.touch(key)            # LRU for the sweeper
+        return cached
+
+    chain = get_tts_chain()
+    data, engine = chain.synthesize(chunk, lang)
+    data = _strip_id3(data)
+    # fallback audio (primary engine failed transiently) is served once but
+    # not cached under the chain's key, or it would replace the primary
+    # voice for good and mix voices / bitrates within one file
+    if engine == chain.primary(lang):
+        store.put_key(key, data)
+    return data
+
+
+def _resolve_lang(lang: str) -> str:
     lang = (lang or "en").lower()
+    if not get_tts_chain().supports(lang):
+        logger.warning("save_tts: no TTS engine supports lang '%s', falling back to 'en'", lang)
+        lang = "en"
+    return lang
 
-    return f"{lang}_{ts}_{hash_id}_{base[:8]}.{ext}"
+
+def iter_tts_chunks(text: str, lang: str = "en") -> Iterator[bytes]:
+    """
+    Yield MP3 bytes sentence by sentence, in order.
+
+    All sentences are submitted to the TTS pool up front; each is yielded
+    as soon as it and every sentence before it are done, so the first
+    audio reaches the caller after one sentence, not the whole document.
+    """
+    if not text or not text.strip():
+        raise ValueError("save_tts: text is empty.")
+
+    lang = _resolve_lang(lang)
+    norm_text = normalize_text_for_tts(text, lang)
+
+    futures = [
+        submit_traced(_TTS_POOL, synthesize_chunk, chunk, lang)
+        for chunk in split_sentences(norm_text)
+    ]
+    try:
+        for fut in futures:
+            yield fut.result()
+    finally:
+        for fut in futures:
+            fut.cancel()
 
 
 # -----------------------------
 # Main TTS function
 # -----------------------------
+@timed("tts", model="chain")
 def save_tts(
     text: str,
     lang: str = "en",
     out_dir: str = "app/static/audio"
 ) -> str:
     """
-    Generate TTS audio with gTTS and save to disk.
+    Generate TTS audio with the configured engine chain and store it.
+
+    Text is split into sentences which are synthesized concurrently and
+    cached individually; the MP3 chunks are streamed into the artifact
+    store in order and published under their content hash.
 
-    :param text: Full text to synthesize (any length; gTTS will handle chunking internally)
+    :param text: Full text to synthesize (any length)
     :param lang: Language code ("en", "ta", "hi")
-    :param out_dir: Output directory path
-    :return: Absolute or relative path to saved audio file
+    :param out_dir: Kept for call compatibility; placement is decided by the artifact store
+    :return: URL path of the saved audio
     :raises ValueError: if text empty
-    :raises RuntimeError: if gTTS fails
+    :raises RuntimeError: if every engine in the chain fails
     """
     if not text or not text.strip():
         raise ValueError("save_tts: text is empty.")
 
-    lang = (lang or "en").lower()
-    if lang not in ("en", "ta", "hi"):
-        logger.warning("save_tts: unsupported lang '%s', falling back to 'en'", lang)
-        lang = "en"
-
-    norm_text = normalize_text_for_tts(text, lang)
-
-    _ensure_dir(out_dir)
-    filename = _make_safe_filename(norm_text, lang, DEFAULT_TTS_EXT)
-    full_path = os.path.join(out_dir, filename)
+    lang = _resolve_lang(lang)
 
     try:
-        tts = gTTS(text=norm_text, lang=lang)
-        tts.save(full_path)
-        logger.info("TTS saved: %s (lang=%s, chars=%d)", full_path, lang, len(norm_text))
+        with get_store().open_writer("audio", DEFAULT_TTS_EXT) as writer:
+            for data in iter_tts_chunks(text, lang):
+                writer.write(data)
+        logger.info("TTS saved: %s (lang=%s, bytes=%d)", writer.url, lang, writer.size)
     except Exception as e:
         logger.exception("TTS generation failed for lang='%s'", lang)
         raise RuntimeError(f"TTS generation failed for lang='{lang}': {e}")
 
-    return "/" + full_path.replace("\\", "/")
\ No newline at end of file
+    return writer.url
@@ -0,0 +1,77 @@
+# backend/benchmarks/bench_document_stream.py
+"""
+Peak RSS and wall time of handle_document vs page count, streamed
+pipeline vs the in-memory path (DOC_STREAM_MIN_PAGES raised so nothing
+streams). External services are the latency fakes from benchmarks.fakes;
+each run is a fresh interpreter so ru_maxrss belongs to that run.
+
+    python -m benchmarks.bench_document_stream --pages 25,100,400
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def _child(path: str, target_lang: str) -> None:
+    from benchmarks.fakes import LatencyProfile, install_fakes
+
+    install_fakes(LatencyProfile(llm_ms=5, llm_per_char_ms=0.0, tts_ms=2, tts_per_char_ms=0.0, db_ms=0.5))
+    from app.services.file_handlers import handle_document
+
+    t0 = time.perf_counter()
+    res = handle_document(path, target_lang=target_lang, output_pref="both")
+    wall = time.perf_counter() - t0
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"wall_s": wall, "peak_mb": peak_kb / 1024.0,
+                      "streamed": bool(res.get("streamed")), "error": res.get("error")}))
+
+
+def _measure(path: str, target_lang: str, stream: bool) -> dict:
+    env = dict(os.environ)
+    if not stream:
+        env["DOC_STREAM_MIN_PAGES"] = str(10 ** 9)
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_document_stream", "--child", path, target_lang],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pages", default="25,100,400")
+    ap.add_argument("--target-lang", default="ta")
+    ap.add_argument("--out", default=os.path.join(tempfile.gettempdir(), "bench_doc_stream"))
+    ap.add_argument("--child", nargs=2, metavar=("PATH", "TARGET"), help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        _child(*args.child)
+        return 0
+
+    from benchmarks.fixtures import write_pdf
+
+    os.makedirs(args.out, exist_ok=True)
+    print(f"{'pages':>6s} {'pipeline':9s} {'wall_s':>8s} {'peak_mb':>8s}")
+    for pages in (int(p) for p in args.pages.split(",")):
+        path = write_pdf(os.path.join(args.out, f"doc_{pages}p.pdf"), pages)
+        for stream in (True, False):
+            r = _measure(path, args.target_lang, stream)
+            label = "streamed" if r["streamed"] else "in-memory"
+            note = f"  error={r['error']}" if r.get("error") else ""
+            print(f"{pages:6d} {label:9s} {r['wall_s']:8.2f} {r['peak_mb']:8.1f}{note}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
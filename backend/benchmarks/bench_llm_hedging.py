@@ -0,0 +1,102 @@
+# backend/benchmarks/bench_llm_hedging.py
+"""
+Hedged LLM calls vs plain calls on a heavy-tailed latency model: most
+calls take ~base ms, a small share (--slow-rate) takes --slow-factor
+times longer, as a stuck upstream replica would. Both runs replay the same
+latency sequence; reports p50 / p95 / p99, hedge rate and extra calls.
+
+The fake sleeps with asyncio.sleep, so a cancelled loser really stops.
+
+    python -m benchmarks.bench_llm_hedging --calls 2000 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app.utils.hedging import Hedger  # noqa: E402
+
+
+class TailLLM:
+    """ainvoke() sleeps base * lognormal jitter, or slow_factor times that for slow_rate of calls."""
+
+    def __init__(self, base_ms: float, slow_rate: float, slow_factor: float, seed: int = 7):
+        self.base_ms = base_ms
+        self.slow_rate = slow_rate
+        self.slow_factor = slow_factor
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.cancelled = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        ms = self.base_ms * self._rng.lognormvariate(0.0, 0.15)
+        if self._rng.random() < self.slow_rate:
+            ms *= self.slow_factor
+        try:
+            await asyncio.sleep(ms / 1000.0)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return messages
+
+
+def _pct(vals, q):
+    return vals[min(len(vals) - 1, int(q * len(vals)))] * 1000
+
+
+async def _run(call, n: int, concurrency: int):
+    sem = asyncio.Semaphore(concurrency)
+    lat = []
+
+    async def one(i):
+        async with sem:
+            t0 = time.perf_counter()
+            await call(i)
+            lat.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*(one(i) for i in range(n)))
+    return sorted(lat)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--calls", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--base-ms", type=float, default=40.0)
+    ap.add_argument("--slow-rate", type=float, default=0.03)
+    ap.add_argument("--slow-factor", type=float, default=10.0)
+    ap.add_argument("--max-rate", type=float, default=0.05)
+    ap.add_argument("--min-delay-ms", type=float, default=0.0)
+    args = ap.parse_args(argv)
+
+    rows = []
+    for label in ("plain", "hedged"):
+        llm = TailLLM(args.base_ms, args.slow_rate, args.slow_factor)
+        if label == "plain":
+            call = lambda i: llm.ainvoke(i)  # noqa: E731
+        else:
+            hedger = Hedger(window=200, min_samples=20, min_delay_ms=args.min_delay_ms, max_rate=args.max_rate)
+            call = lambda i: hedger.ainvoke(llm, i)  # noqa: E731
+        lat = asyncio.run(_run(call, args.calls, args.concurrency))
+        extra = llm.calls - args.calls
+        rows.append((label, _pct(lat, 0.50), _pct(lat, 0.95), _pct(lat, 0.99), extra, llm.cancelled))
+
+    print(f"calls {args.calls}  concurrency {args.concurrency}  slow {args.slow_rate:.0%} x{args.slow_factor:g}")
+    print(f"{'':8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'hedges':>8}{'hedge rate':>12}{'cancelled':>11}")
+    for label, p50, p95, p99, extra, cancelled in rows:
+        print(f"{label:8}{p50:9.1f}{p95:9.1f}{p99:9.1f}{extra:8d}{extra / args.calls:12.3f}{cancelled:11d}")
+    p99_plain, p99_hedged = rows[0][3], rows[1][3]
+    print(f"p99 improvement   {100 * (1 - p99_hedged / p99_plain):.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
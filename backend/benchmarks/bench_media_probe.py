@@ -0,0 +1,108 @@
+# backend/benchmarks/bench_media_probe.py
+"""
+Per-file probe/decode overhead: the old subprocess path against the
+in-process media layer.
+
+  legacy:  ffprobe for duration (+ ffmpeg → temp WAV for video, then
+           ffprobe again on the extracted WAV)
+  media:   app.services.media.load_audio → PCM in memory, duration from
+           the decoded samples (WAV read in-process, PyAV if installed,
+           else one ffmpeg pipe)
+
+Needs ffmpeg/ffprobe on PATH for the legacy path and the mp3/mp4 fixtures.
+
+    python -m benchmarks.bench_media_probe --repeat 20
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app.services import media  # noqa: E402
+from benchmarks.fixtures import write_wav, write_video  # noqa: E402
+
+
+def _ffprobe_duration(path: str) -> float:
+    out = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+         "-of", "default=noprint_wrappers=1:nokey=1", path],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    return float(out.stdout.strip())
+
+
+def legacy(path: str, is_video: bool):
+    """Returns (duration, processes spawned)."""
+    if not is_video:
+        return _ffprobe_duration(path), 1
+    wav = os.path.join(tempfile.gettempdir(), f"video_audio_{uuid.uuid4().hex}.wav")
+    subprocess.run(["ffmpeg", "-i", path, "-vn", "-acodec", "pcm_s16le", "-ar", "16000", "-ac", "1", wav],
+                   check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        return _ffprobe_duration(wav), 2
+    finally:
+        os.remove(wav)
+
+
+def in_process(path: str, is_video: bool):
+    clip = media.load_audio(path)
+    wav_fast = path.endswith(".wav")
+    return clip.duration, 0 if (wav_fast or media.av is not None) else 1
+
+
+def _encode_mp3(wav_path: str, out: str) -> str:
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-i", wav_path, "-b:a", "64k", out],
+                   check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return out
+
+
+def _timeit(fn, path, is_video, repeat):
+    times, spawned, duration = [], 0, 0.0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        duration, spawned = fn(path, is_video)
+        times.append((time.perf_counter() - t0) * 1000)
+    times.sort()
+    return times[len(times) // 2], times[max(0, int(len(times) * 0.95) - 1)], spawned, duration
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--out", default=os.path.join(tempfile.gettempdir(), "bench_media"))
+    args = ap.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    wav_short = write_wav(os.path.join(args.out, "clip_5s.wav"), 5)
+    wav_long = write_wav(os.path.join(args.out, "clip_60s.wav"), 60)
+    files = [("wav 5s", wav_short, False), ("wav 60s", wav_long, False)]
+    try:
+        files.append(("mp3 60s", _encode_mp3(wav_long, os.path.join(args.out, "clip_60s.mp3")), False))
+        files.append(("mp4 30s", write_video(os.path.join(args.out, "clip_30s.mp4"),
+                                             write_wav(os.path.join(args.out, "v.wav"), 30), 30), True))
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"ffmpeg unavailable, mp3/mp4 cases skipped: {e}")
+
+    print(f"decoder: {'PyAV' if media.av is not None else 'ffmpeg pipe'} (non-WAV inputs)")
+    print(f"{'file':10s} {'path':8s} {'p50_ms':>8s} {'p95_ms':>8s} {'procs':>6s} {'dur_s':>7s}")
+    for label, path, is_video in files:
+        for name, fn in (("legacy", legacy), ("media", in_process)):
+            try:
+                p50, p95, procs, dur = _timeit(fn, path, is_video, args.repeat)
+            except (OSError, subprocess.CalledProcessError, ValueError) as e:
+                print(f"{label:10s} {name:8s} failed: {e}")
+                continue
+            print(f"{label:10s} {name:8s} {p50:8.1f} {p95:8.1f} {procs:6d} {dur:7.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# backend/benchmarks/bench_ocr_pool.py
+"""
+OCR engine pool throughput: images/second at 1, 4 and 8 concurrent callers,
+single-image calls vs the batched API.
+
+By default PaddleOCR is replaced by the latency fake from benchmarks.fakes
+(measures locking/scheduling only); --real loads the actual models.
+
+    python -m benchmarks.bench_ocr_pool --images 32 --concurrency 1,4,8
+    python -m benchmarks.bench_ocr_pool --real --engines-per-lang 2
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.fakes import LatencyProfile, install_fakes  # noqa: E402
+from benchmarks.fixtures import write_image  # noqa: E402
+
+
+def run(pool, lang, images, concurrency, batch):
+    """Returns images/second."""
+    per_worker = [images[i::concurrency] for i in range(concurrency)]
+
+    def work(chunk):
+        if batch:
+            pool.ocr_batch(lang, chunk)
+        else:
+            for img in chunk:
+                pool.ocr(lang, img)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        list(ex.map(work, per_worker))
+    return len(images) / (time.perf_counter() - t0)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--images", type=int, default=32)
+    ap.add_argument("--concurrency", default="1,4,8")
+    ap.add_argument("--lang", default="en")
+    ap.add_argument("--engines-per-lang", type=int, default=1)
+    ap.add_argument("--ocr-ms", type=float, default=250.0, help="fake engine latency per image")
+    ap.add_argument("--real", action="store_true", help="use the real PaddleOCR models")
+    args = ap.parse_args(argv)
+
+    install_fakes(LatencyProfile(ocr_ms=args.ocr_ms, jitter=0.0), fake_ocr=not args.real)
+    from app.services.ocr_pool import OCREnginePool
+
+    out = os.path.join(tempfile.gettempdir(), "bench_ocr")
+    os.makedirs(out, exist_ok=True)
+    sample = write_image(os.path.join(out, "notice.png"))
+    images = [sample] * args.images
+
+    pool = OCREnginePool(per_lang=args.engines_per_lang)
+    t0 = time.perf_counter()
+    pool.warmup([args.lang])
+    print(f"warm-up ({args.engines_per_lang} engine(s), {args.lang}): {time.perf_counter() - t0:.2f}s")
+
+    print(f"{'concurrency':>11s} {'single img/s':>13s} {'batched img/s':>14s}")
+    for c in (int(x) for x in args.concurrency.split(",")):
+        single = run(pool, args.lang, images, c, batch=False)
+        batched = run(pool, args.lang, images, c, batch=True)
+        print(f"{c:11d} {single:13.2f} {batched:14.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+# backend/benchmarks/bench_pdf_extract.py
+"""
+Text-layer PDF extraction: PyMuPDF (default path) vs pdfplumber (layout
+mode) on 1, 50 and 500 page documents — wall time and peak RSS.
+
+Each measurement runs in a fresh interpreter so peak RSS belongs to that
+path alone (ru_maxrss of the child, includes the import baseline).
+
+    python -m benchmarks.bench_pdf_extract --pages 1,50,500
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def _child(path: str, mode: str) -> None:
+    from app.services.pdf_extract import iter_pdf_pages
+
+    t0 = time.perf_counter()
+    chars = 0
+    for _n, text in iter_pdf_pages(path, layout=(mode == "pdfplumber")):
+        chars += len(text)
+    wall = time.perf_counter() - t0
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"wall_s": wall, "peak_mb": peak_kb / 1024.0, "chars": chars}))
+
+
+def _measure(path: str, mode: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_pdf_extract", "--child", path, mode],
+        cwd=BACKEND_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pages", default="1,50,500")
+    ap.add_argument("--out", default=os.path.join(tempfile.gettempdir(), "bench_pdf"))
+    ap.add_argument("--child", nargs=2, metavar=("PATH", "MODE"), help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        _child(*args.child)
+        return 0
+
+    from benchmarks.fixtures import write_pdf
+
+    os.makedirs(args.out, exist_ok=True)
+    print(f"{'pages':>6s} {'path':11s} {'wall_s':>8s} {'pages/s':>9s} {'peak_mb':>8s} {'chars':>9s}")
+    for pages in (int(p) for p in args.pages.split(",")):
+        path = write_pdf(os.path.join(args.out, f"doc_{pages}p.pdf"), pages)
+        for mode in ("pymupdf", "pdfplumber"):
+            r = _measure(path, mode)
+            rate = pages / r["wall_s"] if r["wall_s"] else 0.0
+            print(f"{pages:6d} {mode:11s} {r['wall_s']:8.2f} {rate:9.1f} {r['peak_mb']:8.1f} {r['chars']:9d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# backend/benchmarks/bench_pdf_ocr_lang.py
+"""
+Scanned-PDF OCR: one joint eng+tam+hin pass per page (old behaviour) vs
+per-page language selection (OSD → minimal tesseract packs).
+
+Builds an image-only PDF cycling English, Tamil and Hindi pages and
+reports seconds per page and character similarity to the source text.
+Needs tesseract with eng/tam/hin/osd traineddata, and TTF fonts for
+Tamil/Devanagari (Noto Sans is looked up in the usual places, or pass
+--font-dir).
+
+    python -m benchmarks.bench_pdf_ocr_lang --pages 9
+"""
+
+import argparse
+import difflib
+import glob
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app.services.pdf_extract import ALL_PACKS, iter_document_pages, iter_ocr_pages  # noqa: E402
+from benchmarks.fixtures import EN_SENTENCE, TA_SENTENCE, HI_SENTENCE, write_scanned_pdf  # noqa: E402
+
+FONT_DIRS = ["/usr/share/fonts", "/usr/local/share/fonts", os.path.expanduser("~/.fonts"), "C:/Windows/Fonts"]
+FONT_NAMES = {"latin": "NotoSans-Regular", "tamil": "NotoSansTamil-Regular", "devanagari": "NotoSansDevanagari-Regular"}
+
+
+def find_fonts(extra_dir=None):
+    dirs = ([extra_dir] if extra_dir else []) + FONT_DIRS
+    found = {}
+    for script, name in FONT_NAMES.items():
+        for d in dirs:
+            hits = glob.glob(os.path.join(d, "**", f"{name}.*tf"), recursive=True)
+            if hits:
+                found[script] = hits[0]
+                break
+    return found
+
+
+def similarity(a: str, b: str) -> float:
+    return difflib.SequenceMatcher(None, " ".join(a.split()), " ".join(b.split())).ratio()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pages", type=int, default=9)
+    ap.add_argument("--font-dir")
+    ap.add_argument("--out", default=os.path.join(tempfile.gettempdir(), "bench_pdf_ocr"))
+    args = ap.parse_args(argv)
+
+    fonts = find_fonts(args.font_dir)
+    missing = {"tamil", "devanagari"} - set(fonts)
+    if missing:
+        print(f"fonts not found for {sorted(missing)}; pass --font-dir with Noto Sans Tamil/Devanagari")
+        return 1
+
+    sentences = [EN_SENTENCE, TA_SENTENCE, HI_SENTENCE]
+    truth = [sentences[i % 3] * 6 for i in range(args.pages)]
+    os.makedirs(args.out, exist_ok=True)
+    path = write_scanned_pdf(os.path.join(args.out, f"scan_{args.pages}p.pdf"), truth, fonts)
+
+    runs = {
+        f"joint {ALL_PACKS}": lambda: ((n, t, f"ocr:{ALL_PACKS}") for n, t in iter_ocr_pages(path, lang=ALL_PACKS)),
+        "per-page": lambda: iter_document_pages(path),
+    }
+    print(f"{'mode':20s} {'s/page':>8s} {'similarity':>10s}  packs used")
+    for name, make in runs.items():
+        t0 = time.perf_counter()
+        pages = list(make())
+        wall = time.perf_counter() - t0
+        sim = sum(similarity(truth[n - 1], txt) for n, txt, _src in pages) / len(pages)
+        packs = sorted({src for _n, _t, src in pages})
+        print(f"{name:20s} {wall / len(pages):8.2f} {sim:10.3f}  {', '.join(packs)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# backend/benchmarks/bench_prompt_tokens.py
+"""
+Translation prompt tokens: the prompt translate_text used to build
+(benchmarks.legacy_prompt, the baseline), every rule of the target language,
+and only the rules triggered by the input. Counted with tiktoken for
+LLM_MODEL.
+
+Inputs are real traffic from Mongo `records` (--from-mongo N, newest
+first) or the synthetic text corpus plus a few chat-sized messages.
+
+    python -m benchmarks.bench_prompt_tokens --from-mongo 500
+"""
+
+import argparse
+import os
+import statistics
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import tiktoken  # noqa: E402
+
+from app.config.settings import LLM_MODEL  # noqa: E402
+from app.services.prompt_rules import build_translation_prompt, select_rules  # noqa: E402
+from benchmarks.fixtures import text_corpus  # noqa: E402
+from benchmarks.legacy_prompt import legacy_prompt  # noqa: E402
+
+CHAT = [
+    ("ok thanks", "ta"),
+    ("See you tomorrow", "hi"),
+    ("நாளை சந்திப்போம்", "en"),
+    ("कल मिलते हैं", "en"),
+    ("He is very sociable but he has been away for a long time.", "ta"),
+]
+
+
+def traffic_from_mongo(limit: int):
+    from app.db.blobs import rehydrate
+    from app.db.mongo import get_db
+
+    fields = ("cleaned", "source_text", "input")
+    db = get_db()
+    docs = list(db.records.find(
+        {"target_lang": {"$exists": True}},
+        {**{f: 1 for f in fields}, "target_lang": 1},
+    ).sort("_id", -1).limit(limit))
+    rehydrate(db, docs, fields)       # large texts are blob references since records are offloaded
+    for doc in docs:
+        text = doc.get("cleaned") or doc.get("source_text") or doc.get("input")
+        if isinstance(text, str) and text.strip():
+            yield text, doc["target_lang"]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--from-mongo", type=int, default=0, metavar="N")
+    args = ap.parse_args(argv)
+
+    try:
+        enc = tiktoken.encoding_for_model(LLM_MODEL)
+    except KeyError:
+        enc = tiktoken.get_encoding("o200k_base")
+
+    if args.from_mongo:
+        samples = list(traffic_from_mongo(args.from_mongo))
+    else:
+        samples = CHAT + [(c["text"], c["target_lang"]) for c in text_corpus()]
+    if not samples:
+        print("no samples")
+        return 1
+
+    rows = []
+    for text, lang in samples:
+        before = len(enc.encode(legacy_prompt(text, lang)))
+        full = len(enc.encode(build_translation_prompt(text, lang, filtered=False)))
+        filt = len(enc.encode(build_translation_prompt(text, lang, filtered=True)))
+        inp = len(enc.encode(text))
+        rows.append((full - inp, filt - inp, len(select_rules(text, lang)), inp, before - inp))
+
+    overhead_before = [r[4] for r in rows]
+    overhead_full = [r[0] for r in rows]
+    overhead_filt = [r[1] for r in rows]
+    print(f"samples                    {len(rows)}")
+    print(f"instruction tokens (old)   median {statistics.median(overhead_before):.0f}  mean {statistics.mean(overhead_before):.0f}")
+    print(f"instruction tokens (all)   median {statistics.median(overhead_full):.0f}  mean {statistics.mean(overhead_full):.0f}")
+    print(f"instruction tokens (filt)  median {statistics.median(overhead_filt):.0f}  mean {statistics.mean(overhead_filt):.0f}")
+    print(f"rules per call (filtered)  mean {statistics.mean(r[2] for r in rows):.1f}")
+    total_before = sum(r[4] + r[3] for r in rows)
+    total_all = sum(r[0] + r[3] for r in rows)
+    total_filt = sum(r[1] + r[3] for r in rows)
+    print(f"prompt tokens total        {total_before} → {total_filt}  ({100 * (1 - total_filt / total_before):.1f}% fewer; "
+          f"all rules {total_all})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
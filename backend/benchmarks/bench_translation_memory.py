@@ -0,0 +1,93 @@
+# backend/benchmarks/bench_translation_memory.py
+"""
+Translation memory on near-repeated content: form letters / notices that
+differ only in names, numbers and the odd clause. Reports index size,
+lookup latency, hit / hint rates and LLM calls vs translating every
+letter whole.
+
+The LLM and Mongo are the latency fakes from benchmarks.fakes.
+
+    python -m benchmarks.bench_translation_memory --letters 500 --seed-entries 20000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.fakes import LatencyProfile, install_fakes  # noqa: E402
+
+NAMES = ["Ravi Kumar", "Meena Devi", "Arjun Singh", "Lakshmi Narayanan", "Priya Sharma", "Mohammed Irfan"]
+TEMPLATES = [
+    "Dear {name},",
+    "Your application No. {num} for the community hall has been approved.",
+    "Your application No. {num} for the community hall could not be approved.",
+    "Please visit the ward office with your documents before {day}.",
+    "The fee of Rs. {amt} must be paid at the counter.",
+    "Water supply in your area will be suspended on {day} for maintenance.",
+    "For queries, call the helpline between 10 am and 5 pm.",
+    "Regards, Municipal Office",
+]
+USER = "bench"
+DAYS = ["Monday", "Tuesday", "Friday", "15 March", "2 April"]
+
+
+def make_letter(rng: random.Random) -> str:
+    lines = [TEMPLATES[0]] + rng.sample(TEMPLATES[1:-1], 3) + [TEMPLATES[-1]]
+    return "\n".join(
+        line.format(name=rng.choice(NAMES), num=rng.randint(1000, 9999), day=rng.choice(DAYS), amt=rng.choice([200, 500, 1500]))
+        for line in lines
+    )
+
+
+def seed_index(tm, lang: str, n: int, rng: random.Random) -> None:
+    """Unrelated filler entries so lookups run against a realistically sized index."""
+    words = ["".join(rng.choice("abcdefghijklmnoprstuvy") for _ in range(rng.randint(3, 9))) for _ in range(5000)]
+    idx = tm._lang(lang, USER)
+    for _ in range(n):
+        src = " ".join(rng.choice(words) for _ in range(rng.randint(6, 16))).capitalize() + "."
+        tm._index(idx, src, src)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--letters", type=int, default=500)
+    ap.add_argument("--seed-entries", type=int, default=20000)
+    ap.add_argument("--target-lang", default="ta")
+    ap.add_argument("--llm-ms", type=float, default=50.0)
+    args = ap.parse_args(argv)
+
+    fakes = install_fakes(LatencyProfile(llm_ms=args.llm_ms, llm_per_char_ms=0.0, db_ms=0.0))
+    from app.services.translation_memory import get_tm, translate_with_memory
+
+    rng = random.Random(42)
+    tm = get_tm()
+    seed_index(tm, args.target_lang, args.seed_entries, rng)
+
+    llm = fakes["llm"]
+    calls0 = llm.calls
+    lookup_ms, t0 = [], time.perf_counter()
+    for _ in range(args.letters):
+        _translated, stats = translate_with_memory(make_letter(rng), args.target_lang, USER)
+        lookup_ms.append(stats["lookup_ms"] / max(1, stats["segments"]))
+    wall = time.perf_counter() - t0
+    s = tm.stats()
+
+    lookup_ms.sort()
+    print(f"letters             {args.letters}")
+    print(f"index entries       {s['entries'].get(args.target_lang, 0)}  (trigrams {s['trigrams'].get(args.target_lang, 0)})")
+    print(f"lookup ms/segment   p50 {statistics.median(lookup_ms):.3f}  p95 {lookup_ms[int(len(lookup_ms) * 0.95) - 1]:.3f}")
+    print(f"hit rate            {s['hit_rate']:.3f}   hint rate {s['hint_rate']:.3f}")
+    print(f"LLM calls           {llm.calls - calls0}  (whole-letter baseline: {args.letters})")
+    print(f"wall                {wall:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# backend/benchmarks/bench_tts_engines.py
+"""
+Compares TTS engines on characters per second and time-to-first-audio.
+
+Uses the REAL engines (gTTS needs network; espeak-ng / piper must be on
+PATH). Each engine synthesizes the same en / ta / hi passages sentence by
+sentence, the way save_tts does.
+
+    python -m benchmarks.bench_tts_engines --engines gtts,espeak,piper --repeat 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app.utils.tts_engines import ENGINE_TYPES  # noqa: E402
+from app.utils.tts_utils import normalize_text_for_tts, split_sentences  # noqa: E402
+from benchmarks.fixtures import EN_SENTENCE, TA_SENTENCE, HI_SENTENCE  # noqa: E402
+
+PASSAGES = {"en": EN_SENTENCE * 6, "ta": TA_SENTENCE * 6, "hi": HI_SENTENCE * 6}
+
+
+def bench_engine(engine, lang: str, text: str, timeout: float):
+    chunks = split_sentences(normalize_text_for_tts(text, lang))
+    t0 = time.perf_counter()
+    ttfa = None
+    total_bytes = 0
+    for chunk in chunks:
+        total_bytes += len(engine.synthesize(chunk, lang, timeout))
+        if ttfa is None:
+            ttfa = time.perf_counter() - t0
+    wall = time.perf_counter() - t0
+    chars = sum(len(c) for c in chunks)
+    return {"ttfa_ms": ttfa * 1000, "chars_per_s": chars / wall if wall else 0.0,
+            "wall_s": wall, "bytes": total_bytes}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--engines", default="gtts,espeak,piper")
+    ap.add_argument("--langs", default="en,ta,hi")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--timeout", type=float, default=30.0)
+    args = ap.parse_args(argv)
+
+    print(f"{'engine':8s} {'lang':4s} {'ttfa_ms':>9s} {'chars/s':>9s} {'wall_s':>8s}")
+    for name in args.engines.split(","):
+        engine = ENGINE_TYPES[name]()
+        if not engine.available():
+            print(f"{name:8s} not available, skipped")
+            continue
+        for lang in args.langs.split(","):
+            if not engine.supports(lang):
+                print(f"{name:8s} {lang:4s} unsupported")
+                continue
+            runs = []
+            for _ in range(args.repeat):
+                try:
+                    runs.append(bench_engine(engine, lang, PASSAGES[lang], args.timeout))
+                except Exception as e:
+                    print(f"{name:8s} {lang:4s} failed: {e}")
+                    break
+            if not runs:
+                continue
+            best = sorted(runs, key=lambda r: r["wall_s"])[len(runs) // 2]   # median run
+            print(f"{name:8s} {lang:4s} {best['ttfa_ms']:9.1f} {best['chars_per_s']:9.1f} {best['wall_s']:8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+# backend/benchmarks/bench_worker_memory.py
+"""
+Per-worker memory of the gunicorn server, with and without preload_app.
+
+Starts `gunicorn -c gunicorn.conf.py app.main:app` (real models, so run it
+where the backend's dependencies are installed), waits until /health/ping
+answers and the workers settle, then reads /proc/<pid>/smaps_rollup of the
+master and every worker (Linux only):
+
+    RSS     resident pages, shared ones counted in full by every process
+    PSS     shared pages divided among the processes sharing them
+    USS     pages private to the process (Private_Clean + Private_Dirty)
+
+Sum of PSS is what the server really costs; USS is what one more worker
+adds.
+
+    python -m benchmarks.bench_worker_memory --workers 4
+    python -m benchmarks.bench_worker_memory --pid <gunicorn master pid>
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def smaps_rollup(pid: int) -> dict:
+    """kB values of /proc/<pid>/smaps_rollup."""
+    out = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 3 and parts[2] == "kB":
+                out[parts[0].rstrip(":")] = int(parts[1])
+    return out
+
+
+def children(pid: int):
+    kids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # ppid is the 2nd field after the parenthesised command name
+        if int(stat.rsplit(")", 1)[1].split()[1]) == pid:
+            kids.append(int(entry))
+    return sorted(kids)
+
+
+def measure(master: int) -> list:
+    rows = []
+    for role, pid in [("master", master)] + [("worker", p) for p in children(master)]:
+        m = smaps_rollup(pid)
+        rows.append({
+            "role": role,
+            "pid": pid,
+            "rss": m.get("Rss", 0),
+            "pss": m.get("Pss", 0),
+            "uss": m.get("Private_Clean", 0) + m.get("Private_Dirty", 0),
+        })
+    return rows
+
+
+def report(label: str, rows: list) -> None:
+    mb = lambda kb: kb / 1024  # noqa: E731
+    print(f"\n{label}")
+    print(f"{'':8}{'pid':>8}{'RSS MB':>10}{'PSS MB':>10}{'USS MB':>10}")
+    for r in rows:
+        print(f"{r['role']:8}{r['pid']:8d}{mb(r['rss']):10.1f}{mb(r['pss']):10.1f}{mb(r['uss']):10.1f}")
+    workers = [r for r in rows if r["role"] == "worker"]
+    if workers:
+        print(f"{'worker avg':16}{mb(sum(r['rss'] for r in workers) / len(workers)):10.1f}"
+              f"{mb(sum(r['pss'] for r in workers) / len(workers)):10.1f}"
+              f"{mb(sum(r['uss'] for r in workers) / len(workers)):10.1f}")
+    print(f"{'total PSS':16}{'':10}{mb(sum(r['pss'] for r in rows)):10.1f}")
+
+
+def _wait_ready(port: int, workers: int, proc: subprocess.Popen, timeout: float) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {proc.returncode}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health/ping", timeout=2).read()
+            if len(children(proc.pid)) >= workers:
+                return
+        except OSError:
+            pass
+        time.sleep(1.0)
+    raise RuntimeError("server not ready in time")
+
+
+def run_server(preload: bool, workers: int, port: int, settle: float, timeout: float) -> list:
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), GUNICORN_PRELOAD="1" if preload else "0", PORT=str(port))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_ready(port, workers, proc, timeout)
+        time.sleep(settle)            # lifespan warm-ups of the slower workers
+        return measure(proc.pid)
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--settle", type=float, default=15.0, help="seconds to wait after the first ping")
+    ap.add_argument("--timeout", type=float, default=600.0, help="startup timeout per run")
+    ap.add_argument("--pid", type=int, help="measure an already running master instead")
+    args = ap.parse_args(argv)
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("needs Linux /proc/<pid>/smaps_rollup")
+        return 1
+
+    if args.pid:
+        report(f"master {args.pid}", measure(args.pid))
+        return 0
+
+    for preload in (False, True):
+        rows = run_server(preload, args.workers, args.port, args.settle, args.timeout)
+        report(f"preload_app={preload}  workers={args.workers}", rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
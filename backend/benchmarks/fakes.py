@@ -0,0 +1,325 @@
+# backend/benchmarks/fakes.py
+"""
+Deterministic local stand-ins for the external services the pipelines call
+(OpenAI chat + Whisper, gTTS, MongoDB, PaddleOCR, HF models), with
+configurable latency, so a benchmark run measures OUR code and nothing else.
+
+Usage (must run BEFORE `app` is imported):
+
+    from benchmarks.fakes import LatencyProfile, install_fakes
+    install_fakes(LatencyProfile(llm_ms=400, stt_ms=800, tts_ms=150))
+"""
+
+import sys
+import time
+import types
+import random
+import threading
+import uuid
+from typing import Optional
+
+
+# -----------------------------
+# Latency model
+# -----------------------------
+class Latency:
+    """
+    base_ms + per_unit_ms * units, with +/- jitter drawn from a seeded RNG
+    so two runs with the same seed sleep exactly the same amount.
+    """
+
+    def __init__(self, base_ms: float = 0.0, per_unit_ms: float = 0.0,
+                 jitter: float = 0.1, seed: int = 1234):
+        self.base_ms = base_ms
+        self.per_unit_ms = per_unit_ms
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sleep(self, units: float = 0.0) -> float:
+        ms = self.base_ms + self.per_unit_ms * units
+        with self._lock:
+            if self.jitter:
+                ms *= 1.0 + self._rng.uniform(-self.jitter, self.jitter)
+        if ms > 0:
+            time.sleep(ms / 1000.0)
+        return ms
+
+
+class LatencyProfile:
+    """
+    Latency for every faked service.
+    llm:  per output char     stt: per audio second
+    tts:  per input char      ocr: per call
+    db:   per insert
+    """
+
+    def __init__(self, llm_ms=400.0, llm_per_char_ms=0.5,
+                 stt_ms=600.0, stt_per_sec_ms=20.0,
+                 tts_ms=150.0, tts_per_char_ms=0.3,
+                 ocr_ms=250.0, db_ms=3.0, jitter=0.1, seed=1234):
+        self.llm = Latency(llm_ms, llm_per_char_ms, jitter, seed)
+        self.stt = Latency(stt_ms, stt_per_sec_ms, jitter, seed + 1)
+        self.tts = Latency(tts_ms, tts_per_char_ms, jitter, seed + 2)
+        self.ocr = Latency(ocr_ms, 0.0, jitter, seed + 3)
+        self.db = Latency(db_ms, 0.0, jitter, seed + 4)
+
+
+# -----------------------------
+# LLM (langchain ChatOpenAI shape)
+# -----------------------------
+class _Msg:
+    def __init__(self, content: str):
+        self.content = content
+
+
+def _fake_output(messages) -> str:
+    last = messages[-1] if isinstance(messages, (list, tuple)) else messages
+    text = getattr(last, "content", str(last))
+    if "### INPUT TEXT:" in text:
+        text = text.split("### INPUT TEXT:", 1)[1]
+        text = text.split("Provide ONLY the final translation.", 1)[0]
+    text = text.strip()
+    # translation ≈ same length as input, summary ≈ 1/4
+    return text if len(text) < 2000 else text[: len(text) // 4]
+
+
+class FakeChatLLM:
+    def __init__(self, latency: Latency, model_name: str = "fake-llm"):
+        self.latency = latency
+        self.model_name = model_name
+        self.calls = 0
+
+    def invoke(self, messages, *args, **kwargs):
+        out = _fake_output(messages)
+        self.calls += 1
+        self.latency.sleep(len(out))
+        return _Msg(out)
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        import asyncio
+        out = _fake_output(messages)
+        self.calls += 1
+        await asyncio.to_thread(self.latency.sleep, len(out))
+        return _Msg(out)
+
+    def bind_tools(self, tools):
+        return self
+
+
+# -----------------------------
+# OpenAI client (audio.transcriptions.create)
+# -----------------------------
+FAKE_TRANSCRIPT = (
+    "Welcome to the weekly community announcement. "
+    "The library will stay open until eight in the evening on weekdays. "
+)
+
+
+class _Transcriptions:
+    def __init__(self, latency: Latency):
+        self.latency = latency
+        self.calls = 0
+        self.bytes_uploaded = 0
+
+    def create(self, model=None, file=None, **kwargs):
+        if isinstance(file, tuple):
+            data = file[1]
+        elif hasattr(file, "read"):
+            data = file.read()
+        else:
+            data = file or b""
+        if hasattr(data, "read"):
+            data = data.read()
+        size = len(data or b"")
+        self.calls += 1
+        self.bytes_uploaded += size
+        seconds = size / 32000.0          # 16 kHz mono s16le
+        self.latency.sleep(seconds)
+        repeat = max(1, int(seconds // 5))
+        return types.SimpleNamespace(text=(FAKE_TRANSCRIPT * repeat).strip())
+
+
+class FakeOpenAIClient:
+    def __init__(self, latency: Latency):
+        self.audio = types.SimpleNamespace(transcriptions=_Transcriptions(latency))
+
+
+# -----------------------------
+# gTTS
+# -----------------------------
+# one silent MPEG-1 Layer III frame (128 kbps, 44.1 kHz), valid to concatenate
+_MP3_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+def make_fake_gtts(latency: Latency):
+    class FakeGTTS:
+        def __init__(self, text: str = "", lang: str = "en", **kwargs):
+            self.text = text
+            self.lang = lang
+
+        def _bytes(self) -> bytes:
+            latency.sleep(len(self.text))
+            frames = max(1, len(self.text) // 15)
+            return _MP3_FRAME * frames
+
+        def write_to_fp(self, fp):
+            fp.write(self._bytes())
+
+        def stream(self):
+            yield self._bytes()
+
+        def save(self, path: str):
+            with open(path, "wb") as f:
+                self.write_to_fp(f)
+
+    return FakeGTTS
+
+
+# -----------------------------
+# MongoDB
+# -----------------------------
+class _InsertResult:
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+
+
+class _FakeCursor(list):
+    def sort(self, *args, **kwargs):
+        return self
+
+    def limit(self, n):
+        return self
+
+
+class FakeCollection:
+    def __init__(self, latency: Latency):
+        self.latency = latency
+        self.docs = {}
+        self._lock = threading.Lock()
+
+    def insert_one(self, doc):
+        self.latency.sleep()
+        _id = doc.get("_id") or uuid.uuid4().hex[:24]
+        doc["_id"] = _id
+        with self._lock:
+            self.docs[_id] = dict(doc)
+        return _InsertResult(_id)
+
+    def insert_many(self, docs, ordered=True):
+        ids = [self.insert_one(d).inserted_id for d in docs]
+        return types.SimpleNamespace(inserted_ids=ids)
+
+    def update_one(self, flt, update, upsert=False):
+        self.latency.sleep()
+        return types.SimpleNamespace(matched_count=0, modified_count=0, upserted_id=None)
+
+    def find_one(self, *args, **kwargs):
+        return None
+
+    def find(self, *args, **kwargs):
+        return _FakeCursor()
+
+    def bulk_write(self, ops, ordered=True):
+        self.latency.sleep()
+        return types.SimpleNamespace(upserted_count=len(ops))
+
+    def create_index(self, *args, **kwargs):
+        return "fake_index"
+
+
+class FakeDB:
+    def __init__(self, latency: Latency):
+        self.latency = latency
+        self._collections = {}
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name):
+        if name not in self._collections:
+            self._collections[name] = FakeCollection(self.latency)
+        return self._collections[name]
+
+
+# -----------------------------
+# PaddleOCR
+# -----------------------------
+def make_fake_paddleocr(latency: Latency):
+    class FakePaddleOCR:
+        def __init__(self, lang: str = "en", **kwargs):
+            self.lang = lang
+
+        def ocr(self, img, *args, **kwargs):
+            latency.sleep()
+            line = {
+                "ta": "வணக்கம் நண்பர்களே",
+                "devanagari": "नमस्ते दोस्तों",
+            }.get(self.lang, "Community notice: library hours extended")
+            box = [[0, 0], [100, 0], [100, 20], [0, 20]]
+            return [[[box, (line, 0.99)]]]
+
+    return FakePaddleOCR
+
+
+# -----------------------------
+# Install
+# -----------------------------
+_installed: Optional[dict] = None
+
+
+def _stub_punctuation_module():
+    """
+    deepmultilingualpunctuation downloads and loads a transformer at import
+    time of transcribe_service; replace it with an identity model.
+    """
+    mod = types.ModuleType("deepmultilingualpunctuation")
+
+    class PunctuationModel:
+        def restore_punctuation(self, text):
+            return text
+
+    mod.PunctuationModel = PunctuationModel
+    sys.modules["deepmultilingualpunctuation"] = mod
+
+
+def install_fakes(profile: Optional[LatencyProfile] = None, fake_ocr: bool = True) -> dict:
+    """
+    Patch the app's service handles with fakes. Returns the fake objects so
+    the benchmark can read call counters afterwards. Idempotent.
+    """
+    global _installed
+    if _installed is not None:
+        return _installed
+
+    profile = profile or LatencyProfile()
+    _stub_punctuation_module()
+
+    from app.utils import helpers
+    from app.utils import tts_engines
+    from app.services import translation_service, transcribe_service, file_handlers, ocr_pool, document_stream, doc_revisions
+    from app.services import translation_memory
+    from app.db import records
+
+    llm = FakeChatLLM(profile.llm)
+    stt = FakeOpenAIClient(profile.stt)
+    db = FakeDB(profile.db)
+
+    helpers.pipeline = None                           # no zero-shot HF model
+    translation_service.llm = llm
+    transcribe_service.client = stt
+    tts_engines.gTTS = make_fake_gtts(profile.tts)
+    tts_engines._chain = tts_engines.TTSChain(["gtts"], {"gtts": 20.0})
+    records.get_db = lambda: db
+    document_stream.get_db = lambda: db
+    doc_revisions.get_db = lambda: db
+    translation_memory.get_db = lambda: db
+    translation_memory.get_tm().clear()
+    if fake_ocr:
+        ocr_pool.PaddleOCR = make_fake_paddleocr(profile.ocr)
+        ocr_pool.get_ocr_pool().clear()
+
+    _installed = {"llm": llm, "stt": stt, "db": db, "profile": profile}
+    return _installed
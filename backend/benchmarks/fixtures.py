@@ -0,0 +1,198 @@
+# backend/benchmarks/fixtures.py
+"""
+Synthetic input corpus for the benchmarks. Everything is generated on the
+fly into a temp directory so the repo carries no binary fixtures.
+A kind whose generator library / binary is missing is skipped with a note.
+"""
+
+import math
+import os
+import random
+import shutil
+import struct
+import subprocess
+import wave
+from typing import Dict, List
+
+EN_SENTENCE = "The municipal office will remain closed on Monday for the annual audit. "
+TA_SENTENCE = "நகராட்சி அலுவலகம் வருடாந்திர தணிக்கைக்காக திங்கள்கிழமை மூடப்பட்டிருக்கும். "
+HI_SENTENCE = "वार्षिक लेखा परीक्षा के कारण नगर कार्यालय सोमवार को बंद रहेगा। "
+
+
+# -----------------------------
+# Text
+# -----------------------------
+def text_corpus() -> List[Dict]:
+    return [
+        {"name": "en_short", "text": "Hello, how are you?", "target_lang": "ta"},
+        {"name": "en_paragraph", "text": EN_SENTENCE * 8, "target_lang": "ta"},
+        {"name": "ta_paragraph", "text": TA_SENTENCE * 8, "target_lang": "en"},
+        {"name": "hi_paragraph", "text": HI_SENTENCE * 8, "target_lang": "en"},
+        {"name": "en_same_lang", "text": EN_SENTENCE * 3, "target_lang": "en"},
+    ]
+
+
+# -----------------------------
+# Audio (synthetic speech-like signal)
+# -----------------------------
+def write_wav(path: str, seconds: float, sr: int = 16000, seed: int = 7,
+              silence_ratio: float = 0.0) -> str:
+    """
+    Amplitude-modulated harmonic tone + noise; `silence_ratio` of the clip
+    (split between head and tail) is near-silent, like a mic capture.
+    """
+    rng = random.Random(seed)
+    n = int(seconds * sr)
+    pad = int(n * silence_ratio / 2)
+    frames = bytearray()
+    for i in range(n):
+        t = i / sr
+        if pad <= i < n - pad:
+            env = 0.5 * (1 + math.sin(2 * math.pi * 3 * t))
+            v = env * (0.5 * math.sin(2 * math.pi * 180 * t) + 0.25 * math.sin(2 * math.pi * 360 * t))
+            v += rng.uniform(-0.02, 0.02)
+        else:
+            v = rng.uniform(-0.002, 0.002)
+        frames += struct.pack("<h", int(max(-1.0, min(1.0, v)) * 32000))
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes(bytes(frames))
+    return path
+
+
+# -----------------------------
+# PDF
+# -----------------------------
+def write_pdf(path: str, pages: int, text: str = EN_SENTENCE * 20) -> str:
+    import fitz
+
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, 550, 800), f"Page {p + 1}\n\n{text}", fontsize=11)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def write_scanned_pdf(path: str, page_texts: List[str], fontfiles: Dict[str, str], dpi: int = 150) -> str:
+    """
+    Image-only PDF (no text layer), one page per entry of `page_texts`.
+    `fontfiles` maps "latin" / "tamil" / "devanagari" to a TTF able to
+    draw that script (e.g. Noto Sans *); the script of each page is taken
+    from its first letter. MuPDF does not shape Indic text, so conjuncts
+    render simplified — fine for comparing OCR runs on the same input.
+    """
+    import fitz
+
+    def script_of(text: str) -> str:
+        for ch in text:
+            if "\u0B80" <= ch <= "\u0BFF":
+                return "tamil"
+            if "\u0900" <= ch <= "\u097F":
+                return "devanagari"
+        return "latin"
+
+    out = fitz.open()
+    for text in page_texts:
+        src = fitz.open()
+        page = src.new_page()
+        font = fontfiles.get(script_of(text))
+        kwargs = {"fontname": "F0", "fontfile": font} if font else {}
+        page.insert_textbox(fitz.Rect(50, 50, 550, 800), text, fontsize=14, **kwargs)
+        pix = page.get_pixmap(dpi=dpi)
+        img_page = out.new_page(width=page.rect.width, height=page.rect.height)
+        img_page.insert_image(img_page.rect, stream=pix.tobytes("png"))
+        src.close()
+    out.save(path)
+    out.close()
+    return path
+
+
+# -----------------------------
+# Image
+# -----------------------------
+def write_image(path: str, size=(1600, 900), text: str = "Community notice: library hours extended") -> str:
+    from PIL import Image, ImageDraw
+
+    img = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(img)
+    for row in range(6):
+        draw.text((60, 80 + row * 110), text, fill="black")
+    img.save(path)
+    return path
+
+
+# -----------------------------
+# Video
+# -----------------------------
+def write_video(path: str, wav_path: str, seconds: float) -> str:
+    cmd = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-f", "lavfi", "-i", f"color=c=black:s=320x240:d={seconds}",
+        "-i", wav_path, "-shortest",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p", "-c:a", "aac",
+        path,
+    ]
+    subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return path
+
+
+# -----------------------------
+# Corpus
+# -----------------------------
+def build_corpus(out_dir: str) -> Dict[str, List[Dict]]:
+    """
+    Returns {kind: [case, ...]}; file cases carry `file_path`.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    corpus: Dict[str, List[Dict]] = {"text": text_corpus()}
+    notes = []
+
+    audio = []
+    for secs, silence in ((5, 0.0), (30, 0.0), (30, 0.5)):
+        name = f"audio_{secs}s" + ("_silent_edges" if silence else "")
+        p = write_wav(os.path.join(out_dir, f"{name}.wav"), secs, silence_ratio=silence)
+        audio.append({"name": name, "file_path": p, "target_lang": "ta"})
+    corpus["audio"] = audio
+
+    try:
+        corpus["document"] = [
+            {"name": f"pdf_{n}p", "file_path": write_pdf(os.path.join(out_dir, f"doc_{n}p.pdf"), n),
+             "target_lang": "ta"}
+            for n in (1, 5)
+        ]
+        txt = os.path.join(out_dir, "notice.txt")
+        with open(txt, "w", encoding="utf-8") as f:
+            f.write(EN_SENTENCE * 10)
+        corpus["document"].append({"name": "txt", "file_path": txt, "target_lang": "hi"})
+    except Exception as e:
+        notes.append(f"document: skipped ({e})")
+
+    try:
+        corpus["image"] = [
+            {"name": "poster_1600", "file_path": write_image(os.path.join(out_dir, "poster.png")),
+             "target_lang": "ta"},
+            {"name": "photo_4000", "file_path": write_image(os.path.join(out_dir, "photo.png"), (4000, 3000)),
+             "target_lang": "hi"},
+        ]
+    except Exception as e:
+        notes.append(f"image: skipped ({e})")
+
+    if shutil.which("ffmpeg"):
+        try:
+            wav = os.path.join(out_dir, "video_track.wav")
+            write_wav(wav, 10)
+            corpus["video"] = [
+                {"name": "video_10s", "file_path": write_video(os.path.join(out_dir, "clip.mp4"), wav, 10),
+                 "target_lang": "ta"},
+            ]
+        except Exception as e:
+            notes.append(f"video: skipped ({e})")
+    else:
+        notes.append("video: skipped (ffmpeg not on PATH)")
+
+    corpus["_notes"] = notes
+    return corpus
@@ -0,0 +1,274 @@
+# backend/benchmarks/run_bench.py
+"""
+Offline end-to-end benchmark.
+
+Drives run_langgraph_workflow (mode=workflow) or the FastAPI endpoints
+(mode=api) over a synthetic text / PDF / image / audio / video corpus with
+every external service replaced by a deterministic fake, and reports
+p50/p95/p99 latency, throughput, peak RSS and CPU time per input kind.
+
+Run from backend/:
+
+    python -m benchmarks.run_bench --iterations 20 --concurrency 4
+    python -m benchmarks.run_bench --mode api --kinds text,document --json bench.json
+    python -m benchmarks.run_bench --compare bench_before.json bench.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.fakes import LatencyProfile, install_fakes  # noqa: E402
+from benchmarks.fixtures import build_corpus  # noqa: E402
+
+KINDS = ("text", "document", "image", "audio", "video")
+UPLOAD_ENDPOINT = {
+    "audio": "/api/audio/upload",
+    "document": "/api/document/upload",
+    "image": "/api/image/upload",
+    "video": "/api/video/upload",
+}
+
+
+# -----------------------------
+# Stats
+# -----------------------------
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    k = (len(s) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(s) - 1)
+    return s[lo] + (s[hi] - s[lo]) * (k - lo)
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        import resource
+        # ru_maxrss is KiB on Linux (peak, not current)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RssSampler:
+    """Samples current RSS every `interval` seconds; reports the peak."""
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = _rss_bytes()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_bytes())
+
+
+# -----------------------------
+# Drivers
+# -----------------------------
+def _workflow_call(kind: str, case: Dict, i: int):
+    from app.ai_engine.langgraph_workflow import run_langgraph_workflow
+
+    text = case.get("text")
+    if text is not None:
+        text = f"{text} ({i})"        # distinct input per iteration
+    return run_langgraph_workflow({
+        "kind": kind,
+        "text": text,
+        "file_path": case.get("file_path"),
+        "target_lang": case["target_lang"],
+        "output_pref": "both",
+        "user_id": "bench",
+    })
+
+
+def _make_api_call(client):
+    def call(kind: str, case: Dict, i: int):
+        if kind == "text":
+            r = client.post("/api/text/translate", json={
+                "text": f"{case['text']} ({i})",
+                "target_lang": case["target_lang"],
+                "output_pref": "both",
+                "user_id": "bench",
+            })
+            return r.json()
+        with open(case["file_path"], "rb") as f:
+            data = f.read()
+        # trailing bytes keep each upload distinct so requests are not coalesced;
+        # all fixture formats ignore data after their end marker
+        data += f"\n%bench-{i}\n".encode()
+        r = client.post(
+            UPLOAD_ENDPOINT[kind],
+            files={"file": (os.path.basename(case["file_path"]), data)},
+            data={"target_lang": case["target_lang"], "output_pref": "both", "user_id": "bench"},
+        )
+        return r.json()
+    return call
+
+
+def bench_kind(call, kind: str, cases: List[Dict], iterations: int, concurrency: int) -> Dict:
+    jobs = [(case, i) for i in range(iterations) for case in cases]
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def run(job):
+        nonlocal errors
+        case, i = job
+        t0 = time.perf_counter()
+        try:
+            res = call(kind, case, i)
+            failed = isinstance(res, dict) and res.get("error") not in (None, "no_speech_detected")
+        except Exception:
+            failed = True
+        dt = time.perf_counter() - t0
+        with lock:
+            latencies.append(dt)
+            if failed:
+                errors += 1
+
+    cpu0 = time.process_time()
+    with RssSampler() as rss:
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(run, jobs))
+        wall = time.perf_counter() - t0
+    cpu = time.process_time() - cpu0
+
+    return {
+        "kind": kind,
+        "requests": len(jobs),
+        "errors": errors,
+        "concurrency": concurrency,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "throughput_rps": round(len(jobs) / wall, 3) if wall else 0.0,
+        "wall_s": round(wall, 3),
+        "cpu_s": round(cpu, 3),
+        "cpu_per_req_ms": round(cpu / max(len(jobs), 1) * 1000, 1),
+        "peak_rss_mb": round(rss.peak / (1024 * 1024), 1),
+    }
+
+
+# -----------------------------
+# Report
+# -----------------------------
+COLUMNS = ("kind", "requests", "errors", "p50_ms", "p95_ms", "p99_ms",
+           "throughput_rps", "cpu_per_req_ms", "peak_rss_mb")
+
+
+def print_table(rows: List[Dict]) -> None:
+    if not rows:
+        print("no results")
+        return
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in COLUMNS}
+    print("  ".join(c.ljust(widths[c]) for c in COLUMNS))
+    for r in rows:
+        print("  ".join(str(r[c]).ljust(widths[c]) for c in COLUMNS))
+
+
+def compare(before_path: str, after_path: str, tolerance: float) -> int:
+    """Prints deltas; exit code 1 when any p95 regressed beyond tolerance."""
+    with open(before_path) as f:
+        before = {r["kind"]: r for r in json.load(f)["results"]}
+    with open(after_path) as f:
+        after = {r["kind"]: r for r in json.load(f)["results"]}
+
+    regressed = False
+    for kind, a in after.items():
+        b = before.get(kind)
+        if not b:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "cpu_per_req_ms", "peak_rss_mb"):
+            delta = (a[metric] - b[metric]) / b[metric] if b[metric] else 0.0
+            flag = ""
+            if metric == "p95_ms" and delta > tolerance:
+                flag = "  <-- REGRESSION"
+                regressed = True
+            print(f"{kind:9s} {metric:15s} {b[metric]:>10} -> {a[metric]:>10}  ({delta:+.1%}){flag}")
+    return 1 if regressed else 0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--mode", choices=("workflow", "api"), default="workflow")
+    ap.add_argument("--kinds", default=",".join(KINDS))
+    ap.add_argument("--iterations", type=int, default=10)
+    ap.add_argument("--concurrency", type=int, default=1)
+    ap.add_argument("--llm-ms", type=float, default=400.0)
+    ap.add_argument("--stt-ms", type=float, default=600.0)
+    ap.add_argument("--tts-ms", type=float, default=150.0)
+    ap.add_argument("--ocr-ms", type=float, default=250.0)
+    ap.add_argument("--jitter", type=float, default=0.1)
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--real-ocr", action="store_true", help="use the real PaddleOCR models")
+    ap.add_argument("--json", help="write results to this file")
+    ap.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    ap.add_argument("--tolerance", type=float, default=0.10, help="allowed p95 regression for --compare")
+    args = ap.parse_args(argv)
+
+    if args.compare:
+        return compare(args.compare[0], args.compare[1], args.tolerance)
+
+    os.chdir(BACKEND_DIR)             # handlers write to app/static/...
+    profile = LatencyProfile(llm_ms=args.llm_ms, stt_ms=args.stt_ms, tts_ms=args.tts_ms,
+                             ocr_ms=args.ocr_ms, jitter=args.jitter, seed=args.seed)
+    install_fakes(profile, fake_ocr=not args.real_ocr)
+
+    work_dir = tempfile.mkdtemp(prefix="bench_corpus_")
+    corpus = build_corpus(work_dir)
+    for note in corpus.pop("_notes"):
+        print("note:", note)
+
+    kinds = [k for k in args.kinds.split(",") if k in corpus]
+    results = []
+
+    if args.mode == "api":
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        with TestClient(app) as client:
+            call = _make_api_call(client)
+            for kind in kinds:
+                results.append(bench_kind(call, kind, corpus[kind], args.iterations, args.concurrency))
+    else:
+        for kind in kinds:
+            results.append(bench_kind(_workflow_call, kind, corpus[kind], args.iterations, args.concurrency))
+
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+        print("wrote", args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
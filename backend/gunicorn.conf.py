@@ -0,0 +1,60 @@
+# backend/gunicorn.conf.py
+"""
+Production server: gunicorn master + uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+With preload_app the master imports the app and loads the models once
+(app.prefork.preload); workers are forked from it and share those pages
+copy-on-write instead of each loading its own copy. GUNICORN_PRELOAD=0
+gives the old behaviour (every worker imports and loads on its own), e.g.
+to compare memory with benchmarks/bench_worker_memory.py.
+
+Prometheus runs in multiprocess mode: each worker writes its samples to
+PROMETHEUS_MULTIPROC_DIR and /metrics (app.utils.metrics.render_metrics)
+sums them, so a scrape no longer sees only the worker that answered it.
+"""
+
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+# set before prometheus_client is imported (app import, also with preload_app)
+prometheus_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), f"prometheus-{os.getpid()}")
+)
+os.makedirs(prometheus_dir, exist_ok=True)
+
+
+def on_starting(server):
+    # samples of a previous run would be summed into this one's counters
+    for name in os.listdir(prometheus_dir):
+        if name.endswith(".db"):
+            os.remove(os.path.join(prometheus_dir, name))
+
+
+def when_ready(server):
+    # master, app already imported (preload_app), no worker forked yet
+    if preload_app:
+        from app.prefork import preload
+        preload()
+
+
+def post_fork(server, worker):
+    from app.prefork import after_fork
+    after_fork(workers)
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
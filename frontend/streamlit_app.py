@@ -124,6 +124,10 @@ def _audio_url_for(path: str) -> str:
     if not path:
         return None
 
+    # Absolute URLs (S3 artifact store) are already public
+    if path.startswith(("http://", "https://")):
+        return path
+
     # Normalize wrong backend paths
     if path.startswith("/app/static/"):
         path = path.replace("/app/static/", "/static/")
@@ -138,6 +142,10 @@ def _json_url_for(path: str) -> str:
     if not path:
         return None
 
+    # Absolute URLs (S3 artifact store) are already public
+    if path.startswith(("http://", "https://")):
+        return path
+
     # Normalize wrong backend paths
     if path.startswith("/app/static/"):
         path = path.replace("/app/static/", "/static/")